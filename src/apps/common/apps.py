@@ -0,0 +1,15 @@
+from django.apps import AppConfig
+
+
+class CommonConfig(AppConfig):
+    default_auto_field = "django.db.models.BigAutoField"
+    name = "apps.common"
+
+    def ready(self):
+        from apps.common.signals import (
+            connect_blob_receivers,
+            connect_image_receivers,
+        )
+
+        connect_blob_receivers()
+        connect_image_receivers()
@@ -0,0 +1,75 @@
+import zlib
+from typing import AsyncIterator, Callable, Iterable, Iterator, Optional
+
+import brotli
+
+from apps.common.negotiation import parse_accept
+
+ENCODING_BROTLI = "br"
+ENCODING_GZIP = "gzip"
+
+
+def _gzip_compressor(level: int) -> tuple[Callable, Callable]:
+    compressor = zlib.compressobj(level, zlib.DEFLATED, 16 + zlib.MAX_WBITS)
+    return compressor.compress, compressor.flush
+
+
+def _brotli_compressor(level: int) -> tuple[Callable, Callable]:
+    compressor = brotli.Compressor(quality=level)
+    return compressor.process, compressor.finish
+
+
+# supported encodings in order of preference
+COMPRESSORS = {
+    ENCODING_BROTLI: _brotli_compressor,
+    ENCODING_GZIP: _gzip_compressor,
+}
+
+
+def select_encoding(accept_encoding: str) -> Optional[str]:
+    """
+    Returns the encoding of the highest quality accepted by the client
+    according to `Accept-Encoding` header, or None if no supported encoding
+    is accepted. `*` applies to the encodings not listed explicitly, ties are
+    resolved by the order of preference.
+    """
+    accepted = parse_accept(accept_encoding)
+    default = accepted.get("*", 0)
+    selected, selected_quality = None, 0
+    for encoding in COMPRESSORS:
+        quality = accepted.get(encoding, default)
+        if quality > selected_quality:
+            selected, selected_quality = encoding, quality
+    return selected
+
+
+def compress(content: bytes, encoding: str, level: int) -> bytes:
+    process, finish = COMPRESSORS[encoding](level)
+    return process(content) + finish()
+
+
+def compress_sequence(
+    sequence: Iterable[bytes], encoding: str, level: int
+) -> Iterator[bytes]:
+    """
+    Compresses the sequence incrementally, so the whole content is never
+    kept in memory. Chunks are yielded once the compressor emits them.
+    """
+    process, finish = COMPRESSORS[encoding](level)
+    for chunk in sequence:
+        data = process(chunk)
+        if data:
+            yield data
+    yield finish()
+
+
+async def acompress_sequence(
+    sequence: AsyncIterator[bytes], encoding: str, level: int
+) -> AsyncIterator[bytes]:
+    """Async version of `compress_sequence`."""
+    process, finish = COMPRESSORS[encoding](level)
+    async for chunk in sequence:
+        data = process(chunk)
+        if data:
+            yield data
+    yield finish()
@@ -0,0 +1,73 @@
+import random
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS, connections
+
+# set once something is written within the current request, so the following
+# reads are served by the primary database and users read their own writes
+_written_to_primary = ContextVar("written_to_primary", default=False)
+# set within `use_primary_database` blocks
+_forced_primary = ContextVar("forced_primary", default=False)
+
+
+@contextmanager
+def use_primary_database():
+    """
+    Routes all the reads to the primary database, could be used either as
+    a context manager or as a view decorator, `@use_primary_database()`.
+
+    Example of usage:
+        >>> with use_primary_database():
+        ...     token = AccessToken.objects.get(token=token)
+    """
+    # every call has its own generator, so nested and concurrent calls of
+    # the same decorator restore their own state
+    token = _forced_primary.set(True)
+    try:
+        yield
+    finally:
+        _forced_primary.reset(token)
+
+
+def reset_replica_routing() -> None:
+    """Forgets about the writes done before, see `ReplicaRoutingMiddleware`."""
+    _written_to_primary.set(False)
+
+
+class ReplicaRouter:
+    """
+    Routes reads to the read replicas listed in `DATABASE_REPLICAS` and
+    writes to the primary database.
+
+    Reads are still served by the primary database when:
+        - something has been written within the current request
+        - the primary database connection is inside a transaction
+        - the code is wrapped with `use_primary_database`
+    """
+
+    def db_for_read(self, model, **hints):
+        if (
+            not settings.DATABASE_REPLICAS
+            or _written_to_primary.get()
+            or _forced_primary.get()
+            or connections[DEFAULT_DB_ALIAS].in_atomic_block
+        ):
+            return DEFAULT_DB_ALIAS
+        return random.choice(settings.DATABASE_REPLICAS)
+
+    def db_for_write(self, model, **hints):
+        _written_to_primary.set(True)
+        return DEFAULT_DB_ALIAS
+
+    def allow_relation(self, obj1, obj2, **hints):
+        databases = {DEFAULT_DB_ALIAS, *settings.DATABASE_REPLICAS}
+        if obj1._state.db in databases and obj2._state.db in databases:
+            return True
+        return None
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        if db in settings.DATABASE_REPLICAS:
+            return False
+        return None
@@ -0,0 +1,194 @@
+import hashlib
+import logging
+import secrets
+import time
+from functools import lru_cache, wraps
+from typing import Callable, Optional
+
+import orjson
+import redis
+from django.conf import settings
+from django.http import HttpRequest, HttpResponse, JsonResponse
+
+from apps.common.redis_client import get_redis
+
+logger = logging.getLogger(__name__)
+
+IDEMPOTENCY_KEY_HEADER = "Idempotency-Key"
+IDEMPOTENCY_KEY_MAX_LENGTH = 255
+REPLAYED_HEADER = "Idempotent-Replayed"
+POLL_INTERVAL = 0.05
+
+# headers, which are specific to the original response
+NOT_STORED_HEADERS = {"set-cookie", "vary"}
+
+RELEASE_LOCK_SCRIPT = """
+if redis.call("GET", KEYS[1]) == ARGV[1] then
+    return redis.call("DEL", KEYS[1])
+end
+return 0
+"""
+
+
+def _error_response(status: int, detail: str) -> JsonResponse:
+    return JsonResponse({"detail": detail}, status=status)
+
+
+def _get_keys(request: HttpRequest, idempotency_key: str) -> tuple[str, str]:
+    # keys are bound to the credentials, so clients can't replay responses
+    # of each other
+    digest = hashlib.sha256(
+        "\n".join(
+            (
+                request.headers.get("Authorization", ""),
+                request.path,
+                idempotency_key,
+            )
+        ).encode()
+    ).hexdigest()
+    return f"idempotency:{digest}", f"idempotency:lock:{digest}"
+
+
+def _get_fingerprint(request: HttpRequest) -> str:
+    return hashlib.sha256(request.method.encode() + request.body).hexdigest()
+
+
+def _is_stored(response: HttpResponse) -> bool:
+    # server errors and throttling are transient, so the request is retried
+    return (
+        not response.streaming
+        and response.status_code < 500
+        and response.status_code != 429
+    )
+
+
+def _store(client, key: str, fingerprint: str, response) -> None:
+    headers = {
+        name: value
+        for name, value in response.items()
+        if name.lower() not in NOT_STORED_HEADERS
+    }
+    pipeline = client.pipeline()
+    pipeline.hset(
+        key,
+        mapping={
+            "fingerprint": fingerprint,
+            "status": response.status_code,
+            "headers": orjson.dumps(headers),
+            "content": response.content,
+        },
+    )
+    pipeline.expire(key, settings.IDEMPOTENCY_TTL)
+    try:
+        pipeline.execute()
+    except redis.RedisError:
+        logger.warning("idempotent response is not stored", exc_info=True)
+
+
+def _replay(stored: dict, fingerprint: str) -> HttpResponse:
+    if stored[b"fingerprint"].decode() != fingerprint:
+        return _error_response(
+            422, f"{IDEMPOTENCY_KEY_HEADER} is used for another request."
+        )
+    response = HttpResponse(
+        content=stored[b"content"], status=int(stored[b"status"])
+    )
+    for name, value in orjson.loads(stored[b"headers"]).items():
+        response[name] = value
+    response[REPLAYED_HEADER] = "true"
+    return response
+
+
+def _wait_or_lock(
+    client, key: str, lock_key: str, lock: str, fingerprint: str
+) -> Optional[HttpResponse]:
+    """
+    Returns the stored response or an error if the request with the same key
+    is still in progress, or None once the lock is acquired.
+    """
+    deadline = time.monotonic() + settings.IDEMPOTENCY_WAIT_TIMEOUT
+    while True:
+        stored = client.hgetall(key)
+        if stored:
+            return _replay(stored, fingerprint)
+        if client.set(
+            lock_key, lock, nx=True, ex=settings.IDEMPOTENCY_LOCK_TIMEOUT
+        ):
+            return None
+        if time.monotonic() > deadline:
+            return _error_response(
+                409,
+                f"Request with the same {IDEMPOTENCY_KEY_HEADER} "
+                "is in progress.",
+            )
+        time.sleep(POLL_INTERVAL)
+
+
+@lru_cache(maxsize=None)
+def _get_release_lock_script():
+    return get_redis().register_script(RELEASE_LOCK_SCRIPT)
+
+
+def idempotent(view_func: Callable) -> Callable:
+    """
+    Adds `Idempotency-Key` header support to POST view.
+
+    The first response is stored in Redis for `IDEMPOTENCY_TTL` seconds and
+    returned for the following requests with the same key, path and
+    credentials without executing the view. Server errors are not stored,
+    so such requests could be retried.
+
+    Concurrent duplicates wait until the first request is done for
+    `IDEMPOTENCY_WAIT_TIMEOUT` seconds, 409 is returned afterwards. Reusing
+    the key for a request with another body results in 422.
+
+    The requests are executed as usual if Redis is not available.
+
+    The view should run outside of the transaction, e.g. be excluded from
+    `ATOMIC_REQUESTS` by `transaction.non_atomic_requests` and manage its
+    own one. Otherwise the response is stored before it's committed and
+    concurrent duplicates wait holding their transactions. Responses
+    carrying credentials should not be stored at all.
+
+    Example of usage:
+        >>> @method_decorator(transaction.non_atomic_requests)
+        ... @method_decorator(idempotent)
+        ... @method_decorator(transaction.atomic)
+        ... def post(self, request, *args, **kwargs):
+        ...     ...
+    """
+
+    @wraps(view_func)
+    def wrapper(request, *args, **kwargs):
+        idempotency_key = request.headers.get(IDEMPOTENCY_KEY_HEADER)
+        if request.method != "POST" or not idempotency_key:
+            return view_func(request, *args, **kwargs)
+        if len(idempotency_key) > IDEMPOTENCY_KEY_MAX_LENGTH:
+            return _error_response(
+                400, f"{IDEMPOTENCY_KEY_HEADER} is too long."
+            )
+
+        client = get_redis()
+        key, lock_key = _get_keys(request, idempotency_key)
+        fingerprint = _get_fingerprint(request)
+        lock = secrets.token_hex(16)
+        try:
+            response = _wait_or_lock(client, key, lock_key, lock, fingerprint)
+        except redis.RedisError:
+            logger.warning("idempotency key is not checked", exc_info=True)
+            return view_func(request, *args, **kwargs)
+        if response is not None:
+            return response
+
+        try:
+            response = view_func(request, *args, **kwargs)
+            if _is_stored(response):
+                _store(client, key, fingerprint, response)
+            return response
+        finally:
+            try:
+                _get_release_lock_script()(keys=[lock_key], args=[lock])
+            except redis.RedisError:
+                logger.warning("idempotency lock is not released")
+
+    return wrapper
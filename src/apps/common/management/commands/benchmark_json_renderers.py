@@ -0,0 +1,67 @@
+import datetime
+import decimal
+import json
+import timeit
+import uuid
+
+from django.core.management.base import BaseCommand
+from django.utils.module_loading import import_string
+from ninja.renderers import JSONRenderer
+
+
+class Command(BaseCommand):
+    help = (
+        "Compares serialization time of the default Ninja JSON renderer and "
+        "the given one, orjson based by default, on a large list payload."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--items", type=int, default=10_000)
+        parser.add_argument("--repeat", type=int, default=10)
+        parser.add_argument(
+            "--renderer",
+            default="services.api.common.renderers.ORJSONRenderer",
+            help="Dotted path of the renderer compared to the default one.",
+        )
+
+    def handle(self, *args, **options):
+        now = datetime.datetime.now(tz=datetime.timezone.utc)
+        payload = [
+            {
+                "id": number,
+                "uuid": uuid.uuid4(),
+                "email": f"user{number}@example.com",
+                "firstName": "John",
+                "lastName": "Doe",
+                "isActive": True,
+                "balance": decimal.Decimal("1234.56"),
+                "dateJoined": now,
+                "lastLogin": None,
+            }
+            for number in range(options["items"])
+        ]
+
+        expected = json.loads(
+            JSONRenderer().render(None, payload, response_status=200)
+        )
+        results = {}
+        renderers = (JSONRenderer(), import_string(options["renderer"])())
+        for renderer in renderers:
+            output = renderer.render(None, payload, response_status=200)
+            if json.loads(output) != expected:
+                self.stderr.write(f"{renderer.__class__.__name__} differs")
+            seconds = timeit.timeit(
+                lambda: renderer.render(None, payload, response_status=200),
+                number=options["repeat"],
+            )
+            results[renderer.__class__.__name__] = seconds / options["repeat"]
+
+        for name, seconds in results.items():
+            self.stdout.write(f"{name}: {seconds * 1000:.2f} ms per render")
+        default, fast = (
+            results[renderer.__class__.__name__] for renderer in renderers
+        )
+        self.stdout.write(
+            f"Saved {(default - fast) * 1000:.2f} ms per render "
+            f"({default / fast:.1f}x faster)"
+        )
@@ -0,0 +1,32 @@
+import os
+
+from django.core.management.base import BaseCommand
+
+from apps.common.task_metrics import render_metrics
+
+
+class Command(BaseCommand):
+    help = (
+        "Prints queue wait, runtime, state and memory growth metrics of "
+        "Celery tasks in Prometheus text format."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--output",
+            help=(
+                "File to write the metrics to atomically, e.g. for "
+                "node_exporter textfile collector."
+            ),
+        )
+
+    def handle(self, *args, **options):
+        metrics = render_metrics()
+        if not options["output"]:
+            self.stdout.write(metrics, ending="")
+            return
+
+        temporary = f"{options['output']}.tmp"
+        with open(temporary, "w") as file:
+            file.write(metrics)
+        os.replace(temporary, options["output"])
@@ -0,0 +1,10 @@
+from django.core.files.storage import storages
+from django.core.management.base import BaseCommand
+
+
+class Command(BaseCommand):
+    help = "Removes the files of the blobs storage nothing references."
+
+    def handle(self, *args, **options):
+        removed = storages["blobs"].collect_garbage()
+        self.stdout.write(f"Removed {removed} unreferenced blobs.")
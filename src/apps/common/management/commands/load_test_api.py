@@ -0,0 +1,77 @@
+import asyncio
+import statistics
+import time
+
+import httpx
+from django.core.management.base import BaseCommand
+
+
+class Command(BaseCommand):
+    help = (
+        "Sends concurrent requests to a running API server and reports "
+        "throughput and latency percentiles. Compare ASGI and WSGI "
+        "deployments by running the same load against\n"
+        "  uvicorn django_project.asgi:application\n"
+        "  uvicorn django_project.wsgi:application --interface wsgi"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("url", help="e.g. http://127.0.0.1:8000/api/...")
+        parser.add_argument("--token", help="OAuth2 access token.")
+        parser.add_argument("--concurrency", type=int, default=1000)
+        parser.add_argument("--requests", type=int, default=10_000)
+        parser.add_argument("--timeout", type=float, default=30)
+
+    def handle(self, *args, **options):
+        latencies, errors, duration = asyncio.run(self._run(options))
+        if not latencies:
+            self.stderr.write(f"All {errors} requests failed")
+            return
+
+        quantiles = statistics.quantiles(latencies, n=100)
+        self.stdout.write(
+            f"{len(latencies)} ok, {errors} failed in {duration:.2f} s, "
+            f"{len(latencies) / duration:.0f} requests/s"
+        )
+        self.stdout.write(
+            "latency ms: "
+            f"p50={quantiles[49] * 1000:.1f} "
+            f"p95={quantiles[94] * 1000:.1f} "
+            f"p99={quantiles[98] * 1000:.1f} "
+            f"max={max(latencies) * 1000:.1f}"
+        )
+
+    async def _run(self, options):
+        headers = {}
+        if options["token"]:
+            headers["Authorization"] = f"Bearer {options['token']}"
+        concurrency = options["concurrency"]
+        limits = httpx.Limits(
+            max_connections=concurrency, max_keepalive_connections=concurrency
+        )
+        latencies = []
+        errors = 0
+        remaining = iter(range(options["requests"]))
+
+        async with httpx.AsyncClient(
+            headers=headers, limits=limits, timeout=options["timeout"]
+        ) as client:
+
+            async def worker():
+                nonlocal errors
+                for _ in remaining:
+                    start = time.perf_counter()
+                    try:
+                        response = await client.get(options["url"])
+                    except httpx.HTTPError:
+                        errors += 1
+                        continue
+                    if response.status_code == 200:
+                        latencies.append(time.perf_counter() - start)
+                    else:
+                        errors += 1
+
+            start = time.perf_counter()
+            await asyncio.gather(*(worker() for _ in range(concurrency)))
+            duration = time.perf_counter() - start
+        return latencies, errors, duration
@@ -0,0 +1,57 @@
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from apps.common.startup import profile_startup
+
+
+class Command(BaseCommand):
+    help = (
+        "Reports import time by module and time of every settings component "
+        "of Django setup and Celery app bootstrap in a fresh interpreter."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--top",
+            type=int,
+            default=25,
+            help="Number of the slowest imports to report.",
+        )
+        parser.add_argument(
+            "--self",
+            action="store_true",
+            dest="self_time",
+            help="Sort imports by self time instead of cumulative one.",
+        )
+        parser.add_argument(
+            "--check",
+            action="store_true",
+            help="Fail if startup takes longer than STARTUP_TIME_BUDGET.",
+        )
+
+    def handle(self, *args, **options):
+        profile = profile_startup()
+
+        self.stdout.write("Settings components:")
+        for component, seconds in sorted(
+            profile.settings_components.items(), key=lambda item: -item[1]
+        ):
+            self.stdout.write(f"  {seconds * 1000:9.2f} ms  {component}")
+
+        self.stdout.write("Slowest imports (self, cumulative):")
+        for module, self_seconds, cumulative in profile.slowest_imports(
+            options["top"], cumulative=not options["self_time"]
+        ):
+            self.stdout.write(
+                f"  {self_seconds * 1000:9.2f} ms {cumulative * 1000:9.2f} ms"
+                f"  {module}"
+            )
+
+        self.stdout.write(
+            f"Django setup: {profile.django_setup * 1000:.2f} ms, "
+            f"Celery bootstrap: {profile.celery * 1000:.2f} ms, "
+            f"total: {profile.total * 1000:.2f} ms "
+            f"(budget {settings.STARTUP_TIME_BUDGET * 1000:.0f} ms)"
+        )
+        if options["check"] and profile.total > settings.STARTUP_TIME_BUDGET:
+            raise CommandError("Startup time budget is exceeded")
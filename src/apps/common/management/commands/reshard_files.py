@@ -0,0 +1,142 @@
+import os
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+
+from django.apps import apps
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connections, transaction
+from django.db.models import FileField
+
+from apps.common.pk_ranges import iterate_range, split_pk_ranges
+from apps.common.services.file_uploadings import (
+    sharded_path,
+    upload_file_handler_path,
+)
+
+
+def _folder_fields(base_path: str) -> dict:
+    """Returns file fields storing the files of the folder by their model."""
+    fields = {}
+    for model in apps.get_models():
+        for field in model._meta.concrete_fields:
+            upload_to = getattr(field, "upload_to", None)
+            if (
+                isinstance(field, FileField)
+                and isinstance(upload_to, partial)
+                and upload_to.func is upload_file_handler_path
+                and upload_to.args[0] == base_path
+            ):
+                fields.setdefault(model, []).append(field)
+    return fields
+
+
+def _link(storage, name: str, target: str) -> None:
+    path = storage.path(target)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    try:
+        os.link(storage.path(name), path)
+    except FileExistsError:
+        # linked by the interrupted run before
+        if not os.path.samefile(storage.path(name), path):
+            raise
+
+
+def _in_thread(function, *args):
+    try:
+        return function(*args)
+    finally:
+        # connections are per thread, the pool threads close their own
+        connections.close_all()
+
+
+class Command(BaseCommand):
+    help = (
+        "Moves the files of the FILE_FOLDERS entry to the directories of its "
+        "shard_depth and updates the model rows referencing them."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("folder", help="Name of the FILE_FOLDERS entry.")
+        parser.add_argument(
+            "--workers",
+            type=int,
+            default=8,
+            help="Number of primary key ranges resharded in parallel.",
+        )
+        parser.add_argument(
+            "--chunk-size",
+            type=int,
+            default=1000,
+            help="Number of rows updated in a single transaction.",
+        )
+
+    def handle(self, *args, **options):
+        try:
+            entry = settings.FILE_FOLDERS[options["folder"]]
+        except KeyError:
+            raise CommandError(f"Unknown folder: {options['folder']}")
+        self.base_path = str(entry["path"])
+        self.shard_depth = entry.get("shard_depth", 0)
+
+        for model, fields in _folder_fields(self.base_path).items():
+            ranges = split_pk_ranges(
+                model._base_manager.all(), options["chunk_size"]
+            )
+            reshard = partial(self._reshard_range, model, fields)
+            if options["workers"] > 1:
+                with ThreadPoolExecutor(options["workers"]) as executor:
+                    moved = sum(
+                        executor.map(partial(_in_thread, reshard), ranges)
+                    )
+            else:
+                moved = sum(map(reshard, ranges))
+            self.stdout.write(
+                f"Moved {moved} files of {model._meta.label} "
+                f"{', '.join(field.name for field in fields)}."
+            )
+
+    def _target(self, name: str):
+        if not name.startswith(f"{self.base_path}/"):
+            return None
+        target = sharded_path(
+            self.base_path, os.path.basename(name), self.shard_depth
+        )
+        return None if target == name else target
+
+    def _reshard_range(self, model, fields, pk_range) -> int:
+        """
+        Reshards the files of the rows within the range. The files are
+        hard linked to the new paths and unlinked from the old ones once the
+        rows are updated, so the files are never missing for the readers.
+        """
+        attnames = [field.attname for field in fields]
+        queryset = model._base_manager.select_for_update().only(
+            "pk", *attnames
+        )
+        moved = []
+        try:
+            with transaction.atomic():
+                instances = []
+                for instance in iterate_range(queryset, *pk_range):
+                    changed = False
+                    for field in fields:
+                        name = getattr(instance, field.attname).name
+                        target = self._target(name) if name else None
+                        if target is None:
+                            continue
+                        _link(field.storage, name, target)
+                        moved.append((field.storage, name, target))
+                        setattr(instance, field.attname, target)
+                        changed = True
+                    if changed:
+                        instances.append(instance)
+                model._base_manager.bulk_update(instances, attnames)
+        except BaseException:
+            for storage, _, target in moved:
+                storage.delete(target)
+            raise
+
+        for storage, name, _ in moved:
+            storage.delete(name)
+        return len(moved)
@@ -0,0 +1,44 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from apps.common.task_registry import discover_task_modules
+from django_project.celery import app
+
+
+class Command(BaseCommand):
+    help = (
+        "Prints TASK_MODULES declaration of the tasks defined in "
+        "services.celery_tasks, the worker imports task modules lazily "
+        "by it."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--check",
+            action="store_true",
+            help="Fail if TASK_MODULES does not match the defined tasks.",
+        )
+
+    def handle(self, *args, **options):
+        modules = discover_task_modules(app)
+
+        if options["check"]:
+            # the declaration the lazy registry of the app is built from
+            declared = app.tasks.modules
+            missing = modules.keys() - declared.keys()
+            stale = {
+                name
+                for name, module in declared.items()
+                if modules.get(name) != module
+            }
+            if missing or stale:
+                raise CommandError(
+                    "TASK_MODULES is out of date, "
+                    f"missing: {sorted(missing)}, stale: {sorted(stale)}"
+                )
+            self.stdout.write("TASK_MODULES is up to date")
+            return
+
+        self.stdout.write("TASK_MODULES = {")
+        for name, module in modules.items():
+            self.stdout.write(f'    "{name}": "{module}",')
+        self.stdout.write("}")
@@ -0,0 +1,270 @@
+import logging
+import threading
+import time
+from contextlib import ExitStack
+
+from asgiref.sync import (
+    iscoroutinefunction,
+    markcoroutinefunction,
+    sync_to_async,
+)
+from django.conf import settings
+from django.contrib.auth import authenticate
+from django.utils.cache import patch_vary_headers
+
+from apps.common.compression import (
+    ENCODING_BROTLI,
+    acompress_sequence,
+    compress,
+    compress_sequence,
+    select_encoding,
+)
+from apps.common.db_routers import reset_replica_routing
+from apps.common.queries import collect_queries
+from apps.common.warmup import is_warmed_up
+
+logger = logging.getLogger(__name__)
+
+
+class AsyncCapableMiddleware:
+    """
+    Base of middlewares supporting both sync and async requests, so Django
+    doesn't switch async views to a thread under ASGI.
+
+    Unlike `MiddlewareMixin`, the hooks are called in the event loop, so they
+    should not do blocking I/O.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(self.get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        self.process_request(request)
+        response = self.get_response(request)
+        return self.process_response(request, response)
+
+    async def __acall__(self, request):
+        self.process_request(request)
+        response = await self.get_response(request)
+        return self.process_response(request, response)
+
+    def process_request(self, request) -> None:
+        pass
+
+    def process_response(self, request, response):
+        return response
+
+
+class ReplicaRoutingMiddleware(AsyncCapableMiddleware):
+    """
+    Starts every request with reads routed to the read replicas, see
+    `apps.common.db_routers.ReplicaRouter`.
+    """
+
+    def process_request(self, request) -> None:
+        reset_replica_routing()
+
+
+class QueryInstrumentationMiddleware(AsyncCapableMiddleware):
+    """
+    Logs number of SQL queries, total database time and number of duplicate
+    query shapes of every request and exposes them to staff users through
+    `Server-Timing` header.
+
+    Queries executed while a streaming response is consumed are not counted.
+    Queries of async requests are executed by the sync thread of the request
+    (see `asgiref.sync.ThreadSensitiveContext`), so they are collected
+    through the connections of that thread.
+    """
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        with collect_queries() as stats:
+            response = self.get_response(request)
+        return self._report(request, response, stats, self._is_staff(request))
+
+    async def __acall__(self, request):
+        collecting = ExitStack()
+        stats = await sync_to_async(collecting.enter_context)(
+            collect_queries()
+        )
+        try:
+            response = await self.get_response(request)
+        finally:
+            await sync_to_async(collecting.close)()
+        # the session user is loaded lazily by the sync ORM
+        is_staff = await sync_to_async(self._is_staff)(request)
+        return self._report(request, response, stats, is_staff)
+
+    def _report(self, request, response, stats, is_staff: bool):
+        fields = stats.as_log_fields()
+        logger.info(
+            "%s %s %s",
+            request.method,
+            request.path,
+            " ".join(f"{key}={value}" for key, value in fields.items()),
+            extra=fields,
+        )
+        if is_staff:
+            response["Server-Timing"] = stats.as_server_timing()
+        return response
+
+    def _is_staff(self, request) -> bool:
+        # API requests are authenticated by the operation, the user it has
+        # authenticated is reused instead of looking up the token again
+        auth = getattr(request, "auth", None)
+        user = auth[0] if isinstance(auth, tuple) else None
+        if user is None:
+            user = getattr(request, "user", None)
+        return user is not None and user.is_staff
+
+
+class FirstRequestLatencyMiddleware(AsyncCapableMiddleware):
+    """
+    Logs latency of the first request served by the process along with
+    whether the process has been warmed up, see `apps.common.warmup`, so
+    cold and warm starts could be compared.
+    """
+
+    def __init__(self, get_response):
+        super().__init__(get_response)
+        self.lock = threading.Lock()
+        self.is_first = True
+
+    def process_request(self, request) -> None:
+        with self.lock:
+            is_first, self.is_first = self.is_first, False
+        request._first_request_start = is_first and time.perf_counter()
+
+    def process_response(self, request, response):
+        start = request._first_request_start
+        if not start:
+            return response
+
+        fields = {
+            "first_request_ms": round((time.perf_counter() - start) * 1000, 2),
+            "warmed_up": is_warmed_up(),
+        }
+        logger.info(
+            "first request %s %s %s",
+            request.method,
+            request.path,
+            " ".join(f"{key}={value}" for key, value in fields.items()),
+            extra=fields,
+        )
+        return response
+
+
+class CompressionMiddleware(AsyncCapableMiddleware):
+    """
+    Compresses responses with brotli or gzip, whichever is preferred by
+    the client according to `Accept-Encoding` header.
+
+    Streaming responses are compressed incrementally, the others only if
+    they are at least `COMPRESSION_MIN_SIZE` bytes long. Responses of
+    `COMPRESSION_EXCLUDED_CONTENT_TYPES` are already compressed and are
+    returned as is.
+    """
+
+    def process_response(self, request, response):
+        if not self._is_compressible(response):
+            return response
+
+        patch_vary_headers(response, ("Accept-Encoding",))
+        encoding = select_encoding(request.headers.get("Accept-Encoding", ""))
+        if encoding is None:
+            return response
+        level = (
+            settings.COMPRESSION_BROTLI_LEVEL
+            if encoding == ENCODING_BROTLI
+            else settings.COMPRESSION_GZIP_LEVEL
+        )
+
+        if response.streaming:
+            if response.is_async:
+                response.streaming_content = acompress_sequence(
+                    response.streaming_content, encoding, level
+                )
+            else:
+                response.streaming_content = compress_sequence(
+                    response.streaming_content, encoding, level
+                )
+            del response.headers["Content-Length"]
+        else:
+            content = compress(response.content, encoding, level)
+            if len(content) >= len(response.content):
+                return response
+            response.content = content
+            response.headers["Content-Length"] = str(len(content))
+
+        # compressed representation has another ETag, so weak one is used
+        # to keep conditional requests working, see RFC 9110 Section 8.8.1
+        etag = response.get("ETag")
+        if etag and etag.startswith('"'):
+            response.headers["ETag"] = "W/" + etag
+        response.headers["Content-Encoding"] = encoding
+        return response
+
+    def _is_compressible(self, response) -> bool:
+        if not response.streaming and (
+            len(response.content) < settings.COMPRESSION_MIN_SIZE
+        ):
+            return False
+        if response.has_header("Content-Encoding"):
+            return False
+        if "no-transform" in response.get("Cache-Control", ""):
+            return False
+        content_type = response.get("Content-Type", "").lower()
+        return not content_type.startswith(
+            tuple(settings.COMPRESSION_EXCLUDED_CONTENT_TYPES)
+        )
+
+
+class OAuth2TokenMiddleware(AsyncCapableMiddleware):
+    """
+    Async capable version of `oauth2_provider.middleware.OAuth2TokenMiddleware`
+    which authenticates the user of the bearer token for Django views, so
+    the middlewares are not switched to sync mode under ASGI.
+
+    The paths of `OAUTH2_TOKEN_MIDDLEWARE_EXCLUDED_PATHS` are skipped, Ninja
+    operations authenticate the bearer token themselves, so the token isn't
+    looked up twice.
+    """
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        if self._has_token(request):
+            self._authenticate(request)
+        return self.process_response(request, self.get_response(request))
+
+    async def __acall__(self, request):
+        if self._has_token(request):
+            # the token and the session user are loaded by the sync ORM
+            await sync_to_async(self._authenticate)(request)
+        return self.process_response(request, await self.get_response(request))
+
+    def _has_token(self, request) -> bool:
+        return request.META.get("HTTP_AUTHORIZATION", "").startswith(
+            "Bearer"
+        ) and not request.path.startswith(
+            tuple(settings.OAUTH2_TOKEN_MIDDLEWARE_EXCLUDED_PATHS)
+        )
+
+    def _authenticate(self, request) -> None:
+        if not hasattr(request, "user") or request.user.is_anonymous:
+            user = authenticate(request=request)
+            if user:
+                request.user = request._cached_user = user
+
+    def process_response(self, request, response):
+        patch_vary_headers(response, ("Authorization",))
+        return response
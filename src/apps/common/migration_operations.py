@@ -0,0 +1,182 @@
+"""
+Migration operations changing indexes and constraints of large tables without
+blocking writes, PostgreSQL only.
+
+The operations could be executed only outside a transaction, so the migration
+using them should set `atomic = False`. Failed concurrent build leaves an
+INVALID index behind, which is dropped when the migration is run again.
+
+Check and foreign key constraints are added without locking in two steps,
+`AddConstraintNotValid` followed by `ValidateConstraint`.
+"""
+
+from django.contrib.postgres import operations as postgres_operations
+from django.contrib.postgres.operations import (
+    AddConstraintNotValid,
+    NotInTransactionMixin,
+    ValidateConstraint,
+)
+from django.db import models
+from django.db.migrations.operations import AddConstraint
+
+__all__ = [
+    "AddConstraintConcurrently",
+    "AddConstraintNotValid",
+    "AddIndexConcurrently",
+    "ValidateConstraint",
+]
+
+SQL_CREATE_UNIQUE_INDEX_CONCURRENTLY = (
+    "CREATE UNIQUE INDEX CONCURRENTLY %(name)s ON %(table)s%(using)s "
+    "(%(columns)s)%(include)s%(extra)s%(condition)s"
+)
+SQL_DROP_INDEX_CONCURRENTLY = "DROP INDEX CONCURRENTLY IF EXISTS %(name)s"
+SQL_ADD_UNIQUE_CONSTRAINT_USING_INDEX = (
+    "ALTER TABLE %(table)s ADD CONSTRAINT %(name)s UNIQUE USING INDEX %(name)s"
+)
+
+
+def prepare_concurrent_index(schema_editor, name: str) -> bool:
+    """
+    Drops INVALID index left by previously failed concurrent build.
+
+    Returns True if valid index with the same name already exists, so there is
+    nothing to build.
+    """
+    with schema_editor.connection.cursor() as cursor:
+        cursor.execute(
+            "SELECT i.indisvalid FROM pg_index i "
+            "JOIN pg_class c ON c.oid = i.indexrelid "
+            "WHERE c.relname = %s AND pg_table_is_visible(c.oid)",
+            [name],
+        )
+        row = cursor.fetchone()
+    if row is None:
+        return False
+    if row[0]:
+        return True
+    drop_index_concurrently(schema_editor, name)
+    return False
+
+
+def drop_index_concurrently(schema_editor, name: str) -> None:
+    schema_editor.execute(
+        SQL_DROP_INDEX_CONCURRENTLY % {"name": schema_editor.quote_name(name)}
+    )
+
+
+def constraint_exists(schema_editor, model, name: str) -> bool:
+    with schema_editor.connection.cursor() as cursor:
+        cursor.execute(
+            "SELECT 1 FROM pg_constraint "
+            "WHERE conname = %s AND conrelid = %s::regclass",
+            [name, model._meta.db_table],
+        )
+        return cursor.fetchone() is not None
+
+
+class AddIndexConcurrently(postgres_operations.AddIndexConcurrently):
+    """
+    Creates index using CREATE INDEX CONCURRENTLY, resuming after previously
+    failed build.
+    """
+
+    def database_forwards(
+        self, app_label, schema_editor, from_state, to_state
+    ):
+        self._ensure_not_in_transaction(schema_editor)
+        model = to_state.apps.get_model(app_label, self.model_name)
+        if not self.allow_migrate_model(schema_editor.connection.alias, model):
+            return
+        if not prepare_concurrent_index(schema_editor, self.index.name):
+            schema_editor.add_index(model, self.index, concurrently=True)
+
+
+class AddConstraintConcurrently(NotInTransactionMixin, AddConstraint):
+    """
+    Creates unique constraint by building its unique index concurrently,
+    resuming after previously failed build.
+
+    Constraints over plain fields are attached to the built index afterwards,
+    which takes a short lock only. Constraints with expressions, conditions,
+    included columns or operator classes are unique indexes themselves.
+    """
+
+    atomic = False
+
+    def __init__(self, model_name, constraint):
+        if not isinstance(constraint, models.UniqueConstraint):
+            raise ValueError(
+                f"{self.__class__.__name__} supports unique constraints only, "
+                "use AddConstraintNotValid and ValidateConstraint instead."
+            )
+        if constraint.deferrable or constraint.nulls_distinct is not None:
+            raise ValueError(
+                "Deferrable constraints and nulls_distinct are not supported."
+            )
+        super().__init__(model_name, constraint)
+
+    def describe(self):
+        return (
+            f"Concurrently create constraint {self.constraint.name} on model "
+            f"{self.model_name}"
+        )
+
+    def _is_index_only(self):
+        constraint = self.constraint
+        return bool(
+            constraint.expressions
+            or constraint.condition
+            or constraint.include
+            or constraint.opclasses
+        )
+
+    def database_forwards(
+        self, app_label, schema_editor, from_state, to_state
+    ):
+        self._ensure_not_in_transaction(schema_editor)
+        model = to_state.apps.get_model(app_label, self.model_name)
+        if not self.allow_migrate_model(schema_editor.connection.alias, model):
+            return
+
+        constraint = self.constraint
+        if not prepare_concurrent_index(schema_editor, constraint.name):
+            index = models.Index(
+                *constraint.expressions,
+                fields=constraint.fields,
+                name=constraint.name,
+                condition=constraint.condition,
+                include=constraint.include,
+                opclasses=constraint.opclasses,
+            )
+            schema_editor.execute(
+                index.create_sql(
+                    model,
+                    schema_editor,
+                    sql=SQL_CREATE_UNIQUE_INDEX_CONCURRENTLY,
+                ),
+                params=None,
+            )
+        if self._is_index_only() or constraint_exists(
+            schema_editor, model, constraint.name
+        ):
+            return
+        schema_editor.execute(
+            SQL_ADD_UNIQUE_CONSTRAINT_USING_INDEX
+            % {
+                "table": schema_editor.quote_name(model._meta.db_table),
+                "name": schema_editor.quote_name(constraint.name),
+            }
+        )
+
+    def database_backwards(
+        self, app_label, schema_editor, from_state, to_state
+    ):
+        self._ensure_not_in_transaction(schema_editor)
+        model = to_state.apps.get_model(app_label, self.model_name)
+        if not self.allow_migrate_model(schema_editor.connection.alias, model):
+            return
+        if self._is_index_only():
+            drop_index_concurrently(schema_editor, self.constraint.name)
+        else:
+            schema_editor.remove_constraint(model, self.constraint)
@@ -30,3 +30,13 @@ class TimeStampedAbstractModel(models.Model):
 
     class Meta:
         abstract = True
+
+
+class ContentBlob(TimeStampedAbstractModel):
+    """
+    Number of references to the file of `ContentAddressedStorage`, the
+    files left without references are removed by `manage.py collect_blobs`.
+    """
+
+    name = models.CharField(_("name"), max_length=255, unique=True)
+    references = models.PositiveIntegerField(_("references"), default=0)
@@ -0,0 +1,29 @@
+def parse_accept(header: str) -> dict[str, float]:
+    """
+    Parses `Accept` like header, e.g. `Accept-Encoding`, into quality values
+    of the listed items by lowercased name. Items without `q` parameter have
+    quality of 1, items with invalid one are skipped.
+
+    Example of usage:
+        >>> parse_accept("gzip;q=0.5, br;q=0, *")
+        {'gzip': 0.5, 'br': 0.0, '*': 1.0}
+    """
+    accepted = {}
+    for item in header.split(","):
+        name, *params = item.split(";")
+        name = name.strip().lower()
+        if not name:
+            continue
+        quality = 1.0
+        for param in params:
+            key, _, value = param.partition("=")
+            if key.strip().lower() != "q":
+                continue
+            try:
+                quality = float(value)
+            except ValueError:
+                quality = None
+            break
+        if quality is not None and 0 <= quality <= 1:
+            accepted[name] = quality
+    return accepted
@@ -0,0 +1,44 @@
+"""
+Processing of large querysets in primary key ranges, used by the fan out
+of Celery tasks (`services.celery_tasks.fanout`) and management commands.
+"""
+
+from typing import Any, Iterator, Optional
+
+from django.db.models import QuerySet
+
+PkRange = tuple[Optional[Any], Optional[Any]]
+
+
+def split_pk_ranges(queryset: QuerySet, chunk_size: int) -> list[PkRange]:
+    """
+    Returns ranges of the queryset primary keys as pairs of exclusive lower
+    and inclusive upper bound, None is unbounded. Each range but the last
+    one holds `chunk_size` rows.
+    """
+    pks = queryset.order_by("pk").values_list("pk", flat=True)
+    ranges = []
+    lower = None
+    while True:
+        chunk = pks if lower is None else pks.filter(pk__gt=lower)
+        try:
+            upper = chunk[chunk_size - 1]
+        except IndexError:
+            ranges.append((lower, None))
+            return ranges
+        ranges.append((lower, upper))
+        lower = upper
+
+
+def iterate_range(
+    queryset: QuerySet, lower, upper, chunk_size: int = 2000
+) -> Iterator:
+    """
+    Iterates over the queryset rows within the primary key range through
+    server-side cursor, so memory usage does not depend on the range size.
+    """
+    if lower is not None:
+        queryset = queryset.filter(pk__gt=lower)
+    if upper is not None:
+        queryset = queryset.filter(pk__lte=upper)
+    return queryset.order_by("pk").iterator(chunk_size=chunk_size)
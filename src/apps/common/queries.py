@@ -0,0 +1,82 @@
+import time
+from collections import Counter
+from contextlib import ExitStack, contextmanager
+from typing import Iterator
+
+from django.db import connections
+
+
+class QueryStats:
+    """
+    Collects SQL queries executed through all the database connections,
+    see `collect_queries`.
+
+    Queries sharing the same SQL but having different params (the shape)
+    are a typical sign of N+1 problem, while fully identical queries are
+    just redundant. Queries are counted per shape, so the memory doesn't
+    grow with the number of queries of the same shape.
+    """
+
+    def __init__(self):
+        self.count = 0
+        self.duration = 0.0
+        self.shapes = Counter()
+        self.identical = Counter()
+
+    def __call__(self, execute, sql, params, many, context):
+        start = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.duration += time.perf_counter() - start
+            self.count += 1
+            self.shapes[sql] += 1
+            self.identical[(sql, hash(str(params)))] += 1
+
+    @property
+    def duration_ms(self) -> float:
+        return self.duration * 1000
+
+    @property
+    def duplicate_shapes(self) -> dict[str, int]:
+        return {sql: count for sql, count in self.shapes.items() if count > 1}
+
+    @property
+    def identical_queries(self) -> dict[str, int]:
+        return {
+            sql: count
+            for (sql, _), count in self.identical.items()
+            if count > 1
+        }
+
+    def as_server_timing(self) -> str:
+        """Returns value for `Server-Timing` response header."""
+        return (
+            f'db;dur={self.duration_ms:.2f};desc="{self.count} queries", '
+            f'db-duplicates;desc="{len(self.duplicate_shapes)} shapes"'
+        )
+
+    def as_log_fields(self) -> dict:
+        return {
+            "db_queries": self.count,
+            "db_time_ms": round(self.duration_ms, 2),
+            "db_duplicate_shapes": len(self.duplicate_shapes),
+        }
+
+
+@contextmanager
+def collect_queries() -> Iterator[QueryStats]:
+    """
+    Collects statistics of SQL queries executed within the block.
+
+    Example of usage:
+        >>> with collect_queries() as stats:
+        ...     list(User.objects.all())
+        >>> stats.count
+        1
+    """
+    stats = QueryStats()
+    with ExitStack() as stack:
+        for connection in connections.all():
+            stack.enter_context(connection.execute_wrapper(stats))
+        yield stats
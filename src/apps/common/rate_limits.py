@@ -0,0 +1,210 @@
+import base64
+import logging
+import math
+from functools import lru_cache, wraps
+from typing import Callable, Iterable, Optional
+from urllib.parse import unquote_plus
+
+import redis
+from django.conf import settings
+from django.http import HttpRequest, JsonResponse
+from ninja.throttling import BaseThrottle
+
+from apps.common.redis_client import get_redis
+
+logger = logging.getLogger(__name__)
+
+KEY_IP = "ip"
+KEY_USER = "user"
+KEY_CLIENT_ID = "client_id"
+
+PERIODS = {"s": 1, "m": 60, "h": 60 * 60, "d": 60 * 60 * 24}
+
+# Token buckets, KEYS are the bucket keys and ARGV are the pairs of refill
+# rate per second and capacity of every bucket. A token is taken from all
+# the buckets only if all of them have one, otherwise the time to wait in
+# seconds is returned. Redis clock is used, so nodes clock skew is ignored.
+TOKEN_BUCKETS_SCRIPT = """
+local time = redis.call("TIME")
+local now = tonumber(time[1]) + tonumber(time[2]) / 1000000
+local wait = 0
+local buckets = {}
+for i, key in ipairs(KEYS) do
+    local rate = tonumber(ARGV[i * 2 - 1])
+    local capacity = tonumber(ARGV[i * 2])
+    local bucket = redis.call("HMGET", key, "tokens", "ts")
+    local tokens = tonumber(bucket[1]) or capacity
+    local elapsed = math.max(0, now - (tonumber(bucket[2]) or now))
+    tokens = math.min(capacity, tokens + elapsed * rate)
+    if tokens < 1 then
+        wait = math.max(wait, (1 - tokens) / rate)
+    end
+    buckets[i] = {tokens, math.ceil(capacity / rate * 1000)}
+end
+for i, key in ipairs(KEYS) do
+    local tokens = buckets[i][1]
+    if wait == 0 then
+        tokens = tokens - 1
+    end
+    redis.call("HSET", key, "tokens", tostring(tokens), "ts", tostring(now))
+    redis.call("PEXPIRE", key, buckets[i][2])
+end
+return tostring(wait)
+"""
+
+
+def parse_rate(rate: str) -> tuple[int, int]:
+    """
+    Returns number of requests and period in seconds of the rate given as
+    `<requests>/<period>`, e.g. `10/m`, where period is one of s, m, h, d.
+    """
+    try:
+        count, period = rate.split("/")
+        return int(count), PERIODS[period]
+    except (ValueError, KeyError):
+        raise ValueError(f"Invalid rate: {rate}") from None
+
+
+def get_client_id(request: HttpRequest) -> Optional[str]:
+    """
+    Returns OAuth2 client_id of the request, either of the access token the
+    request is authenticated with or the one passed to the token endpoint.
+    """
+    auth = getattr(request, "auth", None)
+    if auth:
+        _, access_token = auth
+        return str(access_token.application_id)
+
+    authorization = request.headers.get("Authorization", "")
+    method, _, credentials = authorization.partition(" ")
+    if method.lower() == "basic":
+        try:
+            decoded = base64.b64decode(credentials).decode()
+        except ValueError:
+            return None
+        return unquote_plus(decoded.partition(":")[0]) or None
+    return request.POST.get("client_id")
+
+
+class RateLimit:
+    """
+    Rate limit of the given scope, implemented as a token bucket stored in
+    Redis, so the limit is shared by all the processes and nodes.
+
+    Requests are counted per IP address, user or OAuth2 client_id, the
+    requests without user or client_id are not limited. The rate is taken
+    from `RATE_LIMITS` setting unless it's given explicitly, the bucket
+    capacity is the number of requests per period, so bursts are allowed.
+
+    Example of usage:
+        >>> check_rate_limits(request, [RateLimit("oauth2_token")])
+        0.5
+    """
+
+    def __init__(
+        self, scope: str, key: str = KEY_IP, rate: Optional[str] = None
+    ):
+        if key not in (KEY_IP, KEY_USER, KEY_CLIENT_ID):
+            raise ValueError(f"Unsupported rate limit key: {key}")
+        self.scope = scope
+        self.key = key
+        self._rate = rate
+
+    @property
+    def rate(self) -> str:
+        return self._rate or settings.RATE_LIMITS[self.scope]
+
+    def get_ident(self, request: HttpRequest) -> Optional[str]:
+        if self.key == KEY_USER:
+            auth = getattr(request, "auth", None)
+            if auth:
+                return str(auth[0].pk)
+            user = getattr(request, "user", None)
+            if user is not None and user.is_authenticated:
+                return str(user.pk)
+            return None
+        if self.key == KEY_CLIENT_ID:
+            return get_client_id(request)
+        # respects `NINJA_NUM_PROXIES` setting behind reverse proxies
+        return BaseThrottle().get_ident(request)
+
+    def get_bucket(self, request: HttpRequest) -> Optional[tuple]:
+        ident = self.get_ident(request)
+        if ident is None:
+            return None
+        count, period = parse_rate(self.rate)
+        return (
+            f"rate_limit:{self.scope}:{self.key}:{ident}",
+            count / period,
+            count,
+        )
+
+
+def check_rate_limits(
+    request: HttpRequest, limits: Iterable[RateLimit]
+) -> Optional[float]:
+    """
+    Takes a token from the buckets of all the given limits within a single
+    Redis round trip. Returns None if the request is allowed, otherwise the
+    number of seconds to wait.
+
+    Requests are allowed if Redis is not available, so the rate limiting
+    does not take down the whole service.
+    """
+    if not settings.RATE_LIMITS_ENABLED:
+        return None
+    buckets = [
+        bucket
+        for bucket in (limit.get_bucket(request) for limit in limits)
+        if bucket is not None
+    ]
+    if not buckets:
+        return None
+
+    args = []
+    for _, rate, capacity in buckets:
+        args.extend((rate, capacity))
+    try:
+        wait = float(
+            _get_script()(keys=[key for key, _, _ in buckets], args=args)
+        )
+    except redis.RedisError:
+        logger.warning("rate limits are not checked", exc_info=True)
+        return None
+    return wait or None
+
+
+@lru_cache(maxsize=None)
+def _get_script():
+    # the script is run by EVALSHA, it's loaded on the first call only
+    return get_redis().register_script(TOKEN_BUCKETS_SCRIPT)
+
+
+def rate_limited_response(wait: float) -> JsonResponse:
+    response = JsonResponse({"detail": "Too many requests."}, status=429)
+    response["Retry-After"] = str(max(1, math.ceil(wait)))
+    return response
+
+
+def rate_limit(*limits: RateLimit) -> Callable:
+    """
+    Applies rate limits to Django view, 429 response with `Retry-After`
+    header is returned once any of them is exceeded.
+
+    Example of usage:
+        >>> @method_decorator(rate_limit(RateLimit("oauth2_token")))
+        ... def post(self, request, *args, **kwargs):
+        ...     ...
+    """
+
+    def decorator(view_func: Callable) -> Callable:
+        @wraps(view_func)
+        def wrapper(request, *args, **kwargs):
+            wait = check_rate_limits(request, limits)
+            if wait is not None:
+                return rate_limited_response(wait)
+            return view_func(request, *args, **kwargs)
+
+        return wrapper
+
+    return decorator
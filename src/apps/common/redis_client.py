@@ -0,0 +1,15 @@
+from functools import lru_cache
+
+import redis
+from django.conf import settings
+
+
+@lru_cache(maxsize=None)
+def get_redis() -> redis.Redis:
+    """
+    Returns Redis client for the data shared by all the processes, such as
+    rate limits and locks, which should not be evicted like the cache.
+
+    The client is thread-safe and created once per process.
+    """
+    return redis.Redis.from_url(settings.REDIS_URL)
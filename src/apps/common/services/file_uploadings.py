@@ -1,12 +1,25 @@
+import hashlib
 import os
 import uuid
 from functools import partial
 
+from django.conf import settings
 from django.db.models import Model
 
 
+def sharded_path(base_path: str, filename: str, shard_depth: int) -> str:
+    """
+    Returns path of the file inside `shard_depth` levels of directories
+    named by the hash of its name, e.g. `<base_path>/ab/cd/<filename>` for
+    the depth of 2, so no directory holds too many files.
+    """
+    digest = hashlib.md5(filename.encode(), usedforsecurity=False).hexdigest()
+    shards = [digest[start:][:2] for start in range(0, shard_depth * 2, 2)]
+    return os.path.join(base_path, *shards, filename)
+
+
 def upload_file_handler_path(
-    base_path: str, instance: Model, filename: str
+    base_path: str, instance: Model, filename: str, shard_depth: int = 0
 ) -> str:
     """
     The function implements saving files inside a predefined path prefix,
@@ -20,14 +33,15 @@ def upload_file_handler_path(
     if "." in filename:
         extension = filename.split(".")[-1]
         new_filename = f"{new_filename}.{extension}"
-    file_path = os.path.join(base_path, new_filename)
+    file_path = sharded_path(base_path, new_filename, shard_depth)
     return file_path
 
 
-def prefix_based_upload_handler(path: str) -> partial:
+def prefix_based_upload_handler(path: str, shard_depth: int = 0) -> partial:
     """
     Wrapper for `upload_file_handler_path` which allows to specify path prefix
-    where a new file should be stored.
+    where a new file should be stored and optionally the number of directory
+    levels to shard the files by.
 
     Example of usage:
         >>> class MyModel(models.Model)
@@ -35,4 +49,50 @@ def prefix_based_upload_handler(path: str) -> partial:
         ....       upload_to=prefix_based_upload_handler('user/avatars')
         ....    )
     """
+    if shard_depth:
+        return partial(upload_file_handler_path, path, shard_depth=shard_depth)
     return partial(upload_file_handler_path, path)
+
+
+def folder_upload_handler(folder: str) -> partial:
+    """
+    `prefix_based_upload_handler` for the `FILE_FOLDERS` entry, raises
+    KeyError for the unknown folder.
+
+    Example of usage:
+        >>> class MyModel(models.Model)
+        ...    img = models.ImageField(
+        ....       upload_to=folder_upload_handler('avatars')
+        ....    )
+    """
+    entry = settings.FILE_FOLDERS[folder]
+    return prefix_based_upload_handler(
+        str(entry["path"]), entry.get("shard_depth", 0)
+    )
+
+
+def content_addressed_file_path(
+    base_path: str, instance: Model, filename: str
+) -> str:
+    """
+    The function keeps the extension of user uploaded file only, the file
+    name is given by `ContentAddressedStorage` from the hash of its content.
+    """
+    extension = os.path.splitext(filename)[1]
+    return os.path.join(base_path, f"blob{extension}")
+
+
+def content_addressed_upload_handler(path: str) -> partial:
+    """
+    Variant of `prefix_based_upload_handler` for the files deduplicated by
+    `apps.common.storages.ContentAddressedStorage`, the same file uploaded
+    many times is stored once.
+
+    Example of usage:
+        >>> class MyModel(models.Model)
+        ...    img = models.ImageField(
+        ....       upload_to=content_addressed_upload_handler('user/avatars'),
+        ....       storage=blob_storage,
+        ....    )
+    """
+    return partial(content_addressed_file_path, path)
@@ -0,0 +1,295 @@
+"""
+Resized and format converted variants of the images of the default storage.
+
+The variants of `IMAGE_VARIANTS` are rendered by `images.render_variants`
+task in a process pool, so a single task uses all the CPUs of the worker
+run by `celery worker --profile images -P threads`. The worker of prefork
+pool renders them in its own processes.
+Rendered variants are cached by SHA-256 of the image and the hash of the
+variant spec in Redis and under `variants/` folder of the storage, so the
+same image uploaded twice is rendered once and changed spec is rendered
+again.
+
+    - `image:<name>` is the hash of the image content, empty for the files
+      which are not images or exceed `IMAGE_MAX_SIZE` or `IMAGE_MAX_PIXELS`
+    - `image_variants:<hash>` maps `<variant>:<spec hash>` to the variant
+      path, size and format
+
+The keys expire in `IMAGE_CACHE_TTL`, so the images which are not requested
+anymore don't occupy Redis. The files of the variants which are not cached
+anymore, e.g. of deleted images or changed specs, are removed by
+`images.cleanup_variants` periodic task, see `cleanup_variants`.
+"""
+
+import hashlib
+import json
+import logging
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from datetime import timedelta
+from typing import Iterator, Optional
+
+from django.conf import settings
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from django.utils import timezone
+from PIL import Image, UnidentifiedImageError
+
+from apps.common.negotiation import parse_accept
+from apps.common.redis_client import get_redis
+from apps.common.services.image_rendering import render_variant
+from apps.common.task_registry import send_task
+
+logger = logging.getLogger(__name__)
+
+MIME_TYPES = {"webp": "image/webp", "jpeg": "image/jpeg", "png": "image/png"}
+# supported by every client, the others are listed in `Accept` explicitly
+DEFAULT_FORMATS = ("jpeg", "png")
+
+VARIANTS_FOLDER = "variants"
+
+_pool = None
+
+
+def get_pool() -> ProcessPoolExecutor:
+    """
+    Returns the pool of `IMAGE_PROCESSES` processes of the current process.
+    The processes are spawned rather than forked, so they inherit neither
+    the connections nor the threads of the worker.
+    """
+    global _pool
+    if _pool is None:
+        _pool = ProcessPoolExecutor(
+            max_workers=settings.IMAGE_PROCESSES or None,
+            mp_context=multiprocessing.get_context("spawn"),
+        )
+    return _pool
+
+
+def spec_hash(spec: dict) -> str:
+    return hashlib.sha256(
+        json.dumps(spec, sort_keys=True).encode()
+    ).hexdigest()[:12]
+
+
+def _field(variant: str, spec: dict) -> str:
+    return f"{variant}:{spec_hash(spec)}"
+
+
+def _render(source: bytes, specs: dict[str, dict]) -> Iterator[tuple]:
+    # children of the prefork worker pool are daemonic and can not have
+    # a pool of their own, the prefork pool is the process pool then
+    if multiprocessing.current_process().daemon:
+        for variant, spec in specs.items():
+            yield variant, render_variant(source, spec)
+        return
+
+    futures = {
+        variant: get_pool().submit(render_variant, source, spec)
+        for variant, spec in specs.items()
+    }
+    for variant, future in futures.items():
+        yield variant, future.result()
+
+
+def _skip(client, name: str, reason: str) -> dict:
+    logger.warning("Skipped variants of %s, %s", name, reason)
+    client.set(f"image:{name}", "", ex=settings.IMAGE_CACHE_TTL)
+    return {}
+
+
+def _read_image(file) -> Optional[bytes]:
+    # the size is read from the header, the pixels are decoded by rendering
+    with Image.open(file) as image:
+        width, height = image.size
+    if width * height > settings.IMAGE_MAX_PIXELS:
+        return None
+    file.seek(0)
+    return file.read()
+
+
+def render_variants(name: str) -> dict[str, dict]:
+    """
+    Renders the variants of the image missing in the cache, returns all
+    the variants by name. No variants are returned for the files which are
+    not images or are too large.
+    """
+    client = get_redis()
+    with default_storage.open(name) as file:
+        if file.size > settings.IMAGE_MAX_SIZE:
+            return _skip(client, name, "it's too large")
+        try:
+            source = _read_image(file)
+        except (UnidentifiedImageError, Image.DecompressionBombError):
+            return _skip(client, name, "it's not an image")
+    if source is None:
+        return _skip(client, name, "it has too many pixels")
+    digest = hashlib.sha256(source).hexdigest()
+    key = f"image_variants:{digest}"
+    cached = dict(
+        zip(
+            settings.IMAGE_VARIANTS,
+            client.hmget(
+                key,
+                [
+                    _field(variant, spec)
+                    for variant, spec in settings.IMAGE_VARIANTS.items()
+                ],
+            ),
+        )
+    )
+
+    missing = {
+        variant: spec
+        for variant, spec in settings.IMAGE_VARIANTS.items()
+        if cached[variant] is None
+    }
+    rendered = {}
+    try:
+        for variant, (content, width, height) in _render(source, missing):
+            spec = missing[variant]
+            path = (
+                f"{VARIANTS_FOLDER}/{digest[:2]}/{digest}/"
+                f"{variant}-{spec_hash(spec)}.{spec['format']}"
+            )
+            # left by the run which failed to record it
+            if not default_storage.exists(path):
+                path = default_storage.save(path, ContentFile(content))
+            rendered[_field(variant, spec)] = json.dumps(
+                {
+                    "path": path,
+                    "width": width,
+                    "height": height,
+                    "format": spec["format"],
+                    "size": len(content),
+                }
+            )
+    except (UnidentifiedImageError, Image.DecompressionBombError):
+        return _skip(client, name, "it's not an image")
+
+    with client.pipeline() as pipeline:
+        if rendered:
+            pipeline.hset(key, mapping=rendered)
+        pipeline.expire(key, settings.IMAGE_CACHE_TTL)
+        pipeline.set(f"image:{name}", digest, ex=settings.IMAGE_CACHE_TTL)
+        pipeline.execute()
+    return {
+        variant: json.loads(
+            rendered.get(_field(variant, spec)) or cached[variant]
+        )
+        for variant, spec in settings.IMAGE_VARIANTS.items()
+    }
+
+
+def schedule_variants(name: str) -> None:
+    """Sends the task rendering variants of the image, once till it runs."""
+    # sent by name, so the web process doesn't import the task module
+    send_task("images.render_variants", args=(name,), dedupe=True)
+
+
+def get_variants(name: str) -> Optional[dict[str, dict]]:
+    """
+    Returns the rendered variants of the image by name, None if they are
+    not rendered for the current `IMAGE_VARIANTS` yet and no variants if
+    they are skipped.
+    """
+    client = get_redis()
+    digest = client.get(f"image:{name}")
+    if digest is None:
+        return None
+    if not digest:
+        return {}
+    values = client.hmget(
+        f"image_variants:{digest.decode()}",
+        [
+            _field(variant, spec)
+            for variant, spec in settings.IMAGE_VARIANTS.items()
+        ],
+    )
+    if None in values:
+        return None
+    return {
+        variant: json.loads(value)
+        for variant, value in zip(settings.IMAGE_VARIANTS, values)
+    }
+
+
+def choose_variant(
+    variants: dict[str, dict], accept: str, width: int = None
+) -> Optional[tuple[str, dict]]:
+    """
+    Returns the smallest variant in the format accepted by the client, at
+    least `width` wide if there is such one and the widest one otherwise.
+    Formats other than `DEFAULT_FORMATS` should be listed in `Accept` with
+    non-zero quality, wildcards don't count as clients send them for the
+    formats they can't decode.
+    """
+    accepted = parse_accept(accept)
+    candidates = [
+        (variant, info)
+        for variant, info in variants.items()
+        if info["format"] in DEFAULT_FORMATS
+        or accepted.get(MIME_TYPES[info["format"]], 0) > 0
+    ]
+    if not candidates:
+        return None
+    if width:
+        wide_enough = [
+            candidate
+            for candidate in candidates
+            if candidate[1]["width"] >= width
+        ]
+        if wide_enough:
+            return min(
+                wide_enough,
+                key=lambda item: (item[1]["width"], item[1]["size"]),
+            )
+    return max(
+        candidates, key=lambda item: (item[1]["width"], -item[1]["size"])
+    )
+
+
+def cleanup_variants() -> int:
+    """
+    Removes the files of the variants which are not cached in Redis for
+    the current `IMAGE_VARIANTS`, returns the number of removed files.
+
+    The variants are shared by the images of the same content, so they are
+    removed once the cache of all of them has expired rather than once the
+    image is deleted. The files rendered recently are kept, as the task
+    rendering them may not have recorded them in Redis yet.
+    """
+    if not default_storage.exists(VARIANTS_FOLDER):
+        return 0
+
+    client = get_redis()
+    fields = {
+        _field(variant, spec)
+        for variant, spec in settings.IMAGE_VARIANTS.items()
+    }
+    deadline = timezone.now() - timedelta(
+        seconds=settings.CELERY_TASK_TIME_LIMIT
+    )
+    removed = 0
+    prefixes, _ = default_storage.listdir(VARIANTS_FOLDER)
+    for prefix in prefixes:
+        digests, _ = default_storage.listdir(f"{VARIANTS_FOLDER}/{prefix}")
+        for digest in digests:
+            folder = f"{VARIANTS_FOLDER}/{prefix}/{digest}"
+            cached = fields & {
+                field.decode()
+                for field in client.hkeys(f"image_variants:{digest}")
+            }
+            _, files = default_storage.listdir(folder)
+            for file_name in files:
+                # `<variant>-<spec hash>.<format>` of `<variant>:<spec hash>`
+                variant, _, rest = file_name.rpartition("-")
+                field = f"{variant}:{rest.partition('.')[0]}"
+                path = f"{folder}/{file_name}"
+                if field in cached or (
+                    default_storage.get_modified_time(path) > deadline
+                ):
+                    continue
+                default_storage.delete(path)
+                removed += 1
+    return removed
@@ -0,0 +1,47 @@
+"""
+Rendering of image variants in the processes of the derivatives pool, see
+`apps.common.services.image_derivatives`. The module is imported by every
+spawned process, so it depends on Pillow only.
+"""
+
+import io
+
+from PIL import Image, ImageOps
+
+# variant format to Pillow format and the modes it saves
+FORMATS = {
+    "webp": ("WEBP", ("RGB", "RGBA")),
+    "jpeg": ("JPEG", ("RGB",)),
+    "png": ("PNG", ("RGB", "RGBA", "L", "LA", "P")),
+}
+
+
+def render_variant(source: bytes, spec: dict) -> tuple[bytes, int, int]:
+    """
+    Resizes the image to fit `width` x `height` of the spec, never upscaling
+    it, and encodes it to the spec `format` with the `quality`. Returns the
+    encoded variant and its size.
+    """
+    image_format, modes = FORMATS[spec["format"]]
+    size = (spec["width"], spec.get("height", spec["width"]))
+
+    with Image.open(io.BytesIO(source)) as image:
+        # JPEG is decoded at the smallest scale still covering the size,
+        # in either orientation
+        image.draft("RGB", (max(size), max(size)))
+        image = ImageOps.exif_transpose(image)
+        image.thumbnail(size, Image.Resampling.LANCZOS)
+        if image.mode not in modes:
+            has_alpha = "A" in image.getbands() or "transparency" in image.info
+            image = image.convert(
+                "RGBA" if has_alpha and "RGBA" in modes else "RGB"
+            )
+
+        output = io.BytesIO()
+        image.save(
+            output,
+            format=image_format,
+            quality=spec.get("quality", 80),
+            optimize=True,
+        )
+        return output.getvalue(), image.width, image.height
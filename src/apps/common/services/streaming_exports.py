@@ -0,0 +1,77 @@
+import csv
+import json
+from typing import Iterator
+
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db.models import QuerySet
+from django.http import StreamingHttpResponse
+
+EXPORT_FORMAT_CSV = "csv"
+EXPORT_FORMAT_NDJSON = "ndjson"
+EXPORT_CONTENT_TYPES = {
+    EXPORT_FORMAT_CSV: "text/csv",
+    EXPORT_FORMAT_NDJSON: "application/x-ndjson",
+}
+
+
+class _Echo:
+    """File-like object which returns written value instead of storing it."""
+
+    def write(self, value: str) -> str:
+        return value
+
+
+def iter_export(
+    queryset: QuerySet,
+    fields: list[str],
+    export_format: str = EXPORT_FORMAT_CSV,
+    chunk_size: int = 2000,
+) -> Iterator[str]:
+    """
+    Serializes queryset rows into CSV or NDJSON chunks.
+
+    Rows are fetched through a server-side cursor `chunk_size` rows at a time
+    and every chunk is serialized into a single string, so memory usage does
+    not depend on the number of rows.
+    """
+    if export_format not in EXPORT_CONTENT_TYPES:
+        raise ValueError(f"Unsupported export format: {export_format}")
+
+    writer = csv.writer(_Echo())
+    if export_format == EXPORT_FORMAT_CSV:
+        yield writer.writerow(fields)
+
+    rows = queryset.values_list(*fields).iterator(chunk_size=chunk_size)
+    chunk = []
+    for row in rows:
+        if export_format == EXPORT_FORMAT_CSV:
+            chunk.append(writer.writerow(row))
+        else:
+            record = dict(zip(fields, row))
+            chunk.append(json.dumps(record, cls=DjangoJSONEncoder) + "\n")
+        if len(chunk) >= chunk_size:
+            yield "".join(chunk)
+            chunk = []
+    if chunk:
+        yield "".join(chunk)
+
+
+def streaming_export_response(
+    queryset: QuerySet,
+    fields: list[str],
+    filename: str,
+    export_format: str = EXPORT_FORMAT_CSV,
+) -> StreamingHttpResponse:
+    """
+    Returns response streaming queryset export as an attachment, see
+    `iter_export`.
+    """
+    return StreamingHttpResponse(
+        iter_export(queryset, fields, export_format),
+        content_type=EXPORT_CONTENT_TYPES[export_format],
+        headers={
+            "Content-Disposition": (
+                f'attachment; filename="{filename}.{export_format}"'
+            ),
+        },
+    )
@@ -0,0 +1,112 @@
+from functools import partial
+
+from django.apps import apps
+from django.core.files.storage import default_storage
+from django.db import transaction
+from django.db.models import FileField, ImageField
+from django.db.models.signals import post_delete, post_save, pre_save
+
+from apps.common.services.image_derivatives import schedule_variants
+from apps.common.storages import ContentAddressedStorage
+
+
+def _blob_fields(model) -> list[FileField]:
+    return [
+        field
+        for field in model._meta.concrete_fields
+        if isinstance(field, FileField)
+        and isinstance(field.storage, ContentAddressedStorage)
+    ]
+
+
+def _release(field: FileField, name: str) -> None:
+    # references are removed once the change is committed, so the rolled
+    # back one keeps the reference and the file is never lost
+    transaction.on_commit(partial(field.storage.delete, name))
+
+
+def release_replaced_blobs(
+    sender, instance, raw=False, update_fields=None, **kwargs
+):
+    if raw or instance._state.adding:
+        return
+    fields = [
+        field
+        for field in _blob_fields(sender)
+        if update_fields is None or field.name in update_fields
+    ]
+    if not fields:
+        return
+
+    previous = (
+        sender._base_manager.filter(pk=instance.pk)
+        .values(*[field.attname for field in fields])
+        .first()
+    )
+    if previous is None:
+        return
+    for field in fields:
+        file = getattr(instance, field.attname)
+        previous_name = previous[field.attname] or ""
+        if file._committed and (file.name or "") == previous_name:
+            continue
+        # the storage adds the reference of the saved file only, the name
+        # of the stored one could be assigned as well
+        if file._committed and file.name:
+            field.storage.reference(file.name)
+        if previous_name:
+            _release(field, previous_name)
+
+
+def release_deleted_blobs(sender, instance, **kwargs):
+    for field in _blob_fields(sender):
+        name = getattr(instance, field.attname).name
+        if name:
+            _release(field, name)
+
+
+def connect_blob_receivers() -> None:
+    """
+    Connects reference counting of `ContentAddressedStorage` files to the
+    models storing them, only those models pay for the receivers.
+    """
+    for model in apps.get_models():
+        if _blob_fields(model):
+            pre_save.connect(release_replaced_blobs, sender=model)
+            post_delete.connect(release_deleted_blobs, sender=model)
+
+
+def _image_fields(model) -> list[ImageField]:
+    return [
+        field
+        for field in model._meta.concrete_fields
+        if isinstance(field, ImageField) and field.storage is default_storage
+    ]
+
+
+def mark_new_images(sender, instance, raw=False, **kwargs):
+    if raw:
+        return
+    # file names are assigned while saving, they are read in post_save
+    instance._new_images = [
+        field.attname
+        for field in _image_fields(sender)
+        if not getattr(instance, field.attname)._committed
+    ]
+
+
+def schedule_new_images(sender, instance, raw=False, **kwargs):
+    for attname in instance.__dict__.pop("_new_images", ()):
+        name = getattr(instance, attname).name
+        transaction.on_commit(partial(schedule_variants, name))
+
+
+def connect_image_receivers() -> None:
+    """
+    Connects rendering of image variants to the models storing images in
+    the default storage, see `apps.common.services.image_derivatives`.
+    """
+    for model in apps.get_models():
+        if _image_fields(model):
+            pre_save.connect(mark_new_images, sender=model)
+            post_save.connect(schedule_new_images, sender=model)
@@ -0,0 +1,105 @@
+import json
+import os
+import subprocess
+import sys
+
+from django.conf import settings
+
+# executed by a fresh interpreter, so nothing is imported yet
+STARTUP_SCRIPT = """
+import json, os, time
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "django_project.settings")
+# the Celery app is imported by django_project package, so it's imported
+# before Django setup to be timed on its own
+start = time.perf_counter()
+import django_project.celery
+celery = time.perf_counter()
+import django
+django.setup()
+from django.conf import settings
+print(json.dumps({
+    "django_setup": time.perf_counter() - celery,
+    "celery": celery - start,
+    "settings": settings.SETTINGS_COMPONENT_TIMES,
+}))
+"""
+
+
+class StartupProfile:
+    """
+    Startup time of Django and Celery bootstrap measured in a fresh
+    interpreter, see `profile_startup`.
+
+    Import times are `(module, self seconds, cumulative seconds)` tuples
+    reported by `python -X importtime`.
+    """
+
+    def __init__(
+        self,
+        django_setup: float,
+        celery: float,
+        settings_components: dict[str, float],
+        imports: list[tuple[str, float, float]],
+    ):
+        self.django_setup = django_setup
+        self.celery = celery
+        self.settings_components = settings_components
+        self.imports = imports
+
+    @property
+    def total(self) -> float:
+        return self.django_setup + self.celery
+
+    def slowest_imports(
+        self, count: int, cumulative: bool = True
+    ) -> list[tuple[str, float, float]]:
+        index = 2 if cumulative else 1
+        return sorted(self.imports, key=lambda row: -row[index])[:count]
+
+
+def parse_import_times(output: str) -> list[tuple[str, float, float]]:
+    """Parses `python -X importtime` output."""
+    imports = []
+    for line in output.splitlines():
+        if not line.startswith("import time:"):
+            continue
+        self_us, cumulative_us, module = line.removeprefix(
+            "import time:"
+        ).split("|")
+        if not self_us.strip().isdigit():
+            # the header line
+            continue
+        imports.append(
+            (
+                module.strip(),
+                int(self_us) / 10**6,
+                int(cumulative_us) / 10**6,
+            )
+        )
+    return imports
+
+
+def profile_startup() -> StartupProfile:
+    """
+    Profiles Django setup and Celery app bootstrap in a fresh interpreter.
+
+    Example of usage:
+        >>> profile = profile_startup()
+        >>> profile.total < settings.STARTUP_TIME_BUDGET
+        True
+    """
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", STARTUP_SCRIPT],
+        cwd=settings.BASE_DIR,
+        env={**os.environ, "DJANGO_SETTINGS_MODULE": settings.SETTINGS_MODULE},
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    timings = json.loads(result.stdout.strip().splitlines()[-1])
+    return StartupProfile(
+        django_setup=timings["django_setup"],
+        celery=timings["celery"],
+        settings_components=timings["settings"],
+        imports=parse_import_times(result.stderr),
+    )
@@ -0,0 +1,125 @@
+import hashlib
+import os
+from functools import partial
+from uuid import uuid4
+
+from django.core.exceptions import SuspiciousFileOperation
+from django.core.files import File
+from django.core.files.storage import FileSystemStorage, storages
+from django.core.files.utils import validate_file_name
+from django.db import transaction
+from django.db.models import F
+
+from apps.common.models import ContentBlob
+from apps.common.redis_client import get_redis
+
+# names of the files written by the saves which are not committed yet
+WRITTEN_KEY = "content_blobs:written"
+
+
+class ContentAddressedStorage(FileSystemStorage):
+    """
+    File system storage naming files by SHA-256 of their content,
+    `<folder>/<hash[:2]>/<hash><extension>` for the `<folder>/<name>` given
+    by `upload_to`, so identical files are stored once.
+
+    Every save of the file adds a reference to its `ContentBlob` and every
+    delete removes one, the file itself is removed by `collect_garbage` once
+    nothing references it. Blobs are locked by their rows, so a file being
+    collected is never reused half removed.
+
+    The file is written within the transaction adding its blob, so the file
+    of a rolled back save is left without a blob. Written files are listed
+    in Redis till the transaction is committed, `collect_garbage` collects
+    the ones which are still listed as unreferenced.
+    """
+
+    def save(self, name, content, max_length=None):
+        if name is None:
+            name = content.name
+        if not hasattr(content, "chunks"):
+            content = File(content, name)
+
+        folder, filename = os.path.split(name)
+        digest = _content_sha256(content)
+        extension = os.path.splitext(filename)[1].lower()
+        name = os.path.join(folder, digest[:2], f"{digest}{extension}")
+        validate_file_name(name, allow_relative_path=True)
+        if max_length is not None and len(name) > max_length:
+            raise SuspiciousFileOperation(
+                f"Storage can not find an available filename for {name}."
+            )
+
+        with transaction.atomic():
+            blob, _ = ContentBlob.objects.select_for_update().get_or_create(
+                name=name
+            )
+            if not self.exists(name):
+                client = get_redis()
+                client.sadd(WRITTEN_KEY, name)
+                transaction.on_commit(partial(client.srem, WRITTEN_KEY, name))
+                self._save_atomically(name, content)
+            ContentBlob.objects.filter(pk=blob.pk).update(
+                references=F("references") + 1
+            )
+        return name
+
+    def _save_atomically(self, name: str, content: File) -> None:
+        # the file is moved in place once written, so the interrupted write
+        # never leaves a blob with partial content under its hash
+        temporary = self._save(f"{name}.{uuid4().hex}.tmp", content)
+        os.replace(self.path(temporary), self.path(name))
+
+    def delete(self, name):
+        """Removes a reference to the file, see `collect_garbage`."""
+        if not name:
+            raise ValueError("The name must be given to delete().")
+        ContentBlob.objects.filter(name=name, references__gt=0).update(
+            references=F("references") - 1
+        )
+
+    def reference(self, name: str) -> None:
+        """Adds a reference to the stored file, e.g. assigned by name."""
+        ContentBlob.objects.filter(name=name).update(
+            references=F("references") + 1
+        )
+
+    def collect_garbage(self) -> int:
+        """Removes the files without references, returns their number."""
+        self._adopt_rolled_back()
+        removed = 0
+        unreferenced = ContentBlob.objects.filter(references=0)
+        for pk in unreferenced.values_list("pk", flat=True).iterator():
+            with transaction.atomic():
+                blob = (
+                    unreferenced.select_for_update(skip_locked=True)
+                    .filter(pk=pk)
+                    .first()
+                )
+                if blob is None:
+                    continue
+                super().delete(blob.name)
+                blob.delete()
+                removed += 1
+        return removed
+
+    def _adopt_rolled_back(self) -> None:
+        # the blob is created unless the save is committed, the insert waits
+        # for the transaction of the save still in progress
+        client = get_redis()
+        for name in client.smembers(WRITTEN_KEY):
+            ContentBlob.objects.get_or_create(name=name.decode())
+            client.srem(WRITTEN_KEY, name)
+
+
+def blob_storage() -> ContentAddressedStorage:
+    """`FileField.storage` callable of the `blobs` storage."""
+    return storages["blobs"]
+
+
+def _content_sha256(content: File) -> str:
+    sha256 = hashlib.sha256()
+    for chunk in content.chunks():
+        sha256.update(chunk)
+    content.seek(0)
+    return sha256.hexdigest()
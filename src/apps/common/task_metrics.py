@@ -0,0 +1,156 @@
+"""
+Celery task metrics collected from the task signals without result backend.
+
+    - queue wait, from the task publishing (or ETA) to its start
+    - runtime histogram by task name
+    - number of finished tasks by task name and state, e.g. retry
+    - growth of the worker process max RSS by task name
+
+The metrics are aggregated by all the workers in Redis and rendered in
+Prometheus text format by `manage.py celery_metrics`. Queue wait is measured
+by the clocks of different hosts, so it includes their skew.
+"""
+
+import logging
+import resource
+import time
+from bisect import bisect_left
+from collections import defaultdict
+from datetime import datetime
+from typing import Optional
+
+import redis
+
+from apps.common.redis_client import get_redis
+
+logger = logging.getLogger(__name__)
+
+METRICS_KEY = "celery_metrics"
+SENT_AT_HEADER = "sent_at"
+BUCKETS = (0.01, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60, 300, 900, 3600)
+
+HISTOGRAMS = {
+    "wait": (
+        "celery_task_queue_wait_seconds",
+        "Time from publishing of the task till its start.",
+    ),
+    "runtime": ("celery_task_runtime_seconds", "Task runtime."),
+}
+COUNTERS = {
+    "state": (
+        "celery_tasks_total",
+        "Number of finished tasks by state.",
+    ),
+    "rss": (
+        "celery_task_max_rss_growth_bytes_total",
+        "Growth of the worker process max RSS while running the task.",
+    ),
+}
+
+
+def _max_rss() -> int:
+    # kilobytes on Linux
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024
+
+
+def mark_published(headers: dict, **kwargs) -> None:
+    """Adds publishing time to the task message, `before_task_publish`."""
+    headers.setdefault(SENT_AT_HEADER, time.time())
+
+
+def _queue_wait(request) -> Optional[float]:
+    sent_at = getattr(request, SENT_AT_HEADER, None)
+    if sent_at is None:
+        return None
+    if request.eta:
+        sent_at = max(sent_at, datetime.fromisoformat(request.eta).timestamp())
+    return max(time.time() - sent_at, 0)
+
+
+def start_measuring(task, **kwargs) -> None:
+    """Remembers the task start, `task_prerun`."""
+    task.request.metrics_start = (
+        _queue_wait(task.request),
+        time.perf_counter(),
+        _max_rss(),
+    )
+
+
+def _observe(pipeline, kind: str, task_name: str, value: float) -> None:
+    index = bisect_left(BUCKETS, value)
+    pipeline.hincrby(METRICS_KEY, f"{kind}|{task_name}|{index}", 1)
+    pipeline.hincrbyfloat(METRICS_KEY, f"{kind}|{task_name}|sum", value)
+
+
+def record_metrics(task, state: str = None, **kwargs) -> None:
+    """Records metrics of the finished task, `task_postrun`."""
+    start = getattr(task.request, "metrics_start", None)
+    if start is None:
+        return
+    wait, started_at, max_rss = start
+    runtime = time.perf_counter() - started_at
+
+    try:
+        with get_redis().pipeline(transaction=False) as pipeline:
+            if wait is not None:
+                _observe(pipeline, "wait", task.name, wait)
+            _observe(pipeline, "runtime", task.name, runtime)
+            pipeline.hincrby(
+                METRICS_KEY,
+                f"state|{task.name}|{(state or 'unknown').lower()}",
+                1,
+            )
+            pipeline.hincrby(
+                METRICS_KEY, f"rss|{task.name}|", _max_rss() - max_rss
+            )
+            pipeline.execute()
+    except redis.RedisError:
+        logger.exception("Failed to record metrics of %s", task.name)
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _render_histogram(name, task_name, values) -> list[str]:
+    labels = f'task="{_escape(task_name)}"'
+    lines = []
+    count = 0
+    for index, le in enumerate([*BUCKETS, "+Inf"]):
+        count += int(values.get(str(index), 0))
+        lines.append(f'{name}_bucket{{{labels},le="{le}"}} {count}')
+    lines.append(f"{name}_sum{{{labels}}} {float(values.get('sum', 0))}")
+    lines.append(f"{name}_count{{{labels}}} {count}")
+    return lines
+
+
+def _render_counter(kind, name, task_name, values) -> list[str]:
+    labels = f'task="{_escape(task_name)}"'
+    return [
+        (
+            f'{name}{{{labels},{kind}="{_escape(label)}"}} {value}'
+            if label
+            else f"{name}{{{labels}}} {value}"
+        )
+        for label, value in sorted(values.items())
+    ]
+
+
+def render_metrics() -> str:
+    """Returns the collected metrics in Prometheus text format."""
+    metrics = defaultdict(lambda: defaultdict(dict))
+    for field, value in get_redis().hgetall(METRICS_KEY).items():
+        kind, field = field.decode().split("|", 1)
+        task_name, suffix = field.rsplit("|", 1)
+        metrics[kind][task_name][suffix] = value.decode()
+
+    lines = []
+    for kind, (name, description) in HISTOGRAMS.items():
+        lines += [f"# HELP {name} {description}", f"# TYPE {name} histogram"]
+        for task_name, values in sorted(metrics[kind].items()):
+            lines += _render_histogram(name, task_name, values)
+    for kind, (name, description) in COUNTERS.items():
+        lines += [f"# HELP {name} {description}", f"# TYPE {name} counter"]
+        for task_name, values in sorted(metrics[kind].items()):
+            lines += _render_counter(kind, name, task_name, values)
+    return "\n".join(lines) + "\n"
@@ -0,0 +1,159 @@
+"""
+Celery task registry importing the task modules lazily.
+
+Task modules are declared in `services.celery_tasks.TASK_MODULES`, the worker
+imports a module once the first message of its task arrives, so the worker
+startup does not grow with the number of task modules. Processes which only
+send tasks use `send_task` by name and never import the task bodies.
+
+`manage.py task_registry --check` verifies the declaration matches the tasks
+defined in `services.celery_tasks`.
+"""
+
+import hashlib
+import importlib
+import json
+import logging
+import pkgutil
+from typing import Optional
+
+import redis
+from celery import Celery, current_app
+from celery.app import trace
+from celery.app.registry import TaskRegistry
+from celery.exceptions import NotRegistered
+from celery.result import AsyncResult
+from celery.utils import uuid
+from celery.worker.consumer import Consumer
+
+from apps.common.redis_client import get_redis
+
+logger = logging.getLogger(__name__)
+
+TASKS_PACKAGE = "services.celery_tasks"
+
+
+class LazyTaskRegistry(TaskRegistry):
+    """
+    Imports the module of a task declared in `modules` on the first lookup
+    of the task by name, e.g. `app.tasks[name]`.
+
+    `name in registry` and `registry.get(name)` check the loaded tasks only.
+    """
+
+    def __init__(self, modules: dict[str, str]):
+        super().__init__()
+        self.modules = modules
+
+    def __missing__(self, name):
+        module = self.modules.get(name)
+        if module is None:
+            raise NotRegistered(name)
+        importlib.import_module(module)
+        if not dict.__contains__(self, name):
+            raise NotRegistered(name)
+
+        task = dict.__getitem__(self, name)
+        if trace._localized:
+            # the worker has built tracers of the tasks loaded on its startup
+            _, _, hostname = trace._localized
+            task.__trace__ = trace.build_tracer(
+                name, task, task.app.loader, hostname, app=task.app
+            )
+        return task
+
+
+class LazyStrategies(dict):
+    """Starts execution strategy of a task on the first message of it."""
+
+    def __init__(self, consumer: Consumer):
+        super().__init__()
+        self.consumer = consumer
+
+    def __missing__(self, name):
+        app = self.consumer.app
+        strategy = self[name] = app.tasks[name].start_strategy(
+            app, self.consumer
+        )
+        return strategy
+
+
+class LazyConsumer(Consumer):
+    """Worker consumer accepting messages of the tasks not loaded yet."""
+
+    def Strategies(self):
+        return LazyStrategies(self)
+
+
+def discover_task_modules(
+    app: Celery, package: str = TASKS_PACKAGE
+) -> dict[str, str]:
+    """Imports all the modules of the package and maps their tasks to them."""
+    package_module = importlib.import_module(package)
+    for module_info in pkgutil.walk_packages(
+        package_module.__path__, f"{package}."
+    ):
+        importlib.import_module(module_info.name)
+
+    return {
+        name: task.__module__
+        for name, task in sorted(app.tasks.items())
+        if task.__module__.startswith(f"{package}.")
+    }
+
+
+def pending_key(name: str, args, kwargs) -> str:
+    """Redis key of the pending call of the task, see `claim_pending`."""
+    call = json.dumps([args or (), kwargs or {}], sort_keys=True)
+    digest = hashlib.sha256(call.encode()).hexdigest()
+    return f"task_pending:{name}:{digest}"
+
+
+def claim_pending(
+    app: Celery, name: str, args, kwargs, task_id: str
+) -> Optional[str]:
+    """
+    Records the call of the task as pending till the broker
+    `visibility_timeout`, returns id of the identical call pending already.
+    The record is released once the task is started, see `dedupe` option of
+    `services.celery_tasks.locking.LockingTask`.
+    """
+    timeout = app.conf.broker_transport_options.get("visibility_timeout", 3600)
+    key = pending_key(name, args, kwargs)
+    try:
+        client = get_redis()
+        if not client.set(key, task_id, nx=True, ex=timeout):
+            pending_id = client.get(key)
+            if pending_id and pending_id.decode() != task_id:
+                return pending_id.decode()
+    except redis.RedisError:
+        logger.exception("Failed to check pending %s", name)
+    return None
+
+
+def send_task(
+    name: str,
+    args=None,
+    kwargs=None,
+    dedupe: bool = False,
+    app: Celery = None,
+    **options,
+) -> AsyncResult:
+    """
+    Sends the task by name without importing its module, the message is
+    routed by `task_routes` of the name. `dedupe` should match the option of
+    the task, the identical pending call is returned then.
+
+    Example of usage:
+        >>> send_task("images.render_variants", args=(name,), dedupe=True)
+    """
+    app = app or current_app
+    if app.conf.task_always_eager:
+        return app.tasks[name].apply_async(args, kwargs, **options)
+
+    task_id = options.pop("task_id", None) or uuid()
+    if dedupe:
+        pending_id = claim_pending(app, name, args, kwargs, task_id)
+        if pending_id is not None:
+            return app.AsyncResult(pending_id)
+    return app.send_task(name, args, kwargs, task_id=task_id, **options)
@@ -0,0 +1,50 @@
+"""
+Priority lanes of Celery tasks.
+
+Tasks are routed to the queues (lanes) by `CELERY_TASK_ROUTES`, a worker
+profile of `CELERY_WORKER_PROFILES` selects queues the worker consumes, its
+concurrency and prefetch multiplier. Latency-sensitive queue consumed by its
+own workers prefetching one message per process is never stuck behind a
+backlog of bulk tasks.
+
+Example of usage:
+    celery -A django_project.celery.app worker --profile latency
+"""
+
+import click
+from billiard import cpu_count
+from celery.exceptions import ImproperlyConfigured
+from django.conf import settings
+
+WORKER_PROFILE_OPTION = click.Option(
+    ("--profile",),
+    help=(
+        "Worker profile of CELERY_WORKER_PROFILES setting queues, "
+        "concurrency and prefetch multiplier, -Q takes precedence."
+    ),
+)
+
+
+def apply_worker_profile(worker, name: str, options: dict) -> None:
+    """
+    Sets queues, concurrency and prefetch multiplier of the worker by the
+    profile, should be called on `worker_init`, before the worker sets its
+    pool and consumer up. The command line `options` received by
+    `celeryd_init` take precedence.
+    """
+    try:
+        profile = settings.CELERY_WORKER_PROFILES[name]
+    except KeyError:
+        raise ImproperlyConfigured(
+            f"Unknown worker profile {name!r}, choices are: "
+            f"{', '.join(settings.CELERY_WORKER_PROFILES)}"
+        )
+
+    if not options.get("queues"):
+        worker.app.amqp.queues.select(profile["queues"])
+    if not options.get("concurrency"):
+        worker.concurrency = profile["concurrency"] or cpu_count()
+    # the command line passes the configured multiplier unless it's given
+    multiplier = options.get("prefetch_multiplier")
+    if multiplier in (None, worker.app.conf.worker_prefetch_multiplier):
+        worker.prefetch_multiplier = profile["prefetch_multiplier"]
@@ -0,0 +1,65 @@
+from django.db import connection
+from django.test import TransactionTestCase
+from ninja.testing import TestClient
+
+from services.api.common.api import NinjaAPI
+from services.api.common.routers import Router
+from services.api.common.transactions import read_only
+
+
+def _operation():
+    def view_func(request):
+        return {"in_atomic_block": connection.in_atomic_block}
+
+    return view_func
+
+
+class ApiTransactionsTestCase(TransactionTestCase):
+    def setUp(self):
+        router = Router()
+        router.get("read", auth=None)(read_only(_operation()))
+        router.post("write", auth=None)(_operation())
+
+        read_only_router = Router(read_only=True)
+        read_only_router.post("write", auth=None)(_operation())
+
+        self.api = NinjaAPI(urls_namespace=f"transactions-{id(self)}")
+        self.api.add_router("/", router)
+        self.api.add_router("/read-only", read_only_router)
+        self.client = TestClient(self.api)
+
+    def test_read_only_operation_runs_in_autocommit(self):
+        """Test operation marked as read-only is not wrapped in transaction"""
+        # Act
+        response = self.client.get("/read")
+
+        # Assert
+        self.assertEqual(response.status_code, 200)
+        self.assertFalse(response.json()["in_atomic_block"])
+
+    def test_write_operation_is_atomic(self):
+        """Test not marked operation keeps ATOMIC_REQUESTS behaviour"""
+        # Act
+        response = self.client.post("/write")
+
+        # Assert
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response.json()["in_atomic_block"])
+
+    def test_read_only_router_operation_runs_in_autocommit(self):
+        """Test read-only router operations are not wrapped in transaction"""
+        # Act
+        response = self.client.post("/read-only/write")
+
+        # Assert
+        self.assertEqual(response.status_code, 200)
+        self.assertFalse(response.json()["in_atomic_block"])
+
+    def test_urls_are_excluded_from_atomic_requests(self):
+        """Test Django does not wrap API views in request transaction"""
+        # Act
+        urls = self.client.urls
+
+        # Assert
+        for url in urls:
+            self.assertEqual(url.callback._non_atomic_requests, {"default"})
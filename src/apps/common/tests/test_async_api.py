@@ -0,0 +1,200 @@
+import threading
+from datetime import timedelta
+
+from django.test import RequestFactory, TestCase
+from django.utils import timezone
+from ninja.testing import TestAsyncClient
+from ninja.throttling import BaseThrottle
+from oauth2_provider.models import AccessToken, Application
+
+from apps.users.models import User
+from services.api.auth import AsyncAuthBearer
+from services.api.common.conditional import conditional
+from services.api.common.fieldsets import sparse_fieldset
+from services.api.common.queries import instrument_operation, query_budget
+from services.api.common.routers import Router
+from services.api.common.throttling import async_throttled_operation
+from services.api.common.transactions import read_only
+from services.api.mobile.users.services.validators import (
+    aauth_user_etag,
+    aauth_user_last_modified,
+)
+from services.api.mobile.users.shemas import UserResponse
+
+
+class ThreadRecordingThrottle(BaseThrottle):
+    def __init__(self, allowed):
+        self.allowed = allowed
+        self.threads = []
+
+    def allow_request(self, request):
+        self.threads.append(threading.get_ident())
+        return self.allowed
+
+    def wait(self):
+        return 30
+
+
+@read_only
+@query_budget(1)
+@conditional(
+    etag_func=aauth_user_etag, last_modified_func=aauth_user_last_modified
+)
+@sparse_fieldset(UserResponse)
+async def aget_me(request) -> UserResponse:
+    user, _ = request.auth
+    return user
+
+
+router = Router()
+router.get("me", response=UserResponse, auth=AsyncAuthBearer())(aget_me)
+throttle = ThreadRecordingThrottle(allowed=True)
+router.get(
+    "throttled/me",
+    response=UserResponse,
+    auth=AsyncAuthBearer(),
+    throttle=throttle,
+)(aget_me)
+for path_view in router.path_operations.values():
+    for operation in path_view.operations:
+        instrument_operation(operation)
+        async_throttled_operation(operation)
+
+
+class AsyncApiTestCase(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(
+            email="test@example.com", first_name="John"
+        )
+        self.application = Application.objects.create(
+            name="Test App",
+            user=self.user,
+            client_type="confidential",
+            authorization_grant_type="password",
+        )
+        self.access_token = AccessToken.objects.create(
+            user=self.user,
+            application=self.application,
+            token="test-token",
+            expires=timezone.now() + timedelta(hours=1),
+            scope="read",
+        )
+        self.client = TestAsyncClient(router)
+
+    async def _authenticate(self, token):
+        request = RequestFactory().get("/")
+        return await AsyncAuthBearer().authenticate(request, token)
+
+    async def test_async_auth(self):
+        """Test valid access token is authenticated by async bearer"""
+        # Act
+        user, access_token = await self._authenticate("test-token")
+
+        # Assert
+        self.assertEqual(user, self.user)
+        self.assertEqual(access_token, self.access_token)
+
+    async def test_async_auth_expired_token(self):
+        """Test expired and unknown access tokens are rejected"""
+        # Arrange
+        self.access_token.expires = timezone.now() - timedelta(seconds=1)
+        await self.access_token.asave()
+
+        # Act & Assert
+        self.assertIsNone(await self._authenticate("test-token"))
+        self.assertIsNone(await self._authenticate("unknown"))
+
+    async def test_async_me(self):
+        """Test async operation returns user with conditional headers"""
+        # Act
+        response = await self.client.get(
+            "/me", headers={"Authorization": "Bearer test-token"}
+        )
+
+        # Assert
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()["email"], self.user.email)
+        self.assertIn("ETag", response.headers)
+
+    async def test_async_me_not_modified(self):
+        """Test async operation supports conditional requests"""
+        # Arrange
+        first = await self.client.get(
+            "/me", headers={"Authorization": "Bearer test-token"}
+        )
+        etag = first["ETag"]
+
+        # Act
+        response = await self.client.get(
+            "/me",
+            headers={"Authorization": "Bearer test-token"},
+            # conditional requests are handled by Django using META
+            META={"HTTP_IF_NONE_MATCH": etag},
+        )
+
+        # Assert
+        self.assertEqual(response.status_code, 304)
+
+    async def test_async_me_sparse_fields(self):
+        """Test async operation supports sparse fieldsets"""
+        # Act
+        response = await self.client.get(
+            "/me?fields=id,firstName",
+            headers={"Authorization": "Bearer test-token"},
+        )
+
+        # Assert
+        self.assertEqual(
+            response.json(), {"id": self.user.pk, "first_name": "John"}
+        )
+
+    async def test_async_me_query_budget(self):
+        """Test async operation collects its queries within the budget"""
+        # Arrange
+        operation = router.path_operations["me"].operations[0]
+        request = RequestFactory().get(
+            "/me", HTTP_AUTHORIZATION="Bearer test-token"
+        )
+
+        # Act
+        response = await operation.run(request)
+
+        # Assert
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(request.operation_query_budget, 1)
+        self.assertLessEqual(
+            request.operation_query_stats.count,
+            request.operation_query_budget,
+        )
+
+    async def test_async_throttle_outside_event_loop(self):
+        """Test throttles of async operation run outside the event loop"""
+        # Arrange
+        throttle.threads.clear()
+
+        # Act
+        response = await self.client.get(
+            "/throttled/me", headers={"Authorization": "Bearer test-token"}
+        )
+
+        # Assert
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(throttle.threads), 1)
+        self.assertNotEqual(throttle.threads[0], threading.get_ident())
+
+    async def test_async_throttled(self):
+        """Test denied async operation returns Retry-After header"""
+        # Arrange
+        throttle.allowed = False
+
+        # Act
+        try:
+            response = await self.client.get(
+                "/throttled/me",
+                headers={"Authorization": "Bearer test-token"},
+            )
+        finally:
+            throttle.allowed = True
+
+        # Assert
+        self.assertEqual(response.status_code, 429)
@@ -0,0 +1,146 @@
+from datetime import timedelta
+from unittest import mock
+
+from django.http import StreamingHttpResponse
+from django.test import TestCase
+from django.utils import timezone
+from oauth2_provider.models import AccessToken, Application
+
+from apps.users.models import User
+
+
+class BatchEndpointTestCase(TestCase):
+    BATCH_URL = "/api/mobile/batch"
+    ME_URL = "/api/mobile/users/me"
+
+    def setUp(self):
+        self.user = User.objects.create_user(
+            email="test@example.com", password="testpass123"
+        )
+        application = Application.objects.create(
+            name="Test App",
+            user=self.user,
+            client_type="confidential",
+            authorization_grant_type="password",
+        )
+        AccessToken.objects.create(
+            user=self.user,
+            application=application,
+            token="test-token",
+            expires=timezone.now() + timedelta(hours=1),
+            scope="read",
+        )
+
+    def _batch(self, payload, token="test-token"):
+        return self.client.post(
+            self.BATCH_URL,
+            data=payload,
+            content_type="application/json",
+            headers={"Authorization": f"Bearer {token}"},
+        )
+
+    def test_batch(self):
+        """Test sub-requests are executed with their own statuses"""
+        # Act
+        response = self._batch(
+            {
+                "requests": [
+                    {"path": self.ME_URL},
+                    {"path": "/api/mobile/unknown"},
+                    {"path": self.BATCH_URL, "method": "POST"},
+                    {"path": "/admin/"},
+                ]
+            }
+        )
+
+        # Assert
+        self.assertEqual(response.status_code, 200)
+        responses = response.json()["responses"]
+        self.assertEqual(
+            [sub_response["status"] for sub_response in responses],
+            [200, 404, 400, 400],
+        )
+        self.assertEqual(responses[0]["body"]["email"], self.user.email)
+        self.assertIn("ETag", responses[0]["headers"])
+
+    def test_batch_passes_sub_request_headers(self):
+        """Test sub-request headers are passed, e.g. for conditional GET"""
+        # Arrange
+        etag = self.client.get(
+            self.ME_URL, headers={"Authorization": "Bearer test-token"}
+        )["ETag"]
+
+        # Act
+        response = self._batch(
+            {
+                "requests": [
+                    {"path": self.ME_URL, "headers": {"If-None-Match": etag}}
+                ]
+            }
+        )
+
+        # Assert
+        sub_response = response.json()["responses"][0]
+        self.assertEqual(sub_response["status"], 304)
+        self.assertIsNone(sub_response["body"])
+
+    def test_batch_isolates_failed_sub_request(self):
+        """Test exception of a sub-request fails the sub-request only"""
+        # Arrange
+        execute = mock.patch(
+            "services.api.mobile.users.endpoints.MeService.execute",
+            side_effect=[RuntimeError("failed"), self.user],
+        )
+
+        # Act
+        with execute, self.assertLogs(
+            "services.api.mobile.batch.services.batch", "ERROR"
+        ):
+            response = self._batch({"requests": [{"path": self.ME_URL}] * 2})
+
+        # Assert
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(
+            [r["status"] for r in response.json()["responses"]], [500, 200]
+        )
+
+    def test_batch_rejects_streaming_response(self):
+        """Test streaming response of a sub-request isn't buffered"""
+        # Arrange
+        streaming = StreamingHttpResponse(iter([b"chunk"]))
+        execute = mock.patch(
+            "services.api.mobile.users.endpoints.MeService.execute",
+            return_value=streaming,
+        )
+
+        # Act
+        with execute:
+            response = self._batch({"requests": [{"path": self.ME_URL}]})
+
+        # Assert
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()["responses"][0]["status"], 400)
+
+    def test_parallel_batch(self):
+        """Test independent GET sub-requests are executed in parallel"""
+        # Act
+        response = self._batch(
+            {"requests": [{"path": self.ME_URL}] * 3, "parallel": True}
+        )
+
+        # Assert
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(
+            [r["status"] for r in response.json()["responses"]],
+            [200, 200, 200],
+        )
+
+    def test_batch_requires_authentication(self):
+        """Test batch request is authenticated"""
+        # Act
+        response = self._batch(
+            {"requests": [{"path": self.ME_URL}]}, token="invalid"
+        )
+
+        # Assert
+        self.assertEqual(response.status_code, 401)
@@ -0,0 +1,160 @@
+from uuid import uuid4
+
+from celery import Celery
+from django.test import SimpleTestCase
+
+from apps.common.redis_client import get_redis
+from services.celery_tasks.batching import (
+    TASKS_KEY,
+    BatchTask,
+    flush_stale_batches,
+)
+
+
+class BatchTaskTestCase(SimpleTestCase):
+    def setUp(self):
+        self.app = Celery(set_as_current=False, broker="memory://")
+        self.app.conf.broker_transport_options = {"visibility_timeout": 60}
+        self.name = f"tests.batch_{uuid4().hex}"
+        self.handled = []
+        self.fail = False
+
+        @self.app.task(
+            base=BatchTask, name=self.name, batch_size=3, flush_interval=5
+        )
+        def handle(calls):
+            if self.fail:
+                raise RuntimeError("Handler failed")
+            self.handled.append(calls)
+            return len(calls)
+
+        self.task = handle
+        self.addCleanup(self._cleanup)
+
+    def _cleanup(self):
+        client = get_redis()
+        client.delete(*client.keys(f"batch:{self.name}*") or ["-"])
+        client.srem(TASKS_KEY, self.name)
+        with self.app.connection_for_write() as connection:
+            connection.default_channel.queue_purge("celery")
+
+    def _flushes(self):
+        with self.app.connection_for_write() as connection:
+            queue = connection.SimpleQueue("celery")
+            messages = []
+            while queue.qsize():
+                message = queue.get(timeout=1)
+                message.ack()
+                messages.append(message)
+            return messages
+
+    def test_calls_are_buffered_till_window_ends(self):
+        """Test single delayed flush is sent for the first calls of window"""
+        # Act
+        self.task.delay(1, "a")
+        self.task.delay(2, "b")
+
+        # Assert
+        flushes = self._flushes()
+        self.assertEqual(len(flushes), 1)
+        self.assertIsNotNone(flushes[0].headers["eta"])
+
+    def test_full_batch_is_flushed_immediately(self):
+        """Test flush is sent without delay once batch size is reached"""
+        # Act
+        for user_id in range(3):
+            self.task.delay(user_id)
+
+        # Assert
+        flushes = self._flushes()
+        self.assertEqual(len(flushes), 2)
+        self.assertIsNone(flushes[1].headers["eta"])
+
+    def test_flush_handles_batch(self):
+        """Test handler receives argument tuples of the batch in one call"""
+        # Arrange
+        for user_id in range(5):
+            self.task.delay(user_id)
+        self._flushes()
+
+        # Act
+        result = self.task.apply()
+
+        # Assert
+        self.assertEqual(result.result, 3)
+        self.assertEqual(self.handled, [[(0,), (1,), (2,)]])
+        self.assertEqual(len(self._flushes()), 1)
+
+    def test_failed_batch_is_handled_again_on_redelivery(self):
+        """Test batch survives failure and its redelivery handles it again"""
+        # Arrange
+        self.task.delay(1)
+        self.task.delay(2)
+        task_id = str(uuid4())
+        self.fail = True
+        self.task.apply(task_id=task_id)
+        self.task.delay(3)
+        self.fail = False
+
+        # Act
+        self.task.apply(task_id=task_id)
+
+        # Assert
+        self.assertEqual(self.handled, [[(1,), (2,)]])
+        self.assertFalse(get_redis().exists(f"batch:{self.name}:{task_id}"))
+
+    def test_direct_call_is_not_buffered(self):
+        """Test calling the task directly handles the given calls"""
+        # Act
+        result = self.task([(1,), (2,)])
+
+        # Assert
+        self.assertEqual(result, 2)
+        self.assertEqual(self._flushes(), [])
+
+    def test_sending_options_are_rejected(self):
+        """Test options which can't be applied to buffered call raise"""
+        # Act & Assert
+        with self.assertRaises(TypeError):
+            self.task.apply_async((1,), countdown=10)
+        self.assertEqual(self._flushes(), [])
+
+    def test_retried_flush_is_sent(self):
+        """Test retry of the flush sends its message again"""
+        # Act
+        self.task.apply_async(task_id=str(uuid4()), retries=1)
+
+        # Assert
+        self.assertEqual(len(self._flushes()), 1)
+        self.assertFalse(get_redis().exists(f"batch:{self.name}"))
+
+    def test_stale_calls_are_flushed(self):
+        """Test calls left without pending flush are flushed periodically"""
+        # Arrange
+        self.task.delay(1)
+        # the flush is lost and its window has passed
+        self._flushes()
+        get_redis().delete(f"batch:{self.name}:window")
+
+        # Act
+        sent = flush_stale_batches(self.app)
+        pending_sent = flush_stale_batches(self.app)
+
+        # Assert
+        self.assertEqual((sent, pending_sent), (1, 0))
+        flushes = self._flushes()
+        self.assertEqual(len(flushes), 1)
+        self.assertEqual(flushes[0].headers["task"], self.name)
+
+    def test_flushed_task_is_forgotten(self):
+        """Test task without buffered calls is not checked anymore"""
+        # Arrange
+        self.task.delay(1)
+        self.task.apply()
+
+        # Act
+        sent = flush_stale_batches(self.app)
+
+        # Assert
+        self.assertEqual(sent, 0)
+        self.assertFalse(get_redis().sismember(TASKS_KEY, self.name))
@@ -0,0 +1,262 @@
+import base64
+import hashlib
+import os
+import shutil
+import tempfile
+import time
+from datetime import timedelta
+from pathlib import Path
+
+from django.core.files.storage import default_storage
+from django.test import TestCase, override_settings
+from django.utils import timezone
+from ninja.errors import HttpError
+from oauth2_provider.models import AccessToken, Application
+
+from apps.common.redis_client import get_redis
+from apps.users.models import User
+from services.api.mobile.uploads.services.uploads import UploadService
+from services.celery_tasks.uploads import cleanup_partial_uploads
+
+UPLOADS_URL = "/api/mobile/uploads"
+CONTENT = os.urandom(2500)
+
+
+def _checksum(data: bytes) -> str:
+    return f"sha256 {base64.b64encode(hashlib.sha256(data).digest()).decode()}"
+
+
+class SlowStream:
+    """Returns the data by small parts, calling `on_read` before each."""
+
+    def __init__(self, data, on_read):
+        self.data = data
+        self.on_read = on_read
+
+    def read(self, size):
+        self.on_read()
+        part, self.data = self.data[:100], self.data[100:]
+        return part
+
+
+@override_settings(
+    FILE_FOLDERS={
+        "avatars": {"path": Path("users/avatars"), "shard_depth": 2}
+    },
+    UPLOAD_CHUNK_SIZE=1000,
+)
+class ChunkedUploadsTestCase(TestCase):
+    def setUp(self):
+        media_root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, media_root)
+        media = override_settings(MEDIA_ROOT=media_root)
+        media.enable()
+        self.addCleanup(media.disable)
+
+        self.user = User.objects.create_user(
+            email="test@example.com", password="testpass123"
+        )
+        application = Application.objects.create(
+            name="Test App",
+            user=self.user,
+            client_type="confidential",
+            authorization_grant_type="password",
+        )
+        AccessToken.objects.create(
+            user=self.user,
+            application=application,
+            token="test-token",
+            expires=timezone.now() + timedelta(hours=1),
+            scope="read",
+        )
+        self.headers = {"Authorization": "Bearer test-token"}
+
+    def _create(self, **payload):
+        return self.client.post(
+            UPLOADS_URL,
+            {
+                "folder": "avatars",
+                "filename": "photo.jpg",
+                "size": len(CONTENT),
+                **payload,
+            },
+            content_type="application/json",
+            headers=self.headers,
+        )
+
+    def _append(self, upload_id, offset, data, checksum=None):
+        return self.client.patch(
+            f"{UPLOADS_URL}/{upload_id}",
+            data,
+            content_type="application/offset+octet-stream",
+            headers={
+                **self.headers,
+                "Upload-Offset": str(offset),
+                "Upload-Checksum": checksum or _checksum(data),
+            },
+        )
+
+    def _upload(self, upload_id, start=0):
+        for offset in range(start, len(CONTENT), 1000):
+            chunk = CONTENT[offset:][:1000]
+            response = self._append(upload_id, offset, chunk)
+            self.assertEqual(response.status_code, 200, response.json())
+        return response
+
+    def test_file_is_uploaded_by_chunks(self):
+        """Test chunks are appended and file is moved to its final path"""
+        # Arrange
+        upload_id = self._create(
+            checksum=hashlib.sha256(CONTENT).hexdigest()
+        ).json()["id"]
+
+        # Act
+        response = self._upload(upload_id)
+
+        # Assert
+        upload = response.json()
+        self.assertTrue(upload["complete"])
+        self.assertEqual(upload["offset"], len(CONTENT))
+        self.assertRegex(
+            upload["path"],
+            r"^users/avatars/[0-9a-f]{2}/[0-9a-f]{2}/[0-9a-f-]{36}\.jpg$",
+        )
+        with default_storage.open(upload["path"]) as file:
+            self.assertEqual(file.read(), CONTENT)
+
+    def test_upload_is_resumed_from_offset(self):
+        """Test interrupted upload reports its offset and is resumed"""
+        # Arrange
+        upload_id = self._create().json()["id"]
+        self._append(upload_id, 0, CONTENT[:1000])
+        self._append(upload_id, 1000, CONTENT[1000:1500], _checksum(b"x"))
+
+        # Act
+        offset = self.client.get(
+            f"{UPLOADS_URL}/{upload_id}", headers=self.headers
+        ).json()["offset"]
+        response = self._upload(upload_id, start=offset)
+
+        # Assert
+        self.assertEqual(offset, 1000)
+        self.assertTrue(response.json()["complete"])
+
+    def test_chunk_with_wrong_checksum_is_rejected(self):
+        """Test corrupted chunk is not appended"""
+        # Arrange
+        upload_id = self._create().json()["id"]
+
+        # Act
+        response = self._append(upload_id, 0, CONTENT[:1000], _checksum(b"x"))
+
+        # Assert
+        self.assertEqual(response.status_code, 400)
+        status = self.client.get(
+            f"{UPLOADS_URL}/{upload_id}", headers=self.headers
+        )
+        self.assertEqual(status.json()["offset"], 0)
+
+    def test_chunk_at_wrong_offset_is_rejected(self):
+        """Test chunk not following the uploaded ones is a conflict"""
+        # Arrange
+        upload_id = self._create().json()["id"]
+
+        # Act
+        response = self._append(upload_id, 1000, CONTENT[1000:2000])
+
+        # Assert
+        self.assertEqual(response.status_code, 409)
+
+    def test_file_checksum_mismatch(self):
+        """Test file not matching its checksum is discarded"""
+        # Arrange
+        upload_id = self._create(checksum="0" * 64).json()["id"]
+
+        self._append(upload_id, 0, CONTENT[:1000])
+        self._append(upload_id, 1000, CONTENT[1000:2000])
+
+        # Act
+        response = self._append(upload_id, 2000, CONTENT[2000:])
+
+        # Assert
+        self.assertEqual(response.status_code, 400)
+
+    @override_settings(UPLOAD_LOCK_TIMEOUT=0.3)
+    def test_lock_is_renewed_while_streaming(self):
+        """Test chunk streamed longer than the lock timeout is appended"""
+        # Arrange
+        upload_id = self._create().json()["id"]
+        chunk = CONTENT[:1000]
+        stream = SlowStream(chunk, lambda: time.sleep(0.05))
+
+        # Act
+        upload = UploadService().append(
+            self.user, upload_id, 0, _checksum(chunk), stream, len(chunk)
+        )
+
+        # Assert
+        self.assertEqual(upload["offset"], 1000)
+
+    def test_chunk_is_not_recorded_once_lock_is_lost(self):
+        """Test chunk is rejected if the lock expired while streaming"""
+        # Arrange
+        upload_id = self._create().json()["id"]
+        chunk = CONTENT[:1000]
+        stream = SlowStream(
+            chunk, lambda: get_redis().delete(f"upload:{upload_id}:lock")
+        )
+
+        # Act
+        with self.assertRaises(HttpError) as context:
+            UploadService().append(
+                self.user, upload_id, 0, _checksum(chunk), stream, len(chunk)
+            )
+
+        # Assert
+        self.assertEqual(context.exception.status_code, 409)
+        self.assertEqual(
+            UploadService().get(self.user, upload_id)["offset"], 0
+        )
+
+    def test_unknown_folder(self):
+        """Test upload to the folder missing in FILE_FOLDERS is rejected"""
+        # Act
+        response = self._create(folder="unknown")
+
+        # Assert
+        self.assertEqual(response.status_code, 400)
+
+    def test_upload_of_another_user_is_not_found(self):
+        """Test users could not append chunks to uploads of others"""
+        # Arrange
+        upload_id = self._create().json()["id"]
+        other = User.objects.create_user(email="other@example.com")
+        AccessToken.objects.create(
+            user=other,
+            token="other-token",
+            expires=timezone.now() + timedelta(hours=1),
+            scope="read",
+        )
+        self.headers = {"Authorization": "Bearer other-token"}
+
+        # Act
+        response = self._append(upload_id, 0, CONTENT[:1000])
+
+        # Assert
+        self.assertEqual(response.status_code, 404)
+
+    def test_partial_files_of_expired_uploads_are_removed(self):
+        """Test partial files idle for longer than UPLOAD_TTL are removed"""
+        # Arrange
+        stale_id = self._create().json()["id"]
+        active_id = self._create().json()["id"]
+        stale_path = default_storage.path(f"uploads/partial/{stale_id}")
+        os.utime(stale_path, (0, 0))
+
+        # Act
+        removed = cleanup_partial_uploads()
+
+        # Assert
+        self.assertEqual(removed, 1)
+        self.assertFalse(os.path.exists(stale_path))
+        self.assertTrue(default_storage.exists(f"uploads/partial/{active_id}"))
@@ -0,0 +1,126 @@
+import gzip
+import zlib
+
+import brotli
+from asgiref.sync import iscoroutinefunction
+from django.http import HttpResponse, StreamingHttpResponse
+from django.test import RequestFactory, SimpleTestCase, override_settings
+
+from apps.common.compression import select_encoding
+from apps.common.middleware import CompressionMiddleware
+
+CONTENT = b'{"id": 1, "email": "user@example.com"}, ' * 100
+
+
+@override_settings(COMPRESSION_MIN_SIZE=200)
+class CompressionMiddlewareTestCase(SimpleTestCase):
+    def _get(self, response, accept_encoding="gzip, deflate, br"):
+        request = RequestFactory().get(
+            "/", headers={"Accept-Encoding": accept_encoding}
+        )
+        return CompressionMiddleware(lambda request: response)(request)
+
+    def test_select_encoding(self):
+        """Test brotli is preferred and rejected encodings are skipped"""
+        # Act & Assert
+        self.assertEqual(select_encoding("gzip, br"), "br")
+        self.assertEqual(select_encoding("gzip;q=0.5, br;q=0"), "gzip")
+        self.assertEqual(select_encoding("*"), "br")
+        self.assertIsNone(select_encoding("identity"))
+
+    def test_select_encoding_by_quality(self):
+        """Test encoding of the highest quality is selected"""
+        # Act & Assert
+        self.assertEqual(select_encoding("br;q=0.5, gzip;q=0.8"), "gzip")
+        self.assertEqual(select_encoding("br;q=0.5, *;q=0.8"), "gzip")
+        self.assertEqual(select_encoding("gzip;q=0.5, br;q=0.5"), "br")
+        self.assertEqual(select_encoding("gzip; Q=0.1, br;q=x"), "gzip")
+
+    def test_select_encoding_wildcard(self):
+        """Test wildcard doesn't override explicitly rejected encodings"""
+        # Act & Assert
+        self.assertEqual(select_encoding("br;q=0, *"), "gzip")
+        self.assertIsNone(select_encoding("br;q=0, gzip;q=0, *"))
+        self.assertIsNone(select_encoding("*;q=0"))
+
+    def test_brotli(self):
+        """Test response is compressed with brotli"""
+        # Arrange
+        response = HttpResponse(CONTENT, content_type="application/json")
+        response["ETag"] = '"1-1"'
+
+        # Act
+        response = self._get(response)
+
+        # Assert
+        self.assertEqual(response["Content-Encoding"], "br")
+        self.assertEqual(brotli.decompress(response.content), CONTENT)
+        self.assertEqual(response["Vary"], "Accept-Encoding")
+        self.assertEqual(response["ETag"], 'W/"1-1"')
+
+    def test_gzip(self):
+        """Test response is compressed with gzip"""
+        # Act
+        response = self._get(HttpResponse(CONTENT), accept_encoding="gzip")
+
+        # Assert
+        self.assertEqual(response["Content-Encoding"], "gzip")
+        self.assertEqual(gzip.decompress(response.content), CONTENT)
+        self.assertEqual(
+            response["Content-Length"], str(len(response.content))
+        )
+
+    def test_short_response(self):
+        """Test responses below the threshold are not compressed"""
+        # Act
+        response = self._get(HttpResponse(b"short"))
+
+        # Assert
+        self.assertFalse(response.has_header("Content-Encoding"))
+        self.assertEqual(response.content, b"short")
+
+    def test_compressed_content_type(self):
+        """Test already compressed content types are not compressed"""
+        # Act
+        response = self._get(HttpResponse(CONTENT, content_type="image/png"))
+
+        # Assert
+        self.assertFalse(response.has_header("Content-Encoding"))
+
+    def test_streaming_response(self):
+        """Test streaming response is compressed incrementally"""
+        # Arrange
+        chunks = (CONTENT for _ in range(100))
+
+        # Act
+        response = self._get(
+            StreamingHttpResponse(chunks), accept_encoding="gzip"
+        )
+
+        # Assert
+        self.assertEqual(response["Content-Encoding"], "gzip")
+        decompressor = zlib.decompressobj(16 + zlib.MAX_WBITS)
+        content = b"".join(
+            decompressor.decompress(chunk)
+            for chunk in response.streaming_content
+        )
+        self.assertEqual(content, CONTENT * 100)
+
+    async def test_async_request(self):
+        """Test response of async view is compressed without thread switch"""
+
+        # Arrange
+        async def get_response(request):
+            return HttpResponse(CONTENT)
+
+        middleware = CompressionMiddleware(get_response)
+        request = RequestFactory().get(
+            "/", headers={"Accept-Encoding": "gzip"}
+        )
+
+        # Act
+        response = await middleware(request)
+
+        # Assert
+        self.assertTrue(iscoroutinefunction(middleware))
+        self.assertEqual(gzip.decompress(response.content), CONTENT)
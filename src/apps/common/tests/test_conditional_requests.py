@@ -0,0 +1,125 @@
+import time
+from datetime import timedelta
+
+from django.core.cache import cache
+from django.test import TestCase
+from django.utils import timezone
+from oauth2_provider.models import AccessToken, Application
+
+from apps.users.models import User
+from apps.users.services.versions import (
+    USER_VERSION_CACHE_KEY,
+    get_user_version,
+)
+
+
+class ConditionalRequestsTestCase(TestCase):
+    ME_URL = "/api/mobile/users/me"
+
+    def setUp(self):
+        self.user = User.objects.create_user(
+            email="test@example.com", password="testpass123"
+        )
+        application = Application.objects.create(
+            name="Test App",
+            user=self.user,
+            client_type="confidential",
+            authorization_grant_type="password",
+        )
+        AccessToken.objects.create(
+            user=self.user,
+            application=application,
+            token="test-token",
+            expires=timezone.now() + timedelta(hours=1),
+            scope="read",
+        )
+
+    def _get_me(self, **headers):
+        return self.client.get(
+            self.ME_URL,
+            headers={"Authorization": "Bearer test-token", **headers},
+        )
+
+    def _set_version_age(self, seconds):
+        cache.set(
+            USER_VERSION_CACHE_KEY.format(user_id=self.user.pk),
+            time.time_ns() - seconds * 10**9,
+        )
+
+    def test_validators_are_returned(self):
+        """Test ETag and Last-Modified headers are returned"""
+        # Arrange
+        self._set_version_age(5)
+
+        # Act
+        response = self._get_me()
+
+        # Assert
+        self.assertEqual(response.status_code, 200)
+        version = get_user_version(self.user.pk)
+        self.assertEqual(response["ETag"], f'"{self.user.pk}-{version}"')
+        self.assertIn("Last-Modified", response.headers)
+
+    def test_not_modified(self):
+        """Test 304 is returned without body for actual ETag"""
+        # Arrange
+        etag = self._get_me()["ETag"]
+
+        # Act
+        response = self._get_me(**{"If-None-Match": etag})
+
+        # Assert
+        self.assertEqual(response.status_code, 304)
+        self.assertEqual(response.content, b"")
+        self.assertEqual(response["ETag"], etag)
+
+    def test_modified_after_user_change(self):
+        """Test data is returned again once the user is changed"""
+        # Arrange
+        etag = self._get_me()["ETag"]
+        self.user.first_name = "John"
+        with self.captureOnCommitCallbacks(execute=True):
+            self.user.save()
+
+        # Act
+        response = self._get_me(**{"If-None-Match": etag})
+
+        # Assert
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()["first_name"], "John")
+        self.assertNotEqual(response["ETag"], etag)
+
+    def test_no_last_modified_within_second(self):
+        """Test Last-Modified is missing for the version of current second"""
+        # Arrange
+        self._set_version_age(5)
+        last_modified = self._get_me()["Last-Modified"]
+        self.user.first_name = "John"
+        with self.captureOnCommitCallbacks(execute=True):
+            self.user.save()
+
+        # Act
+        response = self._get_me(**{"If-Modified-Since": last_modified})
+
+        # Assert
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()["first_name"], "John")
+        self.assertNotIn("Last-Modified", response.headers)
+        self.assertIn("ETag", response.headers)
+
+    def test_version_is_bumped_on_commit(self):
+        """Test the version changes once the user changes are committed"""
+        # Arrange
+        version = get_user_version(self.user.pk)
+        self.user.first_name = "John"
+
+        # Act
+        with self.captureOnCommitCallbacks(execute=False) as callbacks:
+            self.user.save()
+        uncommitted = get_user_version(self.user.pk)
+        for callback in callbacks:
+            callback()
+
+        # Assert
+        self.assertEqual(uncommitted, version)
+        self.assertNotEqual(get_user_version(self.user.pk), version)
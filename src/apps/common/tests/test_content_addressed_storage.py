@@ -0,0 +1,182 @@
+import hashlib
+import os
+import shutil
+import tempfile
+
+from django.core.files.base import ContentFile
+from django.db import connection, models, transaction
+from django.test import TestCase
+from django.test.utils import isolate_apps
+
+from apps.common.models import ContentBlob
+from apps.common.redis_client import get_redis
+from apps.common.services.file_uploadings import (
+    content_addressed_upload_handler,
+)
+from apps.common.signals import release_deleted_blobs, release_replaced_blobs
+from apps.common.storages import WRITTEN_KEY, ContentAddressedStorage
+
+CONTENT = b"avatar content"
+DIGEST = hashlib.sha256(CONTENT).hexdigest()
+
+
+class ContentAddressedStorageTestCase(TestCase):
+    def setUp(self):
+        location = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, location)
+        self.storage = ContentAddressedStorage(location=location)
+        # saves of the test cases are never committed
+        get_redis().delete(WRITTEN_KEY)
+        self.addCleanup(get_redis().delete, WRITTEN_KEY)
+
+    def _document_model(self):
+        with isolate_apps("apps.common"):
+
+            class Document(models.Model):
+                file = models.FileField(
+                    upload_to=content_addressed_upload_handler("documents"),
+                    storage=self.storage,
+                    null=True,
+                )
+
+        with connection.schema_editor() as schema_editor:
+            schema_editor.create_model(Document)
+        return Document
+
+    def test_file_is_named_by_content(self):
+        """Test upload_to variant and storage name the file by its hash"""
+        # Arrange
+        with isolate_apps("apps.common"):
+
+            class Document(models.Model):
+                file = models.FileField(
+                    upload_to=content_addressed_upload_handler("documents"),
+                    storage=self.storage,
+                )
+
+        document = Document()
+
+        # Act
+        document.file.save("Report.PDF", ContentFile(CONTENT), save=False)
+
+        # Assert
+        self.assertEqual(
+            document.file.name, f"documents/{DIGEST[:2]}/{DIGEST}.pdf"
+        )
+        with self.storage.open(document.file.name) as file:
+            self.assertEqual(file.read(), CONTENT)
+
+    def test_same_content_is_stored_once(self):
+        """Test second save of the same content adds a reference only"""
+        # Act
+        first = self.storage.save("avatars/a.png", ContentFile(CONTENT))
+        second = self.storage.save("avatars/b.png", ContentFile(CONTENT))
+
+        # Assert
+        self.assertEqual(first, second)
+        self.assertEqual(
+            os.listdir(self.storage.path(os.path.dirname(first))),
+            [f"{DIGEST}.png"],
+        )
+        self.assertEqual(ContentBlob.objects.get(name=first).references, 2)
+
+    def test_referenced_files_are_not_collected(self):
+        """Test only files without references are removed by collection"""
+        # Arrange
+        name = self.storage.save("avatars/a.png", ContentFile(CONTENT))
+        self.storage.save("avatars/b.png", ContentFile(CONTENT))
+
+        # Act
+        self.storage.delete(name)
+        first_removed = self.storage.collect_garbage()
+        self.storage.delete(name)
+        second_removed = self.storage.collect_garbage()
+
+        # Assert
+        self.assertEqual((first_removed, second_removed), (0, 1))
+        self.assertFalse(self.storage.exists(name))
+        self.assertFalse(ContentBlob.objects.filter(name=name).exists())
+
+    def test_rolled_back_file_is_collected(self):
+        """Test file written by the rolled back save is collected"""
+        # Arrange
+        with transaction.atomic():
+            name = self.storage.save("avatars/a.png", ContentFile(CONTENT))
+            transaction.set_rollback(True)
+
+        # Act
+        removed = self.storage.collect_garbage()
+
+        # Assert
+        self.assertEqual(removed, 1)
+        self.assertFalse(self.storage.exists(name))
+
+    def test_committed_file_is_not_collected(self):
+        """Test file of the committed save is not listed as written"""
+        # Arrange
+        with self.captureOnCommitCallbacks(execute=True):
+            name = self.storage.save("avatars/a.png", ContentFile(CONTENT))
+
+        # Act
+        removed = self.storage.collect_garbage()
+
+        # Assert
+        self.assertEqual(removed, 0)
+        self.assertFalse(get_redis().sismember(WRITTEN_KEY, name))
+
+    def test_cleared_field_releases_file(self):
+        """Test clearing the field removes the reference of its file"""
+        # Arrange
+        Document = self._document_model()
+        document = Document()
+        document.file.save("a.txt", ContentFile(CONTENT))
+
+        # Act
+        document.file = None
+        with self.captureOnCommitCallbacks(execute=True):
+            release_replaced_blobs(Document, document)
+
+        # Assert
+        self.assertEqual(ContentBlob.objects.get().references, 0)
+
+    def test_assigned_name_moves_reference(self):
+        """Test assigning the stored file by name moves the reference"""
+        # Arrange
+        Document = self._document_model()
+        document = Document()
+        document.file.save("a.txt", ContentFile(CONTENT))
+        other = self.storage.save("documents/b.txt", ContentFile(b"other"))
+
+        # Act
+        previous = document.file.name
+        document.file = other
+        with self.captureOnCommitCallbacks(execute=True):
+            release_replaced_blobs(Document, document)
+
+        # Assert
+        self.assertEqual(ContentBlob.objects.get(name=previous).references, 0)
+        self.assertEqual(ContentBlob.objects.get(name=other).references, 2)
+
+    def test_deleted_instance_releases_file_on_commit(self):
+        """Test deleting the instance removes its file reference on commit"""
+        # Arrange
+        with isolate_apps("apps.common"):
+
+            class Document(models.Model):
+                file = models.FileField(
+                    upload_to=content_addressed_upload_handler("documents"),
+                    storage=self.storage,
+                )
+
+        document = Document()
+        document.file.save("a.txt", ContentFile(CONTENT), save=False)
+
+        # Act
+        with self.captureOnCommitCallbacks(execute=True) as callbacks:
+            release_deleted_blobs(Document, document)
+            references_before_commit = ContentBlob.objects.get().references
+
+        # Assert
+        self.assertEqual(len(callbacks), 1)
+        self.assertEqual(references_before_commit, 1)
+        self.assertEqual(ContentBlob.objects.get().references, 0)
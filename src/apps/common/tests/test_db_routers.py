@@ -0,0 +1,119 @@
+from django.db import DEFAULT_DB_ALIAS, connections
+from django.test import SimpleTestCase, override_settings
+
+from apps.common.db_routers import (
+    ReplicaRouter,
+    reset_replica_routing,
+    use_primary_database,
+)
+from apps.users.models import User
+
+
+@override_settings(DATABASE_REPLICAS=["replica_1"])
+class ReplicaRouterTestCase(SimpleTestCase):
+    def setUp(self):
+        reset_replica_routing()
+        self.router = ReplicaRouter()
+
+    def tearDown(self):
+        reset_replica_routing()
+
+    def test_read_goes_to_replica(self):
+        """Test reads are routed to the replica by default"""
+        # Act
+        db = self.router.db_for_read(User)
+
+        # Assert
+        self.assertEqual(db, "replica_1")
+
+    @override_settings(DATABASE_REPLICAS=[])
+    def test_read_goes_to_primary_without_replicas(self):
+        """Test reads are routed to the primary if no replicas configured"""
+        # Act
+        db = self.router.db_for_read(User)
+
+        # Assert
+        self.assertEqual(db, DEFAULT_DB_ALIAS)
+
+    def test_write_goes_to_primary(self):
+        """Test writes are routed to the primary"""
+        # Act
+        db = self.router.db_for_write(User)
+
+        # Assert
+        self.assertEqual(db, DEFAULT_DB_ALIAS)
+
+    def test_read_after_write_goes_to_primary(self):
+        """Test reads following a write are routed to the primary"""
+        # Arrange
+        self.router.db_for_write(User)
+
+        # Act
+        db = self.router.db_for_read(User)
+
+        # Assert
+        self.assertEqual(db, DEFAULT_DB_ALIAS)
+
+    def test_reset_routes_reads_to_replica_again(self):
+        """Test a new request reads from the replica after previous write"""
+        # Arrange
+        self.router.db_for_write(User)
+
+        # Act
+        reset_replica_routing()
+        db = self.router.db_for_read(User)
+
+        # Assert
+        self.assertEqual(db, "replica_1")
+
+    def test_use_primary_database(self):
+        """Test reads are routed to the primary within override block"""
+        # Act
+        with use_primary_database():
+            db = self.router.db_for_read(User)
+        db_after = self.router.db_for_read(User)
+
+        # Assert
+        self.assertEqual(db, DEFAULT_DB_ALIAS)
+        self.assertEqual(db_after, "replica_1")
+
+    def test_nested_use_primary_database_decorator(self):
+        """Test nested calls of the same decorator restore the routing"""
+        # Arrange
+        databases = []
+
+        @use_primary_database()
+        def read(nested):
+            if nested:
+                read(nested=False)
+            databases.append(self.router.db_for_read(User))
+
+        # Act
+        read(nested=True)
+        databases.append(self.router.db_for_read(User))
+
+        # Assert
+        self.assertEqual(
+            databases, [DEFAULT_DB_ALIAS, DEFAULT_DB_ALIAS, "replica_1"]
+        )
+
+    def test_read_within_transaction_goes_to_primary(self):
+        """Test reads within primary database transaction use the primary"""
+        # Arrange
+        connection = connections[DEFAULT_DB_ALIAS]
+        connection.in_atomic_block = True
+
+        # Act
+        try:
+            db = self.router.db_for_read(User)
+        finally:
+            connection.in_atomic_block = False
+
+        # Assert
+        self.assertEqual(db, DEFAULT_DB_ALIAS)
+
+    def test_migrations_are_not_applied_to_replicas(self):
+        """Test replicas are excluded from migrations"""
+        # Act & Assert
+        self.assertFalse(self.router.allow_migrate("replica_1", "users"))
+        self.assertIsNone(self.router.allow_migrate(DEFAULT_DB_ALIAS, "users"))
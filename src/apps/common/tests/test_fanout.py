@@ -0,0 +1,89 @@
+from django.test import TestCase
+
+from apps.common.pk_ranges import iterate_range, split_pk_ranges
+from apps.common.redis_client import get_redis
+from apps.users.models import User
+from django_project.celery import app
+from services.celery_tasks.fanout import fan_out, get_progress
+
+processed = []
+failing_ranges = set()
+
+
+@app.task(name="tests.fanout_chunk")
+def process_chunk(lower, upper):
+    if (lower, upper) in failing_ranges:
+        raise RuntimeError("Chunk failed")
+    processed.extend(
+        user.pk for user in iterate_range(User.objects.all(), lower, upper)
+    )
+
+
+class FanOutTestCase(TestCase):
+    def setUp(self):
+        self.users = [
+            User.objects.create_user(email=f"user{number}@example.com")
+            for number in range(10)
+        ]
+        self.pks = [user.pk for user in self.users]
+        processed.clear()
+        failing_ranges.clear()
+
+        eager = app.conf.task_always_eager
+        app.conf.task_always_eager = True
+        self.addCleanup(setattr, app.conf, "task_always_eager", eager)
+
+    def _cleanup_job(self, job_id):
+        client = get_redis()
+        self.addCleanup(
+            client.delete,
+            f"fanout:{job_id}",
+            f"fanout:{job_id}:pending",
+            f"fanout:{job_id}:done",
+        )
+
+    def test_split_pk_ranges(self):
+        """Test ranges hold chunk size rows and cover the whole queryset"""
+        # Act
+        ranges = split_pk_ranges(User.objects.all(), 4)
+
+        # Assert
+        self.assertEqual(
+            ranges,
+            [
+                (None, self.pks[3]),
+                (self.pks[3], self.pks[7]),
+                (self.pks[7], None),
+            ],
+        )
+
+    def test_fan_out_processes_all_rows_once(self):
+        """Test every row is processed by chunks with bounded concurrency"""
+        # Act
+        job_id = fan_out(
+            process_chunk, User.objects.all(), chunk_size=3, concurrency=2
+        )
+        self._cleanup_job(job_id)
+
+        # Assert
+        self.assertEqual(sorted(processed), self.pks)
+        self.assertEqual(get_progress(job_id), (4, 4))
+
+    def test_fan_out_resumes_unfinished_chunks(self):
+        """Test resumed job processes the chunks left after failure only"""
+        # Arrange
+        failing_ranges.add((self.pks[2], self.pks[5]))
+        job_id = fan_out(
+            process_chunk, User.objects.all(), chunk_size=3, concurrency=1
+        )
+        self._cleanup_job(job_id)
+        self.assertEqual(get_progress(job_id), (1, 4))
+        failing_ranges.clear()
+        processed.clear()
+
+        # Act
+        fan_out(process_chunk, User.objects.all(), job_id=job_id)
+
+        # Assert
+        self.assertEqual(sorted(processed), self.pks[3:])
+        self.assertEqual(get_progress(job_id), (4, 4))
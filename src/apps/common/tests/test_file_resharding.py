@@ -0,0 +1,193 @@
+import io
+import os
+import shutil
+import tempfile
+from pathlib import Path
+from unittest.mock import patch
+
+from django.core.files.base import ContentFile
+from django.core.files.storage import FileSystemStorage
+from django.core.management import call_command
+from django.db import connection, models
+from django.test import (
+    SimpleTestCase,
+    TestCase,
+    TransactionTestCase,
+    override_settings,
+)
+from django.test.utils import isolate_apps
+
+from apps.common.management.commands.reshard_files import Command
+from apps.common.pk_ranges import split_pk_ranges
+from apps.common.services.file_uploadings import (
+    folder_upload_handler,
+    sharded_path,
+)
+
+
+class ShardedPathTestCase(SimpleTestCase):
+    def test_sharded_path(self):
+        """Test file is put into directories named by hash of its name"""
+        # Act
+        path = sharded_path("users/avatars", "photo.jpg", 2)
+
+        # Assert
+        self.assertRegex(path, r"^users/avatars/[0-9a-f]{2}/[0-9a-f]{2}/")
+        self.assertTrue(path.endswith("/photo.jpg"))
+        self.assertEqual(path, sharded_path("users/avatars", "photo.jpg", 2))
+
+    @override_settings(
+        FILE_FOLDERS={"avatars": {"path": Path("users/avatars")}}
+    )
+    def test_folder_without_sharding(self):
+        """Test files of the folder without shard_depth are kept flat"""
+        # Act
+        path = folder_upload_handler("avatars")(None, "photo.jpg")
+
+        # Assert
+        self.assertRegex(path, r"^users/avatars/[0-9a-f-]{36}\.jpg$")
+
+
+@override_settings(FILE_FOLDERS={"documents": {"path": Path("documents")}})
+class ReshardFilesTestCase(TestCase):
+    def setUp(self):
+        location = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, location)
+        self.storage = FileSystemStorage(location=location)
+
+        with isolate_apps("apps.common"):
+
+            class Document(models.Model):
+                file = models.FileField(
+                    upload_to=folder_upload_handler("documents"),
+                    storage=self.storage,
+                )
+
+        self.model = Document
+        with connection.schema_editor() as editor:
+            editor.create_model(Document)
+
+    def _create_flat_documents(self, number):
+        return [
+            self.model.objects.create(
+                file=self.storage.save(
+                    f"documents/{index}.txt", ContentFile(b"x")
+                )
+            )
+            for index in range(number)
+        ]
+
+    def test_files_are_moved_to_shards(self):
+        """Test files are moved to shards and rows reference new paths"""
+        # Arrange
+        documents = self._create_flat_documents(3)
+        command = Command()
+        command.base_path, command.shard_depth = "documents", 2
+
+        # Act
+        moved = command._reshard_range(
+            self.model, [self.model._meta.get_field("file")], (None, None)
+        )
+
+        # Assert
+        self.assertEqual(moved, 3)
+        for document in documents:
+            old_name = document.file.name
+            document.refresh_from_db()
+            self.assertEqual(
+                document.file.name,
+                sharded_path("documents", os.path.basename(old_name), 2),
+            )
+            self.assertTrue(self.storage.exists(document.file.name))
+            self.assertFalse(self.storage.exists(old_name))
+
+    def test_resharding_is_idempotent(self):
+        """Test files already in their shards are not moved again"""
+        # Arrange
+        self._create_flat_documents(2)
+        command = Command()
+        command.base_path, command.shard_depth = "documents", 1
+        field = self.model._meta.get_field("file")
+        command._reshard_range(self.model, [field], (None, None))
+
+        # Act
+        moved = command._reshard_range(self.model, [field], (None, None))
+
+        # Assert
+        self.assertEqual(moved, 0)
+
+
+@override_settings(
+    FILE_FOLDERS={"documents": {"path": Path("documents"), "shard_depth": 1}}
+)
+class ReshardFilesCommandTestCase(TransactionTestCase):
+    def setUp(self):
+        location = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, location)
+        self.storage = FileSystemStorage(location=location)
+
+        with isolate_apps("apps.common") as isolated_apps:
+
+            class Document(models.Model):
+                file = models.FileField(
+                    upload_to=folder_upload_handler("documents"),
+                    storage=self.storage,
+                )
+                # not stored in the folder, so it's not resharded
+                attachment = models.FileField(storage=self.storage)
+
+        self.model = Document
+        with connection.schema_editor() as editor:
+            editor.create_model(Document)
+        self.addCleanup(self._delete_model)
+
+        # the command looks up the models of the folder in the registry
+        registry = patch(
+            "apps.common.management.commands.reshard_files.apps",
+            isolated_apps,
+        )
+        registry.start()
+        self.addCleanup(registry.stop)
+
+    def _delete_model(self):
+        with connection.schema_editor() as editor:
+            editor.delete_model(self.model)
+
+    def test_files_are_resharded_by_workers(self):
+        """Test the command reshards the ranges of the folder in threads"""
+        # Arrange
+        documents = [
+            self.model.objects.create(
+                file=self.storage.save(
+                    f"documents/{index}.txt", ContentFile(b"x")
+                ),
+                attachment=self.storage.save(
+                    f"documents/{index}.bin", ContentFile(b"x")
+                ),
+            )
+            for index in range(5)
+        ]
+        stdout = io.StringIO()
+
+        # Act
+        call_command(
+            "reshard_files",
+            "documents",
+            "--workers=3",
+            "--chunk-size=2",
+            stdout=stdout,
+        )
+
+        # Assert
+        self.assertEqual(len(split_pk_ranges(self.model.objects.all(), 2)), 3)
+        self.assertIn("Moved 5 files", stdout.getvalue())
+        for document in documents:
+            old_name = document.file.name
+            document.refresh_from_db()
+            self.assertEqual(
+                document.file.name,
+                sharded_path("documents", os.path.basename(old_name), 1),
+            )
+            self.assertTrue(self.storage.exists(document.file.name))
+            self.assertTrue(self.storage.exists(document.attachment.name))
+            self.assertEqual(document.attachment.name, f"{old_name[:-4]}.bin")
@@ -0,0 +1,122 @@
+import base64
+from datetime import timedelta
+
+from django.test import RequestFactory, TestCase, override_settings
+from django.urls import reverse
+from django.utils import timezone
+from oauth2_provider.models import AccessToken, Application
+
+from apps.common.idempotency import REPLAYED_HEADER, _get_keys
+from apps.common.redis_client import get_redis
+from apps.users.models import User
+
+BATCH_URL = "/api/mobile/batch"
+
+
+class IdempotencyTestCase(TestCase):
+    def setUp(self):
+        keys = get_redis().keys("idempotency:*")
+        if keys:
+            get_redis().delete(*keys)
+        self.user = User.objects.create_user(
+            email="test@example.com", password="testpass123"
+        )
+        self.application = Application.objects.create(
+            name="Test App",
+            user=self.user,
+            client_type="confidential",
+            authorization_grant_type="password",
+            client_secret="",
+        )
+        credentials = base64.b64encode(
+            f"{self.application.client_id}:".encode()
+        ).decode()
+        self.auth_header = f"Basic {credentials}"
+        AccessToken.objects.create(
+            user=self.user,
+            application=self.application,
+            token="test-token",
+            expires=timezone.now() + timedelta(hours=1),
+            scope="read",
+        )
+
+    def _batch(self, key, path="/api/mobile/users/me"):
+        return self.client.post(
+            BATCH_URL,
+            data={"requests": [{"path": path}]},
+            content_type="application/json",
+            headers={
+                "Authorization": "Bearer test-token",
+                "Idempotency-Key": key,
+            },
+        )
+
+    def test_token_endpoint_is_not_idempotent(self):
+        """Test token responses are never stored along with the tokens"""
+        # Arrange
+        data = {
+            "grant_type": "password",
+            "username": "test@example.com",
+            "password": "testpass123",
+            "scope": "read",
+        }
+        headers = {"Authorization": self.auth_header, "Idempotency-Key": "key"}
+
+        # Act
+        responses = [
+            self.client.post(reverse("token"), data, headers=headers)
+            for _ in range(2)
+        ]
+
+        # Assert
+        self.assertEqual(responses[1].status_code, 200)
+        self.assertNotIn(REPLAYED_HEADER, responses[1])
+        self.assertEqual(get_redis().keys("idempotency:*"), [])
+
+    def test_key_reused_for_another_request(self):
+        """Test 422 is returned if the key is reused with another body"""
+        # Arrange
+        self._batch("key-1")
+
+        # Act
+        response = self._batch("key-1", path="/api/mobile/users/other")
+
+        # Assert
+        self.assertEqual(response.status_code, 422)
+
+    def test_requests_without_key_are_not_stored(self):
+        """Test requests without the key are executed every time"""
+        # Act
+        self._batch("")
+        response = self._batch("")
+
+        # Assert
+        self.assertEqual(response.status_code, 200)
+        self.assertNotIn(REPLAYED_HEADER, response)
+
+    @override_settings(IDEMPOTENCY_WAIT_TIMEOUT=0.1)
+    def test_concurrent_duplicate_waits(self):
+        """Test duplicate of in-flight request gets 409 after waiting"""
+        # Arrange
+        request = RequestFactory().post(
+            BATCH_URL, headers={"Authorization": "Bearer test-token"}
+        )
+        _, lock_key = _get_keys(request, "key-1")
+        get_redis().set(lock_key, "other", ex=10)
+
+        # Act
+        response = self._batch("key-1")
+
+        # Assert
+        self.assertEqual(response.status_code, 409)
+
+    def test_api_post_operation(self):
+        """Test POST operation response is replayed"""
+        # Act
+        responses = [self._batch("key-1") for _ in range(2)]
+
+        # Assert
+        self.assertEqual(responses[1].status_code, 200)
+        self.assertEqual(responses[1].content, responses[0].content)
+        self.assertNotIn(REPLAYED_HEADER, responses[0])
+        self.assertEqual(responses[1][REPLAYED_HEADER], "true")
@@ -0,0 +1,290 @@
+import io
+import shutil
+import tempfile
+from datetime import timedelta
+from pathlib import Path
+from unittest.mock import patch
+
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from django.test import SimpleTestCase, TestCase, override_settings
+from django.utils import timezone
+from oauth2_provider.models import AccessToken, Application
+from PIL import Image
+
+from apps.common.redis_client import get_redis
+from apps.common.services.image_derivatives import (
+    choose_variant,
+    cleanup_variants,
+    get_variants,
+    render_variants,
+)
+from apps.users.models import User
+
+VARIANTS = {
+    "small": {"width": 100, "format": "webp", "quality": 75},
+    "small_jpeg": {"width": 100, "format": "jpeg", "quality": 75},
+    "large": {"width": 400, "format": "webp", "quality": 80},
+}
+
+
+def _image(width=800, height=400) -> bytes:
+    output = io.BytesIO()
+    Image.new("RGBA", (width, height), (255, 0, 0, 128)).save(output, "PNG")
+    return output.getvalue()
+
+
+@override_settings(
+    FILE_FOLDERS={"avatars": {"path": Path("users/avatars")}},
+    IMAGE_VARIANTS=VARIANTS,
+    IMAGE_PROCESSES=1,
+)
+class ImageDerivativesTestCase(TestCase):
+    def setUp(self):
+        media_root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, media_root)
+        media = override_settings(MEDIA_ROOT=media_root)
+        media.enable()
+        self.addCleanup(media.disable)
+
+        self.name = default_storage.save(
+            "users/avatars/photo.png", ContentFile(_image())
+        )
+        client = get_redis()
+        self.addCleanup(
+            lambda: client.delete(
+                f"image:{self.name}",
+                *client.keys("image_variants:*"),
+            )
+        )
+
+        user = User.objects.create_user(email="test@example.com")
+        AccessToken.objects.create(
+            user=user,
+            application=Application.objects.create(
+                name="Test App",
+                user=user,
+                client_type="confidential",
+                authorization_grant_type="password",
+            ),
+            token="test-token",
+            expires=timezone.now() + timedelta(hours=1),
+            scope="read",
+        )
+        self.headers = {"Authorization": "Bearer test-token"}
+
+    def _get_variant(self, accept, **params):
+        return self.client.get(
+            "/api/mobile/images/variant",
+            {"path": self.name, **params},
+            headers={**self.headers, "Accept": accept},
+        )
+
+    def test_variants_are_rendered(self):
+        """Test variants are resized, converted and stored"""
+        # Act
+        variants = render_variants(self.name)
+
+        # Assert
+        self.assertEqual(
+            {
+                variant: (info["width"], info["height"], info["format"])
+                for variant, info in variants.items()
+            },
+            {
+                "small": (100, 50, "webp"),
+                "small_jpeg": (100, 50, "jpeg"),
+                "large": (400, 200, "webp"),
+            },
+        )
+        with default_storage.open(variants["small_jpeg"]["path"]) as file:
+            self.assertEqual(Image.open(file).format, "JPEG")
+
+    def test_cached_variants_are_not_rendered_again(self):
+        """Test the same image content reuses the rendered variants"""
+        # Arrange
+        render_variants(self.name)
+        copy = default_storage.save(
+            "users/avatars/copy.png", ContentFile(_image())
+        )
+        self.addCleanup(get_redis().delete, f"image:{copy}")
+
+        # Act
+        with patch(
+            "apps.common.services.image_derivatives.get_pool"
+        ) as get_pool:
+            variants = render_variants(copy)
+
+        # Assert
+        get_pool.assert_not_called()
+        self.assertEqual(variants, render_variants(self.name))
+
+    def test_cache_keys_expire(self):
+        """Test cached image hash and variants expire"""
+        # Act
+        render_variants(self.name)
+
+        # Assert
+        client = get_redis()
+        digest = client.get(f"image:{self.name}").decode()
+        self.assertGreater(client.ttl(f"image:{self.name}"), 0)
+        self.assertGreater(client.ttl(f"image_variants:{digest}"), 0)
+
+    def test_not_image_is_skipped(self):
+        """Test file which is not an image is skipped and not rendered again"""
+        # Arrange
+        name = default_storage.save(
+            "users/avatars/notes.png", ContentFile(b"not an image")
+        )
+        self.addCleanup(get_redis().delete, f"image:{name}")
+
+        # Act
+        variants = render_variants(name)
+
+        # Assert
+        self.assertEqual(variants, {})
+        self.assertEqual(get_variants(name), {})
+
+    def test_too_large_images_are_skipped(self):
+        """Test images exceeding the size or pixels limits are not decoded"""
+        for limits in ({"IMAGE_MAX_SIZE": 100}, {"IMAGE_MAX_PIXELS": 1000}):
+            with self.subTest(**limits), override_settings(**limits), patch(
+                "apps.common.services.image_derivatives.render_variant"
+            ) as render_variant:
+                # Act
+                variants = render_variants(self.name)
+
+                # Assert
+                render_variant.assert_not_called()
+                self.assertEqual(variants, {})
+                self.assertEqual(get_variants(self.name), {})
+
+    def test_prefork_child_renders_variants_itself(self):
+        """Test daemonic process renders variants without process pool"""
+        # Arrange
+        daemonic = patch(
+            "apps.common.services.image_derivatives.multiprocessing"
+            ".current_process"
+        )
+        get_pool = patch("apps.common.services.image_derivatives.get_pool")
+
+        # Act
+        with daemonic as current_process, get_pool as pool:
+            current_process.return_value.daemon = True
+            variants = render_variants(self.name)
+
+        # Assert
+        pool.assert_not_called()
+        self.assertEqual(variants["large"]["width"], 400)
+
+    def test_original_is_returned_till_variants_are_rendered(self):
+        """Test API returns the original and schedules rendering"""
+        # Act
+        with patch(
+            "services.api.mobile.images.services.images.schedule_variants"
+        ) as schedule_variants:
+            response = self._get_variant("image/webp")
+
+        # Assert
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()["url"], f"/media/{self.name}")
+        self.assertIsNone(response.json()["variant"])
+        schedule_variants.assert_called_once_with(self.name)
+
+    def test_best_variant_is_returned(self):
+        """Test API returns the accepted variant fitting the width"""
+        # Arrange
+        render_variants(self.name)
+
+        # Act
+        webp = self._get_variant("image/webp,image/*", width=80)
+        jpeg = self._get_variant("image/*", width=80)
+        wide = self._get_variant("image/webp", width=1000)
+
+        # Assert
+        self.assertEqual(webp.json()["variant"], "small")
+        self.assertEqual(jpeg.json()["variant"], "small_jpeg")
+        self.assertEqual(wide.json()["variant"], "large")
+        self.assertIn("Accept", webp.headers["Vary"])
+
+    @override_settings(CELERY_TASK_TIME_LIMIT=0)
+    def test_stale_variants_are_removed(self):
+        """Test files of the variants not cached anymore are removed"""
+        # Arrange
+        variants = render_variants(self.name)
+        client = get_redis()
+        digest = client.get(f"image:{self.name}").decode()
+
+        # Act
+        with override_settings(
+            IMAGE_VARIANTS={
+                **VARIANTS,
+                "large": {**VARIANTS["large"], "quality": 90},
+            }
+        ):
+            changed_spec = cleanup_variants()
+        client.delete(f"image_variants:{digest}")
+        expired = cleanup_variants()
+
+        # Assert
+        self.assertEqual((changed_spec, expired), (1, 2))
+        for info in variants.values():
+            self.assertFalse(default_storage.exists(info["path"]))
+
+    def test_recent_variants_are_kept(self):
+        """Test files rendered recently are kept, they could be recorded yet"""
+        # Arrange
+        variants = render_variants(self.name)
+        client = get_redis()
+        client.delete(
+            f"image_variants:{client.get(f'image:{self.name}').decode()}"
+        )
+
+        # Act
+        removed = cleanup_variants()
+
+        # Assert
+        self.assertEqual(removed, 0)
+        for info in variants.values():
+            self.assertTrue(default_storage.exists(info["path"]))
+
+    def test_image_outside_of_folders_is_not_found(self):
+        """Test only images of FILE_FOLDERS are served"""
+        # Act
+        response = self.client.get(
+            "/api/mobile/images/variant",
+            {"path": "variants/secret.png"},
+            headers=self.headers,
+        )
+
+        # Assert
+        self.assertEqual(response.status_code, 404)
+
+
+class ChooseVariantTestCase(SimpleTestCase):
+    def test_smaller_format_is_chosen_for_the_same_width(self):
+        """Test the smallest file is chosen among the fitting variants"""
+        # Arrange
+        variants = {
+            "webp": {"width": 100, "format": "webp", "size": 10},
+            "jpeg": {"width": 100, "format": "jpeg", "size": 20},
+        }
+
+        # Act
+        variant, _ = choose_variant(variants, "image/webp", width=100)
+
+        # Assert
+        self.assertEqual(variant, "webp")
+
+    def test_rejected_format_is_not_chosen(self):
+        """Test format of zero quality or accepted by wildcard is not chosen"""
+        # Arrange
+        variants = {
+            "webp": {"width": 100, "format": "webp", "size": 10},
+            "jpeg": {"width": 100, "format": "jpeg", "size": 20},
+        }
+
+        # Act & Assert
+        for accept in ("image/webp;q=0, image/*", "image/*, */*;q=0.8"):
+            variant, _ = choose_variant(variants, accept, width=100)
+            self.assertEqual(variant, "jpeg")
@@ -0,0 +1,115 @@
+import time
+from uuid import uuid4
+
+from celery import Celery
+from django.test import SimpleTestCase
+
+from apps.common.redis_client import get_redis
+from services.celery_tasks.locking import LockingTask
+
+
+class LockingTaskTestCase(SimpleTestCase):
+    def setUp(self):
+        self.app = Celery(
+            set_as_current=False, broker="memory://", task_cls=LockingTask
+        )
+        self.name = f"tests.locking_{uuid4().hex}"
+        self.calls = []
+        self.addCleanup(self._cleanup)
+
+    def _cleanup(self):
+        client = get_redis()
+        for key in client.keys(f"task_*:{self.name}*"):
+            client.delete(key)
+        with self.app.connection_for_write() as connection:
+            connection.default_channel.queue_purge("celery")
+
+    def _messages(self):
+        with self.app.connection_for_write() as connection:
+            return connection.SimpleQueue("celery").qsize()
+
+    def _task(self, body=None, **options):
+        @self.app.task(name=self.name, **options)
+        def task(*args):
+            self.calls.append(args)
+            if body:
+                return body()
+
+        return task
+
+    def test_identical_pending_task_is_not_enqueued(self):
+        """Test duplicate enqueue returns the pending task"""
+        # Arrange
+        task = self._task(dedupe=True)
+
+        # Act
+        first = task.delay(1)
+        second = task.delay(1)
+        other = task.delay(2)
+
+        # Assert
+        self.assertEqual(first.id, second.id)
+        self.assertNotEqual(first.id, other.id)
+        self.assertEqual(self._messages(), 2)
+
+    def test_task_could_be_enqueued_again_once_started(self):
+        """Test pending lock is released when the task starts"""
+        # Arrange
+        task = self._task(dedupe=True)
+        first = task.delay(1)
+
+        # Act
+        task.apply((1,), task_id=first.id)
+        second = task.delay(1)
+
+        # Assert
+        self.assertEqual(self.calls, [(1,)])
+        self.assertNotEqual(first.id, second.id)
+
+    def test_singleton_run_is_skipped_while_another_is_running(self):
+        """Test overlapping run of singleton task is skipped"""
+        # Arrange
+        task = self._task(singleton=True)
+        lock = get_redis().lock(f"task_singleton:{self.name}", timeout=10)
+        lock.acquire()
+        self.addCleanup(lock.release)
+
+        # Act
+        task.apply()
+
+        # Assert
+        self.assertEqual(self.calls, [])
+
+    def test_singleton_lock_is_renewed_and_released(self):
+        """Test lock lease is renewed while running and released after"""
+        # Arrange
+        key = f"task_singleton:{self.name}"
+        task = self._task(
+            lambda: time.sleep(1.5) or get_redis().exists(key),
+            singleton=True,
+            lock_lease=1,
+        )
+
+        # Act
+        result = task.apply()
+
+        # Assert
+        self.assertEqual(result.result, 1)
+        self.assertFalse(get_redis().exists(key))
+
+    def test_singleton_lock_renewal_stops_at_time_limit(self):
+        """Test lock of a stuck task expires after the time limit"""
+        # Arrange
+        key = f"task_singleton:{self.name}"
+        task = self._task(
+            lambda: time.sleep(2) or get_redis().exists(key),
+            singleton=True,
+            lock_lease=0.6,
+            time_limit=0.5,
+        )
+
+        # Act
+        result = task.apply()
+
+        # Assert
+        self.assertEqual(result.result, 0)
@@ -0,0 +1,150 @@
+from django.apps import apps
+from django.db import IntegrityError, NotSupportedError, connection, models
+from django.db.migrations.state import ProjectState
+from django.db.models.functions import Lower
+from django.test import TransactionTestCase
+
+from apps.common.migration_operations import (
+    AddConstraintConcurrently,
+    AddIndexConcurrently,
+)
+from apps.users.models import User
+
+
+class MigrationOperationsTestCase(TransactionTestCase):
+    def setUp(self):
+        self.from_state = ProjectState.from_apps(apps)
+
+    def _forwards(self, operation):
+        to_state = self.from_state.clone()
+        operation.state_forwards("users", to_state)
+        with connection.schema_editor(atomic=False) as editor:
+            operation.database_forwards(
+                "users", editor, self.from_state, to_state
+            )
+        self.addCleanup(self._backwards, operation, to_state)
+
+    def _backwards(self, operation, to_state):
+        with connection.schema_editor(atomic=False) as editor:
+            operation.database_backwards(
+                "users", editor, to_state, self.from_state
+            )
+
+    def _is_valid_index(self, name):
+        with connection.cursor() as cursor:
+            cursor.execute(
+                "SELECT i.indisvalid FROM pg_index i "
+                "JOIN pg_class c ON c.oid = i.indexrelid WHERE c.relname = %s",
+                [name],
+            )
+            row = cursor.fetchone()
+        return row is not None and row[0]
+
+    def _has_constraint(self, name):
+        with connection.cursor() as cursor:
+            constraints = connection.introspection.get_constraints(
+                cursor, User._meta.db_table
+            )
+        return name in constraints
+
+    def test_add_index_concurrently(self):
+        """Test index is created and repeated run is skipped"""
+        # Arrange
+        operation = AddIndexConcurrently(
+            "user", models.Index(fields=["first_name"], name="user_fn_idx")
+        )
+
+        # Act
+        self._forwards(operation)
+        with connection.schema_editor(atomic=False) as editor:
+            operation.database_forwards(
+                "users", editor, self.from_state, self.from_state
+            )
+
+        # Assert
+        self.assertTrue(self._is_valid_index("user_fn_idx"))
+
+    def test_add_unique_constraint_concurrently(self):
+        """Test unique constraint over fields is attached to built index"""
+        # Arrange
+        operation = AddConstraintConcurrently(
+            "user",
+            models.UniqueConstraint(
+                fields=["first_name", "last_name"], name="user_full_name_uniq"
+            ),
+        )
+
+        # Act
+        self._forwards(operation)
+
+        # Assert
+        self.assertTrue(self._is_valid_index("user_full_name_uniq"))
+        self.assertTrue(self._has_constraint("user_full_name_uniq"))
+
+    def test_add_expression_constraint_resumes_after_failure(self):
+        """Test invalid index left by failed build is rebuilt on next run"""
+        # Arrange
+        User.objects.create_user(email="a@example.com", first_name="John")
+        duplicate = User.objects.create_user(
+            email="b@example.com", first_name="JOHN"
+        )
+        operation = AddConstraintConcurrently(
+            "user",
+            models.UniqueConstraint(
+                Lower("first_name"), name="user_lower_fn_uniq"
+            ),
+        )
+        with self.assertRaises(IntegrityError):
+            self._forwards(operation)
+        self.assertFalse(self._is_valid_index("user_lower_fn_uniq"))
+        duplicate.delete()
+
+        # Act
+        self._forwards(operation)
+
+        # Assert
+        self.assertTrue(self._is_valid_index("user_lower_fn_uniq"))
+
+    def test_remove_expression_constraint_concurrently(self):
+        """Test backwards drops unique index of expression constraint"""
+        # Arrange
+        operation = AddConstraintConcurrently(
+            "user",
+            models.UniqueConstraint(
+                Lower("last_name"), name="user_lower_ln_uniq"
+            ),
+        )
+        to_state = self.from_state.clone()
+        operation.state_forwards("users", to_state)
+        self._forwards(operation)
+
+        # Act
+        self._backwards(operation, to_state)
+
+        # Assert
+        self.assertFalse(self._has_constraint("user_lower_ln_uniq"))
+
+    def test_operation_outside_transaction_only(self):
+        """Test concurrent operation refuses to run inside transaction"""
+        # Arrange
+        operation = AddIndexConcurrently(
+            "user", models.Index(fields=["last_name"], name="user_ln_idx")
+        )
+
+        # Act & Assert
+        with self.assertRaises(NotSupportedError):
+            with connection.schema_editor(atomic=True) as editor:
+                operation.database_forwards(
+                    "users", editor, self.from_state, self.from_state
+                )
+
+    def test_add_check_constraint_concurrently_is_not_supported(self):
+        """Test non unique constraints are rejected"""
+        # Act & Assert
+        with self.assertRaises(ValueError):
+            AddConstraintConcurrently(
+                "user",
+                models.CheckConstraint(
+                    condition=models.Q(is_active=True), name="active_check"
+                ),
+            )
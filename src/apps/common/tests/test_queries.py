@@ -0,0 +1,171 @@
+from datetime import timedelta
+
+from django.http import HttpResponse
+from django.test import AsyncClient, RequestFactory, TestCase
+from django.utils import timezone
+from oauth2_provider.models import AccessToken, Application
+
+from apps.common.middleware import OAuth2TokenMiddleware
+from apps.common.queries import collect_queries
+from apps.users.models import User
+from services.api.common.testing import QueryBudgetTestMixin
+
+
+class CollectQueriesTestCase(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(
+            email="test@example.com", password="testpass123"
+        )
+
+    def test_collect_queries(self):
+        """Test queries are counted along with duplicates"""
+        # Act
+        with collect_queries() as stats:
+            User.objects.get(pk=self.user.pk)
+            User.objects.get(pk=self.user.pk)
+            User.objects.filter(pk=0).first()
+
+        # Assert
+        self.assertEqual(stats.count, 3)
+        self.assertGreaterEqual(stats.duration, 0)
+        self.assertEqual(list(stats.duplicate_shapes.values()), [2])
+        self.assertEqual(list(stats.identical_queries.values()), [2])
+        self.assertEqual(sum(stats.shapes.values()), 3)
+
+
+class QueryInstrumentationTestCase(QueryBudgetTestMixin, TestCase):
+    ME_URL = "/api/mobile/users/me"
+
+    def setUp(self):
+        self.user = User.objects.create_user(
+            email="test@example.com", password="testpass123"
+        )
+        self.application = Application.objects.create(
+            name="Test App",
+            user=self.user,
+            client_type="confidential",
+            authorization_grant_type="password",
+        )
+
+    def _get_me(self):
+        AccessToken.objects.create(
+            user=self.user,
+            application=self.application,
+            token="test-token",
+            expires=timezone.now() + timedelta(hours=1),
+            scope="read",
+        )
+        return self.client.get(
+            self.ME_URL, headers={"Authorization": "Bearer test-token"}
+        )
+
+    def test_get_me_within_query_budget(self):
+        """Test /me endpoint does not exceed its query budget"""
+        # Act
+        response = self._get_me()
+
+        # Assert
+        self.assertEqual(response.status_code, 200)
+        self.assertWithinQueryBudget(response)
+
+    def test_exceeded_query_budget_fails(self):
+        """Test query budget check fails when budget is exceeded"""
+        # Arrange
+        response = self._get_me()
+        response.wsgi_request.operation_query_budget = 0
+
+        # Act & Assert
+        with self.assertRaises(AssertionError):
+            self.assertWithinQueryBudget(response)
+
+    def test_server_timing_for_staff(self):
+        """Test Server-Timing header is exposed to staff users"""
+        # Arrange
+        self.user.is_staff = True
+        self.user.save()
+
+        # Act
+        response = self._get_me()
+
+        # Assert
+        self.assertIn("db;dur=", response.headers["Server-Timing"])
+
+    def test_token_is_looked_up_once(self):
+        """Test request authenticated by the operation has no duplicates"""
+        # Act
+        with self.assertLogs("apps.common.middleware") as logs:
+            response = self._get_me()
+
+        # Assert
+        self.assertEqual(response.status_code, 200)
+        self.assertIn("db_duplicate_shapes=0", "\n".join(logs.output))
+        self.assertIn("Authorization", response.headers["Vary"])
+
+    async def test_server_timing_under_asgi(self):
+        """Test queries of requests served by ASGI handler are collected"""
+        # Arrange
+        self.user.is_staff = True
+        await self.user.asave()
+        await AccessToken.objects.acreate(
+            user=self.user,
+            application=self.application,
+            token="test-token",
+            expires=timezone.now() + timedelta(hours=1),
+            scope="read",
+        )
+
+        # Act
+        with self.assertLogs("apps.common.middleware") as logs:
+            response = await AsyncClient().get(
+                self.ME_URL, headers={"Authorization": "Bearer test-token"}
+            )
+
+        # Assert
+        self.assertEqual(response.status_code, 200)
+        self.assertIn('desc="1 queries"', response.headers["Server-Timing"])
+        self.assertIn("db_queries=1", "\n".join(logs.output))
+
+    def test_no_server_timing_for_regular_users(self):
+        """Test Server-Timing header is hidden from regular users"""
+        # Act
+        response = self._get_me()
+
+        # Assert
+        self.assertNotIn("Server-Timing", response.headers)
+
+
+class OAuth2TokenMiddlewareTestCase(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(email="test@example.com")
+        AccessToken.objects.create(
+            user=self.user,
+            token="test-token",
+            expires=timezone.now() + timedelta(hours=1),
+            scope="read",
+        )
+        self.middleware = OAuth2TokenMiddleware(lambda request: HttpResponse())
+
+    def _call(self, path):
+        request = RequestFactory().get(
+            path, headers={"Authorization": "Bearer test-token"}
+        )
+        with collect_queries() as stats:
+            self.middleware(request)
+        return request, stats
+
+    def test_bearer_user_of_django_views(self):
+        """Test Django views get the user of the bearer token"""
+        # Act
+        request, _ = self._call("/admin/")
+
+        # Assert
+        self.assertEqual(request.user, self.user)
+
+    def test_api_token_is_not_looked_up(self):
+        """Test API requests are left to authentication of operations"""
+        # Act
+        request, stats = self._call("/api/mobile/users/me")
+
+        # Assert
+        self.assertFalse(hasattr(request, "user"))
+        self.assertEqual(stats.count, 0)
@@ -0,0 +1,138 @@
+import base64
+from datetime import timedelta
+from unittest import mock
+
+import redis
+from django.test import RequestFactory, TestCase, override_settings
+from django.urls import reverse
+from django.utils import timezone
+from oauth2_provider.models import AccessToken, Application
+
+from apps.common.rate_limits import (
+    KEY_CLIENT_ID,
+    RateLimit,
+    check_rate_limits,
+    parse_rate,
+)
+from apps.common.redis_client import get_redis
+from apps.users.models import User
+
+RATE_LIMITS = {
+    "api": "1200/m",
+    "oauth2_token": "2/m",
+    "oauth2_token_client": "600/m",
+}
+
+
+@override_settings(RATE_LIMITS_ENABLED=True, RATE_LIMITS=RATE_LIMITS)
+class RateLimitsTestCase(TestCase):
+    def setUp(self):
+        keys = get_redis().keys("rate_limit:*")
+        if keys:
+            get_redis().delete(*keys)
+        self.request = RequestFactory().post(
+            "/", REMOTE_ADDR="10.0.0.1", HTTP_AUTHORIZATION=self._basic()
+        )
+
+    def _basic(self, client_id="client-1"):
+        credentials = base64.b64encode(f"{client_id}:secret".encode())
+        return f"Basic {credentials.decode()}"
+
+    def test_parse_rate(self):
+        """Test rate is parsed into requests and period in seconds"""
+        # Act & Assert
+        self.assertEqual(parse_rate("10/m"), (10, 60))
+        with self.assertRaises(ValueError):
+            parse_rate("10/week")
+
+    def test_requests_over_limit_wait(self):
+        """Test requests over the limit get time to wait"""
+        # Arrange
+        limits = [RateLimit("oauth2_token")]
+
+        # Act
+        results = [check_rate_limits(self.request, limits) for _ in range(3)]
+
+        # Assert
+        self.assertEqual(results[:2], [None, None])
+        self.assertGreater(results[2], 0)
+        self.assertLessEqual(results[2], 30)
+
+    def test_limits_are_keyed_by_client_id(self):
+        """Test other clients are not limited by the exceeded client"""
+        # Arrange
+        limits = [RateLimit("oauth2_token", key=KEY_CLIENT_ID)]
+        other = RequestFactory().post(
+            "/", HTTP_AUTHORIZATION=self._basic("client-2")
+        )
+        for _ in range(2):
+            check_rate_limits(self.request, limits)
+
+        # Act
+        wait = check_rate_limits(other, limits)
+
+        # Assert
+        self.assertIsNone(wait)
+        self.assertIsNotNone(check_rate_limits(self.request, limits))
+
+    def test_requests_allowed_if_redis_is_down(self):
+        """Test rate limits fail open on Redis errors"""
+        # Arrange
+        limits = [RateLimit("oauth2_token", rate="1/m")]
+
+        # Act
+        with mock.patch(
+            "apps.common.rate_limits._get_script",
+            side_effect=redis.ConnectionError,
+        ):
+            waits = [check_rate_limits(self.request, limits) for _ in range(2)]
+
+        # Assert
+        self.assertEqual(waits, [None, None])
+
+    def test_token_endpoint_retry_after(self):
+        """Test token endpoint returns 429 with Retry-After header"""
+        # Arrange
+        data = {"grant_type": "password", "username": "a", "password": "b"}
+        for _ in range(2):
+            self.client.post(reverse("token"), data)
+
+        # Act
+        response = self.client.post(reverse("token"), data)
+
+        # Assert
+        self.assertEqual(response.status_code, 429)
+        self.assertGreaterEqual(int(response["Retry-After"]), 1)
+
+    def test_api_throttled_retry_after(self):
+        """Test throttled API operation returns Retry-After header"""
+        # Arrange
+        user = User.objects.create_user(email="test@example.com")
+        application = Application.objects.create(
+            name="Test App",
+            user=user,
+            client_type="confidential",
+            authorization_grant_type="password",
+        )
+        AccessToken.objects.create(
+            user=user,
+            application=application,
+            token="test-token",
+            expires=timezone.now() + timedelta(hours=1),
+            scope="read",
+        )
+
+        # Act
+        with override_settings(RATE_LIMITS={**RATE_LIMITS, "api": "1/m"}):
+            responses = [
+                self.client.get(
+                    "/api/mobile/users/me",
+                    headers={"Authorization": "Bearer test-token"},
+                )
+                for _ in range(2)
+            ]
+
+        # Assert
+        self.assertEqual(responses[0].status_code, 200)
+        self.assertEqual(responses[1].status_code, 429)
+        self.assertGreaterEqual(int(responses[1]["Retry-After"]), 59)
@@ -0,0 +1,51 @@
+import datetime
+import decimal
+import json
+import uuid
+
+from django.test import RequestFactory, SimpleTestCase
+from ninja.renderers import JSONRenderer
+
+from services.api.common.renderers import ORJSONParser, ORJSONRenderer
+
+
+class ORJSONRendererTestCase(SimpleTestCase):
+    def test_output_matches_default_renderer(self):
+        """Test rendered data is equal to the default Ninja renderer one"""
+        # Arrange
+        data = [
+            {
+                "id": 1,
+                "uuid": uuid.uuid4(),
+                "amount": decimal.Decimal("10.50"),
+                "created": datetime.datetime(
+                    2024, 1, 2, 3, 4, 5, 678901, tzinfo=datetime.timezone.utc
+                ),
+                "date": datetime.date(2024, 1, 2),
+                "time": datetime.time(3, 4, 5, 678901),
+                "duration": datetime.timedelta(hours=1),
+                "name": "Jöhn",
+                "empty": None,
+            }
+        ]
+
+        # Act
+        output = ORJSONRenderer().render(None, data, response_status=200)
+
+        # Assert
+        expected = JSONRenderer().render(None, data, response_status=200)
+        self.assertEqual(json.loads(output), json.loads(expected))
+        self.assertIn(b'"2024-01-02T03:04:05.678Z"', output)
+
+    def test_parser(self):
+        """Test request body is parsed"""
+        # Arrange
+        request = RequestFactory().post(
+            "/", data={"a": [1, 2]}, content_type="application/json"
+        )
+
+        # Act
+        data = ORJSONParser().parse_body(request)
+
+        # Assert
+        self.assertEqual(data, {"a": [1, 2]})
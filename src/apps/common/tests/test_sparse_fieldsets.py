@@ -0,0 +1,179 @@
+import base64
+from datetime import timedelta
+
+from django.test import TestCase
+from django.urls import reverse
+from django.utils import timezone
+from ninja.testing import TestClient
+from oauth2_provider.models import AccessToken, Application
+
+from apps.users.models import User
+from services.api.api import api
+from services.api.common.fieldsets import only_fields, sparse_fieldset
+from services.api.common.routers import Router
+from services.api.mobile.users.shemas import UserResponse
+
+
+@sparse_fieldset(UserResponse)
+def create_user(request):
+    user = User(pk=1, email="test@example.com", first_name="John")
+    return 201, user
+
+
+router = Router()
+router.post("users", response={201: UserResponse})(create_user)
+router.post("users/aliased", response={201: UserResponse}, by_alias=True)(
+    create_user
+)
+
+
+class SparseFieldsetsTestCase(TestCase):
+    ME_URL = "/api/mobile/users/me"
+
+    def setUp(self):
+        self.user = User.objects.create_user(
+            email="test@example.com",
+            password="testpass123",
+            first_name="John",
+            last_name="Doe",
+        )
+        application = Application.objects.create(
+            name="Test App",
+            user=self.user,
+            client_type="confidential",
+            authorization_grant_type="password",
+        )
+        AccessToken.objects.create(
+            user=self.user,
+            application=application,
+            token="test-token",
+            expires=timezone.now() + timedelta(hours=1),
+            scope="read",
+        )
+
+    def _get_me(self, **params):
+        return self.client.get(
+            self.ME_URL,
+            params,
+            headers={"Authorization": "Bearer test-token"},
+        )
+
+    def test_all_fields_by_default(self):
+        """Test all the schema fields are returned without fields param"""
+        # Act
+        response = self._get_me()
+
+        # Assert
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(
+            set(response.json()), {"id", "email", "first_name", "last_name"}
+        )
+
+    def test_requested_fields_only(self):
+        """Test requested fields are returned, referenced by name or alias"""
+        # Act
+        response = self._get_me(fields="id,firstName")
+
+        # Assert
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(
+            response.json(), {"id": self.user.pk, "first_name": "John"}
+        )
+
+    def test_unknown_field(self):
+        """Test 400 is returned for unknown field"""
+        # Act
+        response = self._get_me(fields="id,password")
+
+        # Assert
+        self.assertEqual(response.status_code, 400)
+
+    def test_subset_is_cached(self):
+        """Test subset schema is created once per fields combination"""
+        # Act
+        subset = UserResponse.subset(["email", "id"])
+
+        # Assert
+        self.assertIs(subset, UserResponse.subset(["id", "email"]))
+        self.assertEqual(set(subset.model_fields), {"id", "email"})
+
+    def test_only_fields(self):
+        """Test queryset loads requested model fields only"""
+        # Act
+        user = only_fields(
+            User.objects.all(), frozenset({"email", "first_name"})
+        ).get()
+
+        # Assert
+        self.assertEqual(
+            user.get_deferred_fields() & {"email", "first_name", "id"}, set()
+        )
+        self.assertIn("last_name", user.get_deferred_fields())
+
+    def test_token_user_fields(self):
+        """Test token endpoint returns requested user fields only"""
+        # Arrange
+        application = Application.objects.create(
+            name="Password App",
+            user=self.user,
+            client_type="confidential",
+            authorization_grant_type="password",
+            client_secret="",
+        )
+        credentials = base64.b64encode(
+            f"{application.client_id}:".encode()
+        ).decode()
+
+        # Act
+        response = self.client.post(
+            reverse("token"),
+            {
+                "grant_type": "password",
+                "username": "test@example.com",
+                "password": "testpass123",
+                "scope": "read",
+                "fields": "id,email",
+            },
+            headers={"Authorization": f"Basic {credentials}"},
+        )
+
+        # Assert
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(
+            response.json()["user"],
+            {"id": self.user.pk, "email": "test@example.com"},
+        )
+
+    def test_status_is_kept(self):
+        """Test status returned along with the result is kept"""
+        # Act
+        response = TestClient(router).post("/users?fields=id,firstName")
+
+        # Assert
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(response.json(), {"id": 1, "first_name": "John"})
+
+    def test_view_of_several_routes(self):
+        """Test response is rendered by the operation of requested route"""
+        # Act
+        response = TestClient(router).post(
+            "/users/aliased?fields=id,firstName"
+        )
+
+        # Assert
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(response.json(), {"id": 1, "firstName": "John"})
+
+    def test_fields_param_in_schema(self):
+        """Test fields query parameter is documented by OpenAPI schema"""
+        # Act
+        schema = api.get_openapi_schema()
+
+        # Assert
+        parameters = schema["paths"]["/api/mobile/users/me"]["get"][
+            "parameters"
+        ]
+        self.assertIn(
+            ("fields", "query"),
+            [(param["name"], param["in"]) for param in parameters],
+        )
@@ -0,0 +1,36 @@
+from django.conf import settings
+from django.test import SimpleTestCase
+
+from apps.common.startup import parse_import_times, profile_startup
+
+
+class StartupTestCase(SimpleTestCase):
+    def test_parse_import_times(self):
+        """Test python -X importtime output is parsed"""
+        # Arrange
+        output = (
+            "import time: self [us] | cumulative | imported package\n"
+            "import time:       120 |        120 |   _io\n"
+            "import time:      1500 |       2500 | django.conf\n"
+        )
+
+        # Act
+        imports = parse_import_times(output)
+
+        # Assert
+        self.assertEqual(
+            imports,
+            [("_io", 0.00012, 0.00012), ("django.conf", 0.0015, 0.0025)],
+        )
+
+    def test_startup_time_budget(self):
+        """Test Django setup and Celery bootstrap fit the time budget"""
+        # Act
+        profile = profile_startup()
+
+        # Assert
+        self.assertIn("common.py", profile.settings_components)
+        self.assertTrue(profile.imports)
+        # Celery app is imported by django_project before Django setup
+        self.assertGreater(profile.celery, 0.01)
+        self.assertLessEqual(profile.total, settings.STARTUP_TIME_BUDGET)
@@ -0,0 +1,90 @@
+import time
+
+from celery import Celery
+from django.test import SimpleTestCase
+
+from apps.common.redis_client import get_redis
+from apps.common.task_metrics import (
+    METRICS_KEY,
+    SENT_AT_HEADER,
+    record_metrics,
+    render_metrics,
+    start_measuring,
+)
+
+TASK_NAME = "tests.metrics"
+
+
+class TaskMetricsTestCase(SimpleTestCase):
+    def setUp(self):
+        get_redis().delete(METRICS_KEY)
+        self.addCleanup(get_redis().delete, METRICS_KEY)
+        self.app = Celery(set_as_current=False, broker="memory://")
+
+        @self.app.task(name=TASK_NAME)
+        def task(fail=False):
+            if fail:
+                raise ValueError("Task failed")
+
+        self.task = task
+
+    def test_publishing_time_is_added_to_message(self):
+        """Test published task message carries its publishing time"""
+        # Arrange
+        with self.app.connection_for_write() as connection:
+            queue = connection.SimpleQueue("celery")
+            self.addCleanup(queue.clear)
+
+            # Act
+            self.task.delay()
+
+            # Assert
+            message = queue.get(timeout=1)
+            self.assertAlmostEqual(
+                message.headers[SENT_AT_HEADER], time.time(), delta=5
+            )
+
+    def test_metrics_are_recorded_and_rendered(self):
+        """Test queue wait, runtime and states are exported by task name"""
+        # Arrange
+        self.task.push_request(id="1", eta=None, sent_at=time.time() - 2)
+        start_measuring(self.task)
+        record_metrics(self.task, state="RETRY")
+        self.task.pop_request()
+
+        # Act
+        self.task.apply()
+        self.task.apply(kwargs={"fail": True})
+        metrics = render_metrics()
+
+        # Assert
+        self.assertIn(
+            'celery_task_queue_wait_seconds_bucket{task="tests.metrics",'
+            'le="1"} 0',
+            metrics,
+        )
+        self.assertIn(
+            'celery_task_queue_wait_seconds_bucket{task="tests.metrics",'
+            'le="2.5"} 1',
+            metrics,
+        )
+        self.assertIn(
+            'celery_task_runtime_seconds_count{task="tests.metrics"} 3',
+            metrics,
+        )
+        self.assertIn(
+            'celery_tasks_total{task="tests.metrics",state="success"} 1',
+            metrics,
+        )
+        self.assertIn(
+            'celery_tasks_total{task="tests.metrics",state="retry"} 1',
+            metrics,
+        )
+        self.assertIn(
+            'celery_tasks_total{task="tests.metrics",state="failure"} 1',
+            metrics,
+        )
+        self.assertIn(
+            'celery_task_max_rss_growth_bytes_total{task="tests.metrics"}',
+            metrics,
+        )
@@ -0,0 +1,86 @@
+import sys
+from unittest.mock import MagicMock, Mock
+
+from celery.exceptions import NotRegistered
+from django.core.management import call_command
+from django.test import SimpleTestCase
+
+from apps.common.redis_client import get_redis
+from apps.common.task_registry import LazyStrategies, pending_key, send_task
+from django_project.celery import app
+
+TASK_NAME = "dummy.dummy_task"
+TASK_MODULE = "services.celery_tasks.dummy"
+
+
+class TaskRegistryTestCase(SimpleTestCase):
+    def setUp(self):
+        self._unload_task()
+        self.addCleanup(self._unload_task)
+
+    def _unload_task(self):
+        dict.pop(app.tasks, TASK_NAME, None)
+        sys.modules.pop(TASK_MODULE, None)
+
+    def test_task_module_is_imported_lazily(self):
+        """Test task module is imported on the first lookup of the task"""
+        # Arrange
+        self.assertNotIn(TASK_NAME, app.tasks)
+
+        # Act
+        task = app.tasks[TASK_NAME]
+
+        # Assert
+        self.assertEqual(task.name, TASK_NAME)
+        self.assertIn(TASK_MODULE, sys.modules)
+
+    def test_undeclared_task_is_not_registered(self):
+        """Test lookup of undeclared task raises NotRegistered"""
+        # Act & Assert
+        with self.assertRaises(NotRegistered):
+            app.tasks["unknown.task"]
+
+    def test_send_task_does_not_import_task_module(self):
+        """Test sending task by name does not import the task body"""
+        # Act
+        with app.connection_for_write("memory://") as connection:
+            app.send_task(TASK_NAME, connection=connection)
+
+        # Assert
+        self.assertNotIn(TASK_MODULE, sys.modules)
+
+    def test_deduped_send_task_does_not_import_task_module(self):
+        """Test deduped task is sent by name once till it's started"""
+        # Arrange
+        self.addCleanup(get_redis().delete, pending_key(TASK_NAME, (1,), None))
+
+        # Act
+        with app.connection_for_write("memory://") as connection:
+            first = send_task(
+                TASK_NAME, args=(1,), dedupe=True, connection=connection
+            )
+            second = send_task(
+                TASK_NAME, args=(1,), dedupe=True, connection=connection
+            )
+
+        # Assert
+        self.assertEqual(first.id, second.id)
+        self.assertNotIn(TASK_MODULE, sys.modules)
+
+    def test_strategy_is_started_on_first_message(self):
+        """Test worker consumer starts strategy of not loaded task"""
+        # Arrange
+        consumer = MagicMock(app=app)
+        strategies = LazyStrategies(consumer)
+
+        # Act
+        strategy = strategies[TASK_NAME]
+
+        # Assert
+        self.assertIs(strategies[TASK_NAME], strategy)
+        self.assertIn(TASK_MODULE, sys.modules)
+
+    def test_task_modules_declaration_is_up_to_date(self):
+        """Test TASK_MODULES matches the tasks of services.celery_tasks"""
+        # Act & Assert
+        call_command("task_registry", "--check", stdout=Mock())
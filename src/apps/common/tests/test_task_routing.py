@@ -0,0 +1,119 @@
+from types import SimpleNamespace
+
+from billiard import cpu_count
+from celery import Celery
+from celery.exceptions import ImproperlyConfigured
+from django.test import SimpleTestCase
+
+from apps.common.task_routing import apply_worker_profile
+
+BULK_TASK = "dummy.dummy_task"
+EMAIL_TASK = "emails.send_email"
+
+
+class TaskRoutingTestCase(SimpleTestCase):
+    def setUp(self):
+        self.app = Celery(set_as_current=False)
+        self.app.config_from_object("django.conf:settings", namespace="CELERY")
+        self.app.conf.task_routes = {
+            **self.app.conf.task_routes,
+            "dummy.*": {"queue": "bulk", "priority": 9},
+        }
+        self.app.conf.worker_hijack_root_logger = False
+        self.worker = SimpleNamespace(app=self.app)
+
+    def _consume(self, connection, count):
+        received = []
+
+        def on_message(body, message):
+            received.append(message.headers["task"])
+            message.ack()
+
+        queues = list(self.app.amqp.queues.consume_from.values())
+        with connection.Consumer(
+            queues, callbacks=[on_message], accept=["json"]
+        ):
+            for _ in range(count):
+                connection.drain_events(timeout=1)
+        return received
+
+    def _purge(self, connection):
+        for queue in self.app.amqp.queues.values():
+            queue.bind(connection.default_channel).purge()
+
+    def test_task_is_routed_to_lane(self):
+        """Test task options are set by the matching route"""
+        # Act
+        options = self.app.amqp.router.route({}, EMAIL_TASK)
+
+        # Assert
+        self.assertEqual(options["queue"].name, "high")
+        self.assertEqual(options["priority"], 0)
+
+    def _start_worker(self, **options):
+        # the options given by `celery worker` command line by default
+        options = {
+            "concurrency": None,
+            "prefetch_multiplier": self.app.conf.worker_prefetch_multiplier,
+            **options,
+        }
+        return self.app.Worker(
+            hostname="test@localhost", redirect_stdouts=False, **options
+        )
+
+    def test_worker_profile(self):
+        """Test worker consumes queues of the profile with its prefetch"""
+        # Act
+        worker = self._start_worker(profile="latency")
+
+        # Assert
+        self.assertEqual(set(self.app.amqp.queues.consume_from), {"high"})
+        self.assertEqual(worker.pool.limit, 4)
+        self.assertEqual(worker.consumer.initial_prefetch_count, 4)
+
+    def test_command_line_options_take_precedence_over_profile(self):
+        """Test -Q and -c given with the profile are not overridden"""
+        # Act
+        worker = self._start_worker(
+            profile="latency", queues=["bulk"], concurrency=2
+        )
+
+        # Assert
+        self.assertEqual(set(self.app.amqp.queues.consume_from), {"bulk"})
+        self.assertEqual(worker.pool.limit, 2)
+        self.assertEqual(worker.consumer.initial_prefetch_count, 2)
+
+    def test_profile_concurrency_of_cpus(self):
+        """Test concurrency 0 of the profile is the number of CPUs"""
+        # Act
+        worker = self._start_worker(profile="default")
+
+        # Assert
+        self.assertEqual(worker.concurrency, cpu_count())
+
+    def test_apply_unknown_worker_profile(self):
+        """Test unknown worker profile is reported"""
+        # Act & Assert
+        with self.assertRaises(ImproperlyConfigured):
+            apply_worker_profile(self.worker, "unknown", {})
+
+    def test_high_priority_task_is_not_blocked_by_bulk_backlog(self):
+        """Test email sent after bulk backlog is consumed first"""
+        # Arrange
+        connection = self.app.connection_for_write("memory://")
+        self.addCleanup(connection.release)
+        self.addCleanup(self._purge, connection)
+        for _ in range(100):
+            self.app.send_task(BULK_TASK, connection=connection)
+        self.app.send_task(EMAIL_TASK, connection=connection)
+
+        # Act
+        apply_worker_profile(self.worker, "latency", {})
+        latency = self._consume(connection, 1)
+        self.app.send_task(EMAIL_TASK, connection=connection)
+        apply_worker_profile(self.worker, "default", {})
+        default = self._consume(connection, 3)
+
+        # Assert
+        self.assertEqual(latency, [EMAIL_TASK])
+        self.assertIn(EMAIL_TASK, default)
@@ -0,0 +1,36 @@
+from django.test import RequestFactory, SimpleTestCase
+from django.urls import get_resolver
+
+from apps.common.middleware import FirstRequestLatencyMiddleware
+from apps.common.warmup import is_warmed_up, warm_up
+
+
+class WarmUpTestCase(SimpleTestCase):
+    def test_warm_up(self):
+        """Test URL resolvers are populated by warm-up"""
+        # Act
+        duration = warm_up()
+
+        # Assert
+        self.assertTrue(is_warmed_up())
+        self.assertGreater(duration, 0)
+        resolver = get_resolver()
+        self.assertTrue(resolver._populated)
+        for _, nested in resolver.namespace_dict.values():
+            self.assertTrue(nested._populated)
+
+    def test_first_request_latency_is_logged_once(self):
+        """Test latency of the first request only is logged"""
+        # Arrange
+        middleware = FirstRequestLatencyMiddleware(lambda request: "ok")
+        request = RequestFactory().get("/")
+
+        # Act
+        with self.assertLogs("apps.common.middleware") as logs:
+            middleware(request)
+            middleware(request)
+
+        # Assert
+        self.assertEqual(len(logs.records), 1)
+        self.assertIn("first_request_ms", logs.output[0])
+        self.assertTrue(hasattr(logs.records[0], "warmed_up"))
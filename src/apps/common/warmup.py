@@ -0,0 +1,86 @@
+import logging
+import time
+from typing import Callable
+
+from django.conf import settings
+from django.template import TemplateSyntaxError, engines
+from django.urls import get_resolver
+from django.utils import translation
+
+logger = logging.getLogger(__name__)
+
+_warmed_up = False
+
+
+def is_warmed_up() -> bool:
+    return _warmed_up
+
+
+def warm_up_urls() -> None:
+    """
+    Imports URL configuration, including Ninja APIs with their routers and
+    schemas, and populates the URL resolvers.
+    """
+    _populate_resolver(get_resolver())
+
+
+def _populate_resolver(resolver) -> None:
+    resolver.reverse_dict
+    for _, nested in resolver.namespace_dict.values():
+        _populate_resolver(nested)
+
+
+def warm_up_templates() -> None:
+    """Compiles the project templates, so they are kept by cached loader."""
+    for engine in engines.all():
+        for directory in engine.engine.dirs:
+            for path in directory.rglob("*"):
+                if not path.is_file() or path.name.startswith("."):
+                    continue
+                name = path.relative_to(directory).as_posix()
+                try:
+                    engine.get_template(name)
+                except TemplateSyntaxError:
+                    logger.exception("warm-up failed to compile %s", name)
+
+
+def warm_up_translations() -> None:
+    with translation.override(settings.LANGUAGE_CODE):
+        translation.gettext("")
+
+
+WARM_UP_STEPS: list[Callable[[], None]] = [
+    warm_up_urls,
+    warm_up_templates,
+    warm_up_translations,
+]
+
+
+def warm_up() -> float:
+    """
+    Runs the lazy setup paid by the first request otherwise, returns the
+    time taken in seconds.
+
+    It's called from WSGI/ASGI module, so it runs in gunicorn master before
+    fork with `--preload` and on every worker start otherwise. It doesn't
+    open any connections, so they are not shared by the forked workers.
+    """
+    global _warmed_up
+
+    start = time.perf_counter()
+    for step in WARM_UP_STEPS:
+        step_start = time.perf_counter()
+        step()
+        logger.debug(
+            "warm-up %s %.2fms",
+            step.__name__,
+            (time.perf_counter() - step_start) * 1000,
+        )
+    duration = time.perf_counter() - start
+    _warmed_up = True
+    logger.info(
+        "warm-up done in %.2fms",
+        duration * 1000,
+        extra={"warm_up_ms": round(duration * 1000, 2)},
+    )
+    return duration
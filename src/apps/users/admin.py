@@ -2,7 +2,13 @@ from django.contrib import admin
 from django.contrib.auth.admin import UserAdmin as DjangoUserAdmin
 from django.utils.translation import gettext_lazy as _
 
+from apps.common.services.streaming_exports import (
+    EXPORT_FORMAT_CSV,
+    EXPORT_FORMAT_NDJSON,
+    streaming_export_response,
+)
 from apps.users.models import User
+from apps.users.services.exports import USER_EXPORT_FIELDS
 
 
 class UserAdmin(DjangoUserAdmin):
@@ -39,6 +45,25 @@ class UserAdmin(DjangoUserAdmin):
         ),
     )
     search_fields = ("first_name", "last_name", "email")
+    actions = ("export_as_csv", "export_as_ndjson")
+
+    @admin.action(description=_("Export selected users as CSV"))
+    def export_as_csv(self, request, queryset):
+        return streaming_export_response(
+            queryset.order_by("pk"),
+            USER_EXPORT_FIELDS,
+            filename="users",
+            export_format=EXPORT_FORMAT_CSV,
+        )
+
+    @admin.action(description=_("Export selected users as NDJSON"))
+    def export_as_ndjson(self, request, queryset):
+        return streaming_export_response(
+            queryset.order_by("pk"),
+            USER_EXPORT_FIELDS,
+            filename="users",
+            export_format=EXPORT_FORMAT_NDJSON,
+        )
 
 
 admin.site.register(User, UserAdmin)
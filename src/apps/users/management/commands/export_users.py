@@ -0,0 +1,38 @@
+from django.core.management.base import BaseCommand
+
+from apps.common.services.streaming_exports import (
+    EXPORT_CONTENT_TYPES,
+    EXPORT_FORMAT_CSV,
+    iter_export,
+)
+from apps.users.models import User
+from apps.users.services.exports import USER_EXPORT_FIELDS
+
+
+class Command(BaseCommand):
+    help = "Streams all the users as CSV or NDJSON to stdout or a file."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--format",
+            choices=list(EXPORT_CONTENT_TYPES),
+            default=EXPORT_FORMAT_CSV,
+        )
+        parser.add_argument("--output", help="Output file, stdout if empty")
+        parser.add_argument("--chunk-size", type=int, default=2000)
+
+    def handle(self, *args, **options):
+        chunks = iter_export(
+            User.objects.order_by("pk"),
+            USER_EXPORT_FIELDS,
+            export_format=options["format"],
+            chunk_size=options["chunk_size"],
+        )
+        if not options["output"]:
+            for chunk in chunks:
+                self.stdout.write(chunk, ending="")
+            return
+
+        with open(options["output"], "w", newline="") as f:
+            for chunk in chunks:
+                f.write(chunk)
@@ -0,0 +1,10 @@
+USER_EXPORT_FIELDS = [
+    "id",
+    "email",
+    "first_name",
+    "last_name",
+    "is_active",
+    "is_staff",
+    "date_joined",
+    "last_login",
+]
@@ -0,0 +1,49 @@
+import time
+
+from django.core.cache import cache
+
+USER_VERSION_CACHE_KEY = "users:version:{user_id}"
+USER_VERSION_CACHE_TIMEOUT = 60 * 60 * 24 * 30
+
+
+def get_user_version(user_id: int) -> int:
+    """
+    Returns version of user data, which is used as a cheap validator for
+    conditional requests instead of comparing the data itself.
+
+    The version is a timestamp in nanoseconds kept in the cache. If it's
+    missing (never set or evicted), a new version is started, so clients
+    get the data again instead of a stale one.
+    """
+    key = USER_VERSION_CACHE_KEY.format(user_id=user_id)
+    version = cache.get(key)
+    if version is None:
+        version = time.time_ns()
+        if not cache.add(key, version, USER_VERSION_CACHE_TIMEOUT):
+            version = cache.get(key, version)
+    return version
+
+
+async def aget_user_version(user_id: int) -> int:
+    """Async version of `get_user_version`."""
+    key = USER_VERSION_CACHE_KEY.format(user_id=user_id)
+    version = await cache.aget(key)
+    if version is None:
+        version = time.time_ns()
+        if not await cache.aadd(key, version, USER_VERSION_CACHE_TIMEOUT):
+            version = await cache.aget(key, version)
+    return version
+
+
+def bump_user_version(user_id: int) -> None:
+    """
+    Invalidates cached validators of user data, called once the changes of
+    the user are committed. `QuerySet.update()` and bulk operations don't
+    send the model signals, so they should call it themselves, e.g.
+    `transaction.on_commit(partial(bump_user_version, user_id))`.
+    """
+    cache.set(
+        USER_VERSION_CACHE_KEY.format(user_id=user_id),
+        time.time_ns(),
+        USER_VERSION_CACHE_TIMEOUT,
+    )
@@ -0,0 +1,16 @@
+from functools import partial
+
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from apps.users.models import User
+from apps.users.services.versions import bump_user_version
+
+
+@receiver(post_save, sender=User)
+@receiver(post_delete, sender=User)
+def user_changed(sender, instance, **kwargs):
+    # bumped before the commit, a concurrent request could read the old row
+    # along with the new version and answer 304 for the new one
+    transaction.on_commit(partial(bump_user_version, instance.pk))
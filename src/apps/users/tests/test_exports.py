@@ -0,0 +1,77 @@
+import csv
+import json
+from io import StringIO
+
+import pytest
+from django.core.management import call_command
+from django.http import StreamingHttpResponse
+from django.urls import reverse
+
+from apps.common.services.streaming_exports import iter_export
+from apps.users.models import User
+from apps.users.services.exports import USER_EXPORT_FIELDS
+
+
+@pytest.fixture
+def users():
+    return [
+        User.objects.create_user(email=f"user{i}@example.com", password="pass")
+        for i in range(3)
+    ]
+
+
+@pytest.mark.django_db
+class TestUserExport:
+    def test_csv_export(self, users):
+        chunks = iter_export(
+            User.objects.order_by("pk"), USER_EXPORT_FIELDS, "csv"
+        )
+        rows = list(csv.reader(StringIO("".join(chunks))))
+        assert rows[0] == USER_EXPORT_FIELDS
+        assert [row[1] for row in rows[1:]] == [user.email for user in users]
+
+    def test_ndjson_export(self, users):
+        chunks = iter_export(
+            User.objects.order_by("pk"), USER_EXPORT_FIELDS, "ndjson"
+        )
+        records = [json.loads(line) for line in "".join(chunks).splitlines()]
+        assert [record["email"] for record in records] == [
+            user.email for user in users
+        ]
+
+    def test_export_is_chunked(self, users):
+        chunks = list(
+            iter_export(
+                User.objects.order_by("pk"),
+                USER_EXPORT_FIELDS,
+                "ndjson",
+                chunk_size=2,
+            )
+        )
+        assert len(chunks) == 2
+
+    def test_unsupported_format(self):
+        with pytest.raises(ValueError):
+            list(iter_export(User.objects.all(), USER_EXPORT_FIELDS, "xml"))
+
+    def test_admin_action_streams_export(self, users, client):
+        admin = User.objects.create_superuser(
+            email="admin@example.com", password="pass"
+        )
+        client.force_login(admin)
+        response = client.post(
+            reverse("admin:users_user_changelist"),
+            {
+                "action": "export_as_csv",
+                "_selected_action": [user.pk for user in users],
+            },
+        )
+        assert isinstance(response, StreamingHttpResponse)
+        assert response["Content-Type"] == "text/csv"
+        content = b"".join(response.streaming_content).decode()
+        assert len(content.splitlines()) == len(users) + 1
+
+    def test_export_users_command(self, users):
+        stdout = StringIO()
+        call_command("export_users", "--format", "ndjson", stdout=stdout)
+        assert len(stdout.getvalue().splitlines()) == len(users)
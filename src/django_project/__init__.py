@@ -0,0 +1,4 @@
+# the app is used by shared tasks sent from Django processes
+from django_project.celery import app as celery_app
+
+__all__ = ["celery_app"]
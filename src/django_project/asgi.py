@@ -1,7 +1,13 @@
 import os
 
+from django.conf import settings
 from django.core.asgi import get_asgi_application
 
+from apps.common.warmup import warm_up
+
 os.environ.setdefault("DJANGO_SETTINGS_MODULE", "django_project.settings")
 
 application = get_asgi_application()
+
+if settings.WARM_UP_ON_STARTUP:
+    warm_up()
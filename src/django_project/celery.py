@@ -1,51 +1,60 @@
-import importlib
 import os
-import pkgutil
-from pathlib import Path
 
 from celery import Celery
+from celery.signals import (
+    before_task_publish,
+    celeryd_init,
+    task_postrun,
+    task_prerun,
+    worker_init,
+)
+
+from apps.common.db_routers import reset_replica_routing
+from apps.common.task_metrics import (
+    mark_published,
+    record_metrics,
+    start_measuring,
+)
+from apps.common.task_registry import LazyTaskRegistry
+from apps.common.task_routing import (
+    WORKER_PROFILE_OPTION,
+    apply_worker_profile,
+)
+from services.celery_tasks import TASK_MODULES
 
 # Set the default Django settings module for the 'celery' program.
 os.environ.setdefault("DJANGO_SETTINGS_MODULE", "django_project.settings")
 
-app = Celery("app")
+app = Celery(
+    "app",
+    tasks=LazyTaskRegistry(TASK_MODULES),
+    task_cls="services.celery_tasks.locking:LockingTask",
+)
 
 app.config_from_object("django.conf:settings", namespace="CELERY")
+app.user_options["worker"].add(WORKER_PROFILE_OPTION)
 
-# Load task modules from all registered Django apps.
-app.autodiscover_tasks()
-
-
-def discover_celery_tasks():
-    """
-    Custom function to discover and import all task modules
-    from services.celery_tasks
-    This replaces the autodiscover_tasks approach for custom folder structures.
-    """
-    try:
-        # Import the celery_tasks package
-        celery_tasks_package = importlib.import_module("services.celery_tasks")
-
-        # Get the package path
-        package_path = Path(celery_tasks_package.__file__).parent
-
-        # Discover all Python modules in the package
-        for _, module_name, is_pkg in pkgutil.iter_modules(
-            [str(package_path)]
-        ):
-            if not is_pkg and module_name != "__init__":
-                # Import each module to register tasks
-                importlib.import_module(f"services.celery_tasks.{module_name}")
-                print(
-                    "✓ Discovered tasks from: "
-                    f"services.celery_tasks.{module_name}"
-                )
-
-    except ImportError as e:
-        print(f"Warning: Could not import services.celery_tasks package: {e}")
-    except Exception as e:
-        print(f"Error during task discovery: {e}")
-
-
-# Discover custom tasks from celery_tasks folder
-discover_celery_tasks()
+
+@task_prerun.connect
+def reset_database_routing(**kwargs):
+    """Starts every task with reads routed to the read replicas."""
+    reset_replica_routing()
+
+
+@celeryd_init.connect
+def remember_worker_options(instance, options, **kwargs):
+    instance.worker_options = options
+
+
+@worker_init.connect
+def set_up_worker_profile(sender, **kwargs):
+    """Applies worker profile given by --profile option."""
+    options = getattr(sender, "worker_options", {})
+    if options.get("profile"):
+        apply_worker_profile(sender, options["profile"], options)
+
+
+# queue wait, runtime, state and memory growth metrics of all the tasks
+before_task_publish.connect(mark_published)
+task_prerun.connect(start_measuring)
+task_postrun.connect(record_metrics)
@@ -1,3 +1,4 @@
+import time
 import tomllib
 from pathlib import Path
 
@@ -35,8 +36,8 @@ ENVIRONMENT = config["base"]["environment"]
 if ENVIRONMENT not in SUPPORTED_ENVIRONMENTS:
     raise ValueError(f"Unsupported environment: ENVIRONMENT={ENVIRONMENT}")
 
-# including setting components
-settings_include(
+# setting components, included in the given order
+SETTINGS_COMPONENTS = [
     "common.py",
     "installed_apps.py",
     "auth.py",
@@ -52,4 +53,14 @@ settings_include(
     "sentry.py",
     "oauth2.py",
     optional("local_settings.py"),
-)
+]
+
+# time spent on including every setting component in seconds,
+# see `profile_startup` management command
+SETTINGS_COMPONENT_TIMES = {}
+
+for _component in SETTINGS_COMPONENTS:
+    _start = time.perf_counter()
+    settings_include(_component, scope=globals())
+    SETTINGS_COMPONENT_TIMES[str(_component)] = time.perf_counter() - _start
+del _component, _start
@@ -5,4 +5,7 @@ AUTHENTICATION_BACKENDS = [
     "oauth2_provider.backends.OAuth2Backend",
 ]
 
+# authenticated by the API operations, see `services.api.auth.AuthBearer`
+OAUTH2_TOKEN_MIDDLEWARE_EXCLUDED_PATHS = ["/api/"]
+
 SESSION_ENGINE = "django.contrib.sessions.backends.cache"
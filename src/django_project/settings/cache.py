@@ -4,3 +4,18 @@ CACHES = {
         "LOCATION": config["cache"]["location"],
     }
 }
+
+# Redis for the data shared by all the processes, which should not be evicted
+# like the cache, see `apps.common.redis_client`
+REDIS_URL = config["redis"]["location"]
+
+# requests per period per scope, see `apps.common.rate_limits`
+RATE_LIMITS_ENABLED = config["rate_limits"]["enabled"]
+RATE_LIMITS = config["rate_limits"]["rates"]
+
+# responses of requests with `Idempotency-Key` header are stored for TTL,
+# duplicates wait for the first request within the wait timeout,
+# see `apps.common.idempotency`, all in seconds
+IDEMPOTENCY_TTL = config["idempotency"]["ttl"]
+IDEMPOTENCY_LOCK_TIMEOUT = config["idempotency"]["lock_timeout"]
+IDEMPOTENCY_WAIT_TIMEOUT = config["idempotency"]["wait_timeout"]
@@ -1,3 +1,5 @@
+from kombu import Queue
+
 CELERY_BROKER_URL = config["celery"]["broker_url"]
 CELERY_TIMEZONE = TIME_ZONE
 CELERY_TASK_TIME_LIMIT = config["celery"]["task_time_limit"]
@@ -8,10 +10,39 @@ CELERY_TASK_DEFAULT_EXCHANGE_TYPE = "direct"
 CELERY_BROKER_TRANSPORT_OPTIONS = {
     "visibility_timeout": config["celery"]["visibility_timeout"],
     "polling_interval": config["celery"]["polling_interval"],
+    # Redis broker emulates priorities with a list per priority step,
+    # 0 is the highest priority
+    "queue_order_strategy": "priority",
+    "priority_steps": list(range(10)),
+    "sep": ":",
 }
 
-CELERY_BEAT_SCHEDULE = {}
+CELERY_TASK_QUEUES = [
+    Queue(name, routing_key=name) for name in config["celery"]["queues"]
+]
+CELERY_TASK_DEFAULT_QUEUE = config["celery"]["default_queue"]
+CELERY_TASK_DEFAULT_PRIORITY = config["celery"]["default_priority"]
+CELERY_TASK_ROUTES = config["celery"]["routes"]
+# Queues, concurrency and prefetch multiplier of workers by profile name,
+# see apps.common.task_routing
+CELERY_WORKER_PROFILES = config["celery"]["worker_profiles"]
+
+CELERY_BEAT_SCHEDULE = {
+    # flushes of the calls left buffered, see services.celery_tasks.batching
+    "flush-stale-batches": {
+        "task": "batching.flush_stale",
+        "schedule": 60,
+    },
+    "cleanup-partial-uploads": {
+        "task": "uploads.cleanup_partial",
+        "schedule": 60 * 60,
+    },
+    "cleanup-image-variants": {
+        "task": "images.cleanup_variants",
+        "schedule": 24 * 60 * 60,
+    },
+}
 
-# Task autodiscovery is handled in django_project/celery.py
-# No need to manually list imports - discover_celery_tasks() handles this automatically
+# Task modules are imported lazily, see django_project/celery.py
 CELERY_IMPORTS = []
+CELERY_WORKER_CONSUMER = "apps.common.task_registry:LazyConsumer"
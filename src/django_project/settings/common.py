@@ -10,18 +10,48 @@ ALLOWED_HOSTS = config["base"]["allowed_hosts"]
 
 CSRF_TRUSTED_ORIGINS = config["base"]["csrf_trusted_origins"]
 
+# building URL resolvers, API schemas and templates on process start,
+# see `apps.common.warmup`
+WARM_UP_ON_STARTUP = config["base"]["warm_up_on_startup"]
+
+# maximum time of Django setup and Celery bootstrap in seconds,
+# see `profile_startup` management command
+STARTUP_TIME_BUDGET = config["base"]["startup_time_budget"]
+
 # Middleware configuration
 MIDDLEWARE = [
+    "apps.common.middleware.FirstRequestLatencyMiddleware",
     "django.middleware.security.SecurityMiddleware",
+    "apps.common.middleware.CompressionMiddleware",
+    "apps.common.middleware.ReplicaRoutingMiddleware",
+    "apps.common.middleware.QueryInstrumentationMiddleware",
     "django.contrib.sessions.middleware.SessionMiddleware",
     "django.middleware.common.CommonMiddleware",
     "django.middleware.csrf.CsrfViewMiddleware",
     "django.contrib.auth.middleware.AuthenticationMiddleware",
-    "oauth2_provider.middleware.OAuth2TokenMiddleware",
+    "apps.common.middleware.OAuth2TokenMiddleware",
     "django.contrib.messages.middleware.MessageMiddleware",
     "django.middleware.clickjacking.XFrameOptionsMiddleware",
 ]
 
+# response compression, see `apps.common.middleware.CompressionMiddleware`
+COMPRESSION_MIN_SIZE = config["compression"]["min_size"]
+COMPRESSION_GZIP_LEVEL = config["compression"]["gzip_level"]
+COMPRESSION_BROTLI_LEVEL = config["compression"]["brotli_level"]
+# already compressed content types, matched by prefix
+COMPRESSION_EXCLUDED_CONTENT_TYPES = [
+    "image/",
+    "video/",
+    "audio/",
+    "font/woff",
+    "application/zip",
+    "application/gzip",
+    "application/x-gzip",
+    "application/x-brotli",
+    "application/x-7z-compressed",
+    "application/pdf",
+]
+
 TEMPLATES = [
     {
         "BACKEND": "django.template.backends.django.DjangoTemplates",
@@ -9,3 +9,20 @@ DATABASES = {
         "ATOMIC_REQUESTS": True,
     }
 }
+
+# read replicas share the primary database settings, any of them could be
+# overridden in the config, e.g. `replicas = [{host = "replica-1"}]`
+DATABASE_REPLICAS = []
+
+for number, replica in enumerate(config["database"]["replicas"], start=1):
+    alias = f"replica_{number}"
+    DATABASES[alias] = {
+        **DATABASES["default"],
+        **{key.upper(): value for key, value in replica.items()},
+        # replicas are read outside of transactions, see ReplicaRouter
+        "ATOMIC_REQUESTS": False,
+        "TEST": {"MIRROR": "default"},
+    }
+    DATABASE_REPLICAS.append(alias)
+
+DATABASE_ROUTERS = ["apps.common.db_routers.ReplicaRouter"]
@@ -8,5 +8,6 @@ INSTALLED_APPS = [
     # 3rd party apps
     "oauth2_provider",
     # project apps
+    "apps.common",
     "apps.users",
 ]
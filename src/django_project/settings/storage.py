@@ -8,7 +8,35 @@ STATICFILES_DIRS = [
 MEDIA_ROOT = config["storage"]["media_root"]
 STATIC_ROOT = config["storage"]["static_root"]
 
-# there should be listed all paths which used in project
+STORAGES = {
+    "default": {
+        "BACKEND": "django.core.files.storage.FileSystemStorage",
+    },
+    "staticfiles": {
+        "BACKEND": "django.contrib.staticfiles.storage.StaticFilesStorage",
+    },
+    # deduplicated files, see apps.common.storages.ContentAddressedStorage
+    "blobs": {
+        "BACKEND": "apps.common.storages.ContentAddressedStorage",
+    },
+}
+
+# there should be listed all paths which used in project, files of the
+# folder are put into `shard_depth` levels of directories named by the hash
+# of the file name, see `manage.py reshard_files` after changing it
 FILE_FOLDERS = {
-    # "avatars": Path("users/avatars"),
+    # "avatars": {"path": Path("users/avatars"), "shard_depth": 2},
 }
+
+# resumable uploads, see services.api.mobile.uploads
+UPLOAD_MAX_SIZE = config["uploads"]["max_size"]
+UPLOAD_CHUNK_SIZE = config["uploads"]["chunk_size"]
+UPLOAD_TTL = config["uploads"]["ttl"]
+UPLOAD_LOCK_TIMEOUT = config["uploads"]["lock_timeout"]
+
+# image variants, see apps.common.services.image_derivatives
+IMAGE_PROCESSES = config["images"]["processes"]
+IMAGE_VARIANTS = config["images"]["variants"]
+IMAGE_MAX_SIZE = config["images"]["max_size"]
+IMAGE_MAX_PIXELS = config["images"]["max_pixels"]
+IMAGE_CACHE_TTL = config["images"]["cache_ttl"]
@@ -7,3 +7,4 @@ if "test" in sys.argv:
             "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
         }
     }
+    RATE_LIMITS_ENABLED = False
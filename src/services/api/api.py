@@ -1,8 +1,10 @@
 from django.contrib.admin.views.decorators import staff_member_required
-from ninja import NinjaAPI
 from ninja.errors import ValidationError
 
 from services.api.auth import AuthBearer
+from services.api.common.api import NinjaAPI
+from services.api.common.renderers import ORJSONParser, ORJSONRenderer
+from services.api.common.throttling import RateLimitThrottle
 from services.api.mobile.endpoints import router as mobile_api
 
 # Create the main API instance
@@ -13,6 +15,9 @@ api = NinjaAPI(
     csrf=False,
     docs_decorator=staff_member_required,
     auth=AuthBearer(),
+    throttle=RateLimitThrottle("api", key="user"),
+    renderer=ORJSONRenderer(),
+    parser=ORJSONParser(),
 )
 
 
@@ -1,18 +1,29 @@
+import hashlib
+
 from django.core.exceptions import SuspiciousOperation
 from django.http import HttpRequest
 from ninja.security import HttpBearer
+from oauth2_provider.models import get_access_token_model
 from oauth2_provider.oauth2_backends import get_oauthlib_core
 
+from apps.common.db_routers import use_primary_database
+
 
 class AuthBearer(HttpBearer):
 
     def authenticate(self, request: HttpRequest, token: str):
         if request is None:
             return None
+        # sub-requests of a batch reuse authentication of the batch request
+        if hasattr(request, "batch_auth"):
+            return request.batch_auth
         oauthlib_core = get_oauthlib_core()
 
         try:
-            valid, r = oauthlib_core.verify_request(request, scopes=[])
+            # tokens are looked up on the primary database, since a token
+            # could be issued right before and is not replicated yet
+            with use_primary_database():
+                valid, r = oauthlib_core.verify_request(request, scopes=[])
         except ValueError as error:
             if str(error) == "Invalid hex encoding in query string.":
                 raise SuspiciousOperation(error)
@@ -22,3 +33,32 @@ class AuthBearer(HttpBearer):
                 return r.user, r.access_token
         request.oauth2_error = getattr(r, "oauth2_error", {})
         return None
+
+
+class AsyncAuthBearer(HttpBearer):
+    """
+    Async version of `AuthBearer` for async operations, the access token is
+    looked up by the async ORM instead of blocking the event loop.
+
+    It mirrors bearer token validation of django-oauth-toolkit: the token
+    should exist and should not be expired.
+    """
+
+    async def authenticate(self, request: HttpRequest, token: str):
+        if request is None:
+            return None
+        if hasattr(request, "batch_auth"):
+            return request.batch_auth
+
+        token_checksum = hashlib.sha256(token.encode("utf-8")).hexdigest()
+        with use_primary_database():
+            access_token = await (
+                get_access_token_model()
+                .objects.select_related("application", "user")
+                .filter(token_checksum=token_checksum)
+                .afirst()
+            )
+        if access_token is None or not access_token.is_valid(scopes=[]):
+            request.oauth2_error = {}
+            return None
+        return access_token.user, access_token
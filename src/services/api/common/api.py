@@ -0,0 +1,55 @@
+import math
+
+import ninja
+from django.views.decorators.vary import vary_on_headers
+from ninja.errors import Throttled
+
+from services.api.common.idempotency import idempotent_operation
+from services.api.common.queries import instrument_operation
+from services.api.common.throttling import async_throttled_operation
+from services.api.common.transactions import atomic_operation, non_atomic_url
+
+
+class NinjaAPI(ninja.NinjaAPI):
+    """
+    NinjaAPI which handles `ATOMIC_REQUESTS` per operation instead of per
+    Django view.
+
+    Ninja serves all the operations of a path by a single Django view, so
+    there is no way to exclude only some of them from the request transaction.
+    Operations marked as read-only run in autocommit mode, the others keep
+    their atomicity.
+
+    SQL queries of every operation are collected, see `instrument_operation`.
+    Throttles of async operations don't block the event loop, see
+    `async_throttled_operation`.
+
+    POST operations support `Idempotency-Key` header, see
+    `idempotent_operation`. Throttled requests get `Retry-After` header.
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.add_exception_handler(Throttled, self._throttled)
+
+    def _throttled(self, request, exc: Throttled):
+        response = self.create_response(
+            request, {"detail": str(exc)}, status=429
+        )
+        if exc.wait is not None:
+            response["Retry-After"] = str(max(1, math.ceil(exc.wait)))
+        return response
+
+    def _get_urls(self):
+        for _, router in self._routers:
+            for path_view in router.path_operations.values():
+                for operation in path_view.operations:
+                    atomic_operation(operation)
+                    instrument_operation(operation)
+                    idempotent_operation(operation)
+                    async_throttled_operation(operation)
+        urls = super()._get_urls()
+        for url in urls:
+            # responses depend on the bearer token, see `AuthBearer`
+            url.callback = vary_on_headers("Authorization")(url.callback)
+        return [non_atomic_url(url) for url in urls]
@@ -0,0 +1,108 @@
+from functools import wraps
+from inspect import isawaitable, iscoroutinefunction
+from typing import Callable, Optional
+
+from django.utils.cache import get_conditional_response, quote_etag
+from django.utils.http import http_date
+from ninja.operation import Operation
+from ninja.utils import contribute_operation_callback
+
+
+def conditional(
+    etag_func: Optional[Callable] = None,
+    last_modified_func: Optional[Callable] = None,
+) -> Callable:
+    """
+    Adds ETag and Last-Modified support to Ninja operation, it's an analogue of
+    `django.views.decorators.http.condition` for Ninja.
+
+    The validators are calculated from the request after authentication, so
+    they could depend on `request.auth`. If the client already has the actual
+    data, 304 response is returned without executing the operation and
+    serializing its result.
+
+    The decorator should be placed below the router one. Async operations
+    could use async validators, e.g. `aauth_user_etag` of the users API.
+
+    Example of usage:
+        >>> @router.get("me", response=UserResponse)
+        ... @conditional(etag_func=user_etag)
+        ... def get_me(request):
+        ...     ...
+    """
+
+    def decorator(view_func: Callable) -> Callable:
+        def get_response(request, etag, last_modified):
+            etag = etag and quote_etag(etag)
+            request.conditional_validators = etag, last_modified
+            return get_conditional_response(
+                request,
+                etag=etag,
+                last_modified=last_modified and int(last_modified.timestamp()),
+            )
+
+        if iscoroutinefunction(view_func):
+
+            @wraps(view_func)
+            async def wrapper(request, *args, **kwargs):
+                etag = etag_func and await _await(etag_func(request))
+                last_modified = last_modified_func and await _await(
+                    last_modified_func(request)
+                )
+                response = get_response(request, etag, last_modified)
+                if response is not None:
+                    return response
+                return await view_func(request, *args, **kwargs)
+
+        else:
+
+            @wraps(view_func)
+            def wrapper(request, *args, **kwargs):
+                etag = etag_func and etag_func(request)
+                last_modified = last_modified_func and last_modified_func(
+                    request
+                )
+                response = get_response(request, etag, last_modified)
+                if response is not None:
+                    return response
+                return view_func(request, *args, **kwargs)
+
+        contribute_operation_callback(wrapper, _set_validator_headers)
+        return wrapper
+
+    return decorator
+
+
+async def _await(value):
+    if isawaitable(value):
+        return await value
+    return value
+
+
+def _set_validator_headers(operation: Operation) -> None:
+    run = operation.run
+
+    def set_headers(request, response):
+        etag, last_modified = getattr(
+            request, "conditional_validators", (None, None)
+        )
+        if etag and not response.has_header("ETag"):
+            response["ETag"] = etag
+        if last_modified and not response.has_header("Last-Modified"):
+            response["Last-Modified"] = http_date(last_modified.timestamp())
+        return response
+
+    # the callback is called before AsyncOperation sets `is_async`
+    if iscoroutinefunction(run):
+
+        @wraps(run)
+        async def wrapper(request, *args, **kwargs):
+            return set_headers(request, await run(request, *args, **kwargs))
+
+    else:
+
+        @wraps(run)
+        def wrapper(request, *args, **kwargs):
+            return set_headers(request, run(request, *args, **kwargs))
+
+    operation.run = wrapper
@@ -0,0 +1,166 @@
+from functools import wraps
+from inspect import iscoroutinefunction
+from typing import Callable, Optional
+
+from django.db.models import QuerySet
+from django.http import HttpResponseBase
+from ninja import Query
+from ninja.errors import HttpError
+from ninja.operation import Operation
+from ninja.utils import (
+    contribute_operation_args,
+    contribute_operation_callback,
+)
+
+from services.api.common.schemas import CamelCaseModel
+
+FIELDS_PARAM = "fields"
+
+
+def parse_fields(
+    value: Optional[str], schema: type[CamelCaseModel]
+) -> Optional[frozenset[str]]:
+    """
+    Returns names of the schema fields listed in comma separated `fields`
+    parameter, e.g. `id,firstName`, or None if all the fields are requested.
+    Raises ValueError for unknown fields.
+    """
+    if not value:
+        return None
+    return schema.resolve_field_names(
+        field.strip() for field in value.split(",") if field.strip()
+    )
+
+
+def only_fields(queryset: QuerySet, fields: Optional[frozenset[str]]):
+    """
+    Limits columns loaded by the queryset to the requested model fields,
+    the primary key is always loaded.
+
+    Example of usage:
+        >>> users = only_fields(User.objects.all(), request.sparse_fields)
+    """
+    if not fields:
+        return queryset
+    model_fields = {
+        field.name for field in queryset.model._meta.concrete_fields
+    }
+    return queryset.only(*(fields & model_fields))
+
+
+def sparse_fieldset(schema: type[CamelCaseModel]) -> Callable:
+    """
+    Adds `fields` query parameter to Ninja operation, the response contains
+    the requested fields of the schema only.
+
+    The requested fields are available as `request.sparse_fields`, so the
+    operation could load the needed columns only, see `only_fields`.
+
+    The decorator should be placed below the router one, it supports async
+    operations as well. QuerySet results of async operations should be
+    evaluated by the operation itself. Results could be returned along with
+    the status code, e.g. `return 201, user`, the same as Ninja ones.
+
+    Example of usage:
+        >>> @router.get("users", response=list[UserResponse])
+        ... @sparse_fieldset(UserResponse)
+        ... def get_users(request):
+        ...     return only_fields(User.objects.all(), request.sparse_fields)
+    """
+
+    def decorator(view_func: Callable) -> Callable:
+        if iscoroutinefunction(view_func):
+
+            @wraps(view_func)
+            async def wrapper(request, *args, **kwargs):
+                fields = _set_sparse_fields(request, schema, kwargs)
+                result = await view_func(request, *args, **kwargs)
+                return _render(request, schema, fields, result)
+
+        else:
+
+            @wraps(view_func)
+            def wrapper(request, *args, **kwargs):
+                fields = _set_sparse_fields(request, schema, kwargs)
+                result = view_func(request, *args, **kwargs)
+                return _render(request, schema, fields, result)
+
+        contribute_operation_args(
+            wrapper,
+            FIELDS_PARAM,
+            Optional[str],
+            Query(
+                None,
+                description=(
+                    "Comma separated fields of the response, e.g. "
+                    "`id,firstName`. All the fields are returned by default."
+                ),
+            ),
+        )
+        contribute_operation_callback(wrapper, _bind_operation)
+        return wrapper
+
+    return decorator
+
+
+def _bind_operation(operation: Operation) -> None:
+    # the same view could be registered by several routes, so the operation
+    # rendering the response is passed by the request
+    run = operation.run
+
+    # the callback is called before AsyncOperation sets `is_async`
+    if iscoroutinefunction(run):
+
+        @wraps(run)
+        async def wrapper(request, *args, **kwargs):
+            request.sparse_fieldset_operation = operation
+            return await run(request, *args, **kwargs)
+
+    else:
+
+        @wraps(run)
+        def wrapper(request, *args, **kwargs):
+            request.sparse_fieldset_operation = operation
+            return run(request, *args, **kwargs)
+
+    operation.run = wrapper
+
+
+def _set_sparse_fields(
+    request, schema: type[CamelCaseModel], kwargs: dict
+) -> Optional[frozenset[str]]:
+    try:
+        fields = parse_fields(kwargs.pop(FIELDS_PARAM, None), schema)
+    except ValueError as error:
+        raise HttpError(400, str(error))
+    request.sparse_fields = fields
+    return fields
+
+
+def _render(request, schema, fields, result):
+    if fields is None or isinstance(result, HttpResponseBase):
+        return result
+    operation = request.sparse_fieldset_operation
+
+    # the same protocol as the one of Ninja operations
+    status = 200
+    if len(operation.response_models) == 1:
+        status = next(iter(operation.response_models))
+    if isinstance(result, tuple) and len(result) == 2:
+        status, result = result
+
+    subset = schema.subset(fields)
+    if isinstance(result, (list, tuple, QuerySet)):
+        data = [_dump(subset, item, operation) for item in result]
+    else:
+        data = _dump(subset, result, operation)
+    return operation.api.create_response(request, data, status=status)
+
+
+def _dump(subset: type[CamelCaseModel], obj, operation) -> dict:
+    return subset.model_validate(obj).model_dump(
+        by_alias=operation.by_alias,
+        exclude_unset=operation.exclude_unset,
+        exclude_defaults=operation.exclude_defaults,
+        exclude_none=operation.exclude_none,
+    )
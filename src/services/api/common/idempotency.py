@@ -0,0 +1,21 @@
+from ninja.operation import Operation
+
+from apps.common.idempotency import idempotent
+
+
+def idempotent_operation(operation: Operation) -> None:
+    """
+    Adds `Idempotency-Key` support to POST operation, see
+    `apps.common.idempotency.idempotent`.
+
+    It should wrap the operation transaction, so only the committed results
+    are stored. Async operations are skipped.
+    """
+    if (
+        operation.is_async
+        or "POST" not in operation.methods
+        or getattr(operation.run, "_idempotent_operation", False)
+    ):
+        return
+    operation.run = idempotent(operation.run)
+    operation.run._idempotent_operation = True
@@ -0,0 +1,98 @@
+import logging
+from contextlib import ExitStack
+from functools import wraps
+from typing import Callable, Optional
+
+from asgiref.sync import sync_to_async
+from ninja.operation import Operation
+
+from apps.common.queries import collect_queries
+
+logger = logging.getLogger(__name__)
+
+
+def query_budget(max_queries: int) -> Callable:
+    """
+    Declares maximum number of SQL queries the Ninja operation is allowed to
+    execute, authentication included. Exceeding the budget is logged and
+    fails the tests using `QueryBudgetTestMixin`.
+
+    Example of usage:
+        >>> @router.get("me", response=UserResponse)
+        ... @query_budget(1)
+        ... def get_me(request):
+        ...     ...
+    """
+
+    def decorator(view_func: Callable) -> Callable:
+        view_func._query_budget = max_queries
+        return view_func
+
+    return decorator
+
+
+def get_query_budget(view_func: Callable) -> Optional[int]:
+    return getattr(view_func, "_query_budget", None)
+
+
+def _record(request, name: str, stats, budget: Optional[int]) -> None:
+    request.operation_query_stats = stats
+    request.operation_query_budget = budget
+
+    if budget is not None and stats.count > budget:
+        logger.warning(
+            "%s exceeded query budget: %s > %s", name, stats.count, budget
+        )
+    if stats.identical_queries:
+        logger.warning(
+            "%s executed identical queries: %s",
+            name,
+            stats.identical_queries,
+        )
+
+
+def instrument_operation(operation: Operation) -> None:
+    """
+    Collects SQL queries executed by the operation and stores them along
+    with the declared budget in `request.operation_query_stats` and
+    `request.operation_query_budget`.
+
+    Queries of async operation are executed by the sync thread of the
+    request (see `asgiref.sync.ThreadSensitiveContext`), so they are
+    collected through the connections of that thread.
+    """
+    if getattr(operation.run, "_instrumented", False):
+        return
+    run = operation.run
+    name = operation.view_func.__qualname__
+
+    if operation.is_async:
+
+        @wraps(run)
+        async def wrapper(request, *args, **kwargs):
+            collecting = ExitStack()
+            stats = await sync_to_async(collecting.enter_context)(
+                collect_queries()
+            )
+            try:
+                response = await run(request, *args, **kwargs)
+            finally:
+                await sync_to_async(collecting.close)()
+            _record(
+                request, name, stats, get_query_budget(operation.view_func)
+            )
+            return response
+
+    else:
+
+        @wraps(run)
+        def wrapper(request, *args, **kwargs):
+            with collect_queries() as stats:
+                response = run(request, *args, **kwargs)
+            _record(
+                request, name, stats, get_query_budget(operation.view_func)
+            )
+            return response
+
+    wrapper._instrumented = True
+    operation.run = wrapper
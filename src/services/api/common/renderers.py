@@ -0,0 +1,31 @@
+import orjson
+from ninja.parser import Parser
+from ninja.renderers import BaseRenderer
+from ninja.responses import NinjaJSONEncoder
+
+
+class ORJSONRenderer(BaseRenderer):
+    """
+    Ninja renderer based on orjson.
+
+    Datetimes and types unsupported by orjson (e.g. Decimal) are passed to
+    `NinjaJSONEncoder`, so they are formatted the same way as by the default
+    renderer. The output differs only in whitespaces and not escaped non-ASCII
+    characters.
+    """
+
+    media_type = "application/json"
+    option = orjson.OPT_PASSTHROUGH_DATETIME | orjson.OPT_NON_STR_KEYS
+    encoder = NinjaJSONEncoder()
+
+    def render(self, request, data, *, response_status):
+        return orjson.dumps(
+            data, default=self.encoder.default, option=self.option
+        )
+
+
+class ORJSONParser(Parser):
+    """Ninja request body parser based on orjson."""
+
+    def parse_body(self, request):
+        return orjson.loads(request.body)
@@ -0,0 +1,22 @@
+import ninja
+
+from services.api.common.transactions import read_only
+
+
+class Router(ninja.Router):
+    """
+    Ninja router with project specific flags.
+
+    Args:
+        read_only: marks all the router operations as read-only, so they are
+            executed in autocommit mode (see `transactions.read_only`)
+    """
+
+    def __init__(self, *, read_only: bool = False, **kwargs):
+        super().__init__(**kwargs)
+        self.read_only = read_only
+
+    def add_api_operation(self, path, methods, view_func, **kwargs):
+        if self.read_only:
+            read_only(view_func)
+        super().add_api_operation(path, methods, view_func, **kwargs)
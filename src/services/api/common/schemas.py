@@ -1,5 +1,8 @@
+from functools import lru_cache
+from typing import Iterable
+
 from ninja import Schema
-from pydantic import ConfigDict, alias_generators
+from pydantic import ConfigDict, alias_generators, create_model
 
 
 class CamelCaseModel(Schema):
@@ -7,3 +10,44 @@ class CamelCaseModel(Schema):
         populate_by_name=True,
         alias_generator=alias_generators.to_camel,
     )
+
+    @classmethod
+    def subset(cls, fields: Iterable[str]) -> type["CamelCaseModel"]:
+        """
+        Returns model having the given fields only, the fields could be
+        referenced either by names or by aliases.
+
+        Models are cached per fields combination, so they are not created on
+        every request. Validators of the original model are not inherited.
+        """
+        return _create_subset(cls, cls.resolve_field_names(fields))
+
+    @classmethod
+    def resolve_field_names(cls, fields: Iterable[str]) -> frozenset[str]:
+        aliases = {
+            field.alias: name
+            for name, field in cls.model_fields.items()
+            if field.alias
+        }
+        names = set()
+        for field in fields:
+            name = aliases.get(field, field)
+            if name not in cls.model_fields:
+                raise ValueError(f"Unknown field: {field}")
+            names.add(name)
+        return frozenset(names)
+
+
+@lru_cache(maxsize=1024)
+def _create_subset(
+    model: type[CamelCaseModel], fields: frozenset[str]
+) -> type[CamelCaseModel]:
+    return create_model(
+        f"{model.__name__}Subset",
+        __base__=CamelCaseModel,
+        **{
+            name: (model.model_fields[name].annotation, field)
+            for name, field in model.model_fields.items()
+            if name in fields
+        },
+    )
@@ -0,0 +1,29 @@
+class QueryBudgetTestMixin:
+    """
+    TestCase mixin checking SQL queries executed by Ninja operations against
+    the budget declared with `query_budget`.
+    """
+
+    def assertWithinQueryBudget(self, response):
+        request = response.wsgi_request
+        stats = getattr(request, "operation_query_stats", None)
+        if stats is None:
+            self.fail(f"{request.path} is not handled by a Ninja operation")
+
+        budget = request.operation_query_budget
+        if budget is None:
+            self.fail(f"{request.path} does not declare query budget")
+
+        queries = "\n".join(
+            f"{count} x {sql}" for sql, count in stats.shapes.items()
+        )
+        if stats.count > budget:
+            self.fail(
+                f"{request.path} executed {stats.count} queries, "
+                f"budget is {budget}:\n{queries}"
+            )
+        if stats.identical_queries:
+            self.fail(
+                f"{request.path} executed identical queries:\n"
+                + "\n".join(stats.identical_queries)
+            )
@@ -0,0 +1,76 @@
+import threading
+from typing import Optional
+
+from asgiref.sync import sync_to_async
+from ninja.errors import Throttled
+from ninja.operation import Operation
+from ninja.throttling import BaseThrottle
+
+from apps.common.rate_limits import KEY_USER, RateLimit, check_rate_limits
+
+
+class RateLimitThrottle(BaseThrottle):
+    """
+    Ninja throttle backed by Redis rate limit, see
+    `apps.common.rate_limits.RateLimit`. It could be attached to the API,
+    a router or an operation, all the operations it's attached to share the
+    same limit.
+
+    Example of usage:
+        >>> router = Router(throttle=RateLimitThrottle("users", key="user"))
+    """
+
+    def __init__(
+        self, scope: str, key: str = KEY_USER, rate: Optional[str] = None
+    ):
+        self.limit = RateLimit(scope, key=key, rate=rate)
+        # throttles are shared by the threads serving requests
+        self._local = threading.local()
+
+    def allow_request(self, request) -> bool:
+        self._local.wait = check_rate_limits(request, [self.limit])
+        return self._local.wait is None
+
+    def wait(self) -> Optional[float]:
+        return getattr(self._local, "wait", None)
+
+
+def _check_throttle(throttle: BaseThrottle, request) -> tuple:
+    # the wait is read by the same thread, throttles keep it thread local
+    return throttle.allow_request(request), throttle.wait()
+
+
+def async_throttled_operation(operation: Operation) -> None:
+    """
+    Checks throttles of async operation in a worker thread. Ninja calls them
+    synchronously, so Redis round trip of `RateLimitThrottle` would block
+    the event loop. Sync operations are skipped.
+    """
+    if not operation.is_async or getattr(operation, "_async_throttled", False):
+        return
+    run_checks = operation._run_checks
+    check_throttle = sync_to_async(_check_throttle, thread_sensitive=False)
+
+    async def _run_checks(request):
+        error = await run_checks(request)
+        if error or not operation.throttle_objects:
+            return error
+
+        denied = False
+        durations = []
+        for throttle in operation.throttle_objects:
+            allowed, wait = await check_throttle(throttle, request)
+            if not allowed:
+                denied = True
+                if wait is not None:
+                    durations.append(wait)
+        if denied:
+            return operation.api.on_exception(
+                request, Throttled(wait=max(durations, default=None))
+            )
+        return None
+
+    # throttles are checked once the authentication and CSRF checks pass
+    operation._check_throttles = lambda request: None
+    operation._run_checks = _run_checks
+    operation._async_throttled = True
@@ -0,0 +1,89 @@
+from asyncio import iscoroutinefunction
+from contextlib import ExitStack
+from functools import wraps
+from typing import Callable
+
+from django.db import connections, transaction
+from django.urls import URLPattern
+from ninja.operation import Operation
+
+
+def read_only(view_func: Callable) -> Callable:
+    """
+    Marks Ninja operation as read-only, so it's executed in autocommit mode
+    instead of being wrapped into a transaction by `ATOMIC_REQUESTS`.
+
+    The decorator could be placed either above or below the router one.
+
+    Example of usage:
+        >>> @router.get("me", response=UserResponse)
+        ... @read_only
+        ... def get_me(request):
+        ...     ...
+    """
+    view_func._read_only = True
+    return view_func
+
+
+def is_read_only(view_func: Callable) -> bool:
+    return getattr(view_func, "_read_only", False)
+
+
+def get_atomic_requests_aliases() -> list[str]:
+    """Returns aliases of databases with enabled `ATOMIC_REQUESTS`."""
+    return [
+        alias
+        for alias, settings_dict in connections.settings.items()
+        if settings_dict["ATOMIC_REQUESTS"]
+    ]
+
+
+def atomic_operation(operation: Operation) -> None:
+    """
+    Wraps operation execution into a transaction for every database with
+    enabled `ATOMIC_REQUESTS`, unless the operation is marked as read-only.
+
+    Async operations are skipped, because transactions are not supported in
+    async code.
+    """
+    if operation.is_async or getattr(
+        operation.run, "_atomic_operation", False
+    ):
+        return
+    run = operation.run
+
+    @wraps(run)
+    def wrapper(request, *args, **kwargs):
+        if is_read_only(operation.view_func):
+            return run(request, *args, **kwargs)
+        with ExitStack() as stack:
+            for alias in get_atomic_requests_aliases():
+                stack.enter_context(transaction.atomic(using=alias))
+            return run(request, *args, **kwargs)
+
+    wrapper._atomic_operation = True
+    operation.run = wrapper
+
+
+def non_atomic_url(url: URLPattern) -> URLPattern:
+    """
+    Excludes URL view from `ATOMIC_REQUESTS` handling, the transactions are
+    managed by single operations instead (see `atomic_operation`).
+    """
+    view = url.callback
+
+    if iscoroutinefunction(view):
+
+        @wraps(view)
+        async def wrapper(request, *args, **kwargs):
+            return await view(request, *args, **kwargs)
+
+    else:
+
+        @wraps(view)
+        def wrapper(request, *args, **kwargs):
+            return view(request, *args, **kwargs)
+
+    wrapper._non_atomic_requests = set(get_atomic_requests_aliases())
+    url.callback = wrapper
+    return url
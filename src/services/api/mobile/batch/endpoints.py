@@ -0,0 +1,14 @@
+from services.api.common.routers import Router
+from services.api.common.transactions import read_only
+from services.api.mobile.batch.schemas import BatchRequest, BatchResponse
+from services.api.mobile.batch.services.batch import BatchService
+
+router = Router()
+
+
+@router.post("", response=BatchResponse)
+@read_only
+def batch(request, payload: BatchRequest) -> BatchResponse:
+    service = BatchService()
+    responses = service.execute(request, payload)
+    return BatchResponse(responses=responses)
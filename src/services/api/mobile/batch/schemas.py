@@ -0,0 +1,31 @@
+from typing import Any, Literal
+
+from pydantic import Field
+
+from services.api.common.schemas import CamelCaseModel
+
+MAX_BATCH_SIZE = 20
+
+
+class BatchSubRequest(CamelCaseModel):
+    method: Literal["GET", "POST", "PUT", "PATCH", "DELETE"] = "GET"
+    path: str
+    headers: dict[str, str] = {}
+    body: Any = None
+
+
+class BatchRequest(CamelCaseModel):
+    requests: list[BatchSubRequest] = Field(
+        min_length=1, max_length=MAX_BATCH_SIZE
+    )
+    parallel: bool = False
+
+
+class BatchSubResponse(CamelCaseModel):
+    status: int
+    headers: dict[str, str]
+    body: Any = None
+
+
+class BatchResponse(CamelCaseModel):
+    responses: list[BatchSubResponse]
@@ -0,0 +1,147 @@
+import contextvars
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from inspect import iscoroutinefunction
+from urllib.parse import urlsplit
+
+import orjson
+from asgiref.sync import async_to_sync
+from django.db import connections
+from django.http import HttpRequest, QueryDict
+from django.urls import Resolver404, resolve
+
+from services.api.mobile.batch.schemas import BatchRequest, BatchSubRequest
+
+logger = logging.getLogger(__name__)
+
+# request headers shared by all the sub-requests
+SHARED_HEADERS = (
+    "HTTP_AUTHORIZATION",
+    "HTTP_HOST",
+    "HTTP_USER_AGENT",
+    "HTTP_ACCEPT_LANGUAGE",
+)
+MAX_PARALLEL_REQUESTS = 5
+
+
+class BatchService:
+    """
+    Executes sub-requests of a batch by calling API views directly, without
+    network hop and middleware.
+
+    Sub-requests reuse authentication of the batch request (see
+    `AuthBearer`) and could address operations of the same API only.
+    Independent GET sub-requests could be executed in parallel threads.
+
+    A failed sub-request gets 500 status without affecting the others.
+    Streaming responses (e.g. file downloads) are not buffered into the batch
+    response, such sub-requests get 400 status.
+    """
+
+    def execute(self, request: HttpRequest, batch: BatchRequest) -> list:
+        if batch.parallel and all(
+            sub_request.method == "GET" for sub_request in batch.requests
+        ):
+            with ThreadPoolExecutor(MAX_PARALLEL_REQUESTS) as executor:
+                futures = [
+                    executor.submit(
+                        contextvars.copy_context().run,
+                        self._execute_in_thread,
+                        request,
+                        sub_request,
+                    )
+                    for sub_request in batch.requests
+                ]
+                return [future.result() for future in futures]
+        return [
+            self._execute_one(request, sub_request)
+            for sub_request in batch.requests
+        ]
+
+    def _execute_in_thread(self, request, sub_request):
+        try:
+            return self._execute_one(request, sub_request)
+        finally:
+            # worker threads have their own database connections
+            connections.close_all()
+
+    def _execute_one(self, request, sub_request: BatchSubRequest) -> dict:
+        url = urlsplit(sub_request.path)
+        try:
+            match = resolve(url.path)
+        except Resolver404:
+            return self._error(404, "Not found")
+        batch_match = request.resolver_match
+        if (
+            match.namespace != batch_match.namespace
+            or match.route == batch_match.route
+        ):
+            return self._error(400, "Path is not allowed in batch")
+
+        view = match.func
+        if iscoroutinefunction(view):
+            view = async_to_sync(view)
+        try:
+            response = view(
+                self._build_request(request, sub_request, url, match),
+                *match.args,
+                **match.kwargs,
+            )
+        except Exception:
+            logger.exception("Batch sub-request %s failed", url.path)
+            return self._error(500, "Internal server error")
+
+        # closing the response would send `request_finished` signal, which
+        # closes database connections in the middle of the batch
+        if response.streaming:
+            return self._error(
+                400, "Streaming response is not allowed in batch"
+            )
+        return {
+            "status": response.status_code,
+            "headers": dict(response.items()),
+            "body": self._parse_body(response),
+        }
+
+    def _build_request(self, request, sub_request, url, match) -> HttpRequest:
+        sub = HttpRequest()
+        sub.method = sub_request.method
+        sub.path = sub.path_info = url.path
+        sub.GET = QueryDict(url.query)
+        sub.META = {
+            key: value
+            for key, value in request.META.items()
+            if not key.startswith(("HTTP_", "CONTENT_"))
+            or key in SHARED_HEADERS
+        }
+        sub.META.update(
+            REQUEST_METHOD=sub_request.method,
+            PATH_INFO=url.path,
+            QUERY_STRING=url.query,
+        )
+        for name, value in sub_request.headers.items():
+            key = name.upper().replace("-", "_")
+            if key not in ("CONTENT_TYPE", "CONTENT_LENGTH"):
+                key = f"HTTP_{key}"
+            sub.META[key] = value
+
+        sub._body = b""
+        if sub_request.body is not None:
+            sub._body = orjson.dumps(sub_request.body)
+            sub.META["CONTENT_TYPE"] = "application/json"
+        sub.META["CONTENT_LENGTH"] = str(len(sub._body))
+
+        sub.user = getattr(request, "user", None)
+        sub.resolver_match = match
+        sub.batch_auth = request.auth
+        return sub
+
+    def _parse_body(self, response):
+        if not response.content:
+            return None
+        if response.get("Content-Type", "").startswith("application/json"):
+            return orjson.loads(response.content)
+        return response.content.decode(response.charset)
+
+    def _error(self, status: int, detail: str) -> dict:
+        return {"status": status, "headers": {}, "body": {"detail": detail}}
@@ -1,6 +1,9 @@
-from ninja import Router
+from services.api.common.routers import Router
 
 # Create mobile API router
 router = Router()
 
 router.add_router("users", "services.api.mobile.users.endpoints.router")
+router.add_router("batch", "services.api.mobile.batch.endpoints.router")
+router.add_router("uploads", "services.api.mobile.uploads.endpoints.router")
+router.add_router("images", "services.api.mobile.images.endpoints.router")
@@ -0,0 +1,26 @@
+from django.http import HttpResponse
+from django.utils.cache import patch_vary_headers
+from ninja import Query
+
+from services.api.common.routers import Router
+from services.api.mobile.images.schemas import ImageVariantResponse
+from services.api.mobile.images.services.images import ImageVariantService
+
+router = Router(read_only=True)
+
+
+@router.get("variant", response=ImageVariantResponse)
+def get_image_variant(
+    request,
+    response: HttpResponse,
+    path: str,
+    width: int = Query(None, gt=0),
+) -> ImageVariantResponse:
+    """
+    Returns URL of the image variant in the format listed in `Accept`,
+    e.g. `image/webp`, at least `width` pixels wide if there is such one.
+    """
+    patch_vary_headers(response, ["Accept"])
+
+    service = ImageVariantService()
+    return service.execute(path, request.headers.get("Accept", ""), width)
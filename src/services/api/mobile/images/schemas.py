@@ -0,0 +1,12 @@
+from typing import Optional
+
+from services.api.common.schemas import CamelCaseModel
+
+
+class ImageVariantResponse(CamelCaseModel):
+    url: str
+    # None for the original image, returned till the variants are rendered
+    variant: Optional[str] = None
+    width: Optional[int] = None
+    height: Optional[int] = None
+    format: Optional[str] = None
@@ -0,0 +1,52 @@
+from django.conf import settings
+from django.core.exceptions import SuspiciousFileOperation
+from django.core.files.storage import default_storage
+from django.core.files.utils import validate_file_name
+from ninja.errors import HttpError
+
+from apps.common.services.image_derivatives import (
+    choose_variant,
+    get_variants,
+    schedule_variants,
+)
+
+
+class ImageVariantService:
+    """
+    Chooses the variant of the image stored in one of `FILE_FOLDERS` best
+    fitting the client, see `choose_variant`. The original image is returned
+    while its variants are rendered.
+    """
+
+    def execute(self, path: str, accept: str, width: int = None) -> dict:
+        self._validate(path)
+
+        variants = get_variants(path)
+        if variants is None:
+            if not default_storage.exists(path):
+                raise HttpError(404, "Image not found.")
+            schedule_variants(path)
+            return {"url": default_storage.url(path)}
+
+        chosen = choose_variant(variants, accept, width)
+        if chosen is None:
+            return {"url": default_storage.url(path)}
+        variant, info = chosen
+        return {
+            "url": default_storage.url(info["path"]),
+            "variant": variant,
+            "width": info["width"],
+            "height": info["height"],
+            "format": info["format"],
+        }
+
+    def _validate(self, path: str) -> None:
+        try:
+            validate_file_name(path, allow_relative_path=True)
+        except SuspiciousFileOperation:
+            raise HttpError(400, "Invalid path.")
+        if not any(
+            path.startswith(f"{entry['path']}/")
+            for entry in settings.FILE_FOLDERS.values()
+        ):
+            raise HttpError(404, "Image not found.")
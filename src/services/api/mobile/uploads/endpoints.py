@@ -0,0 +1,58 @@
+from ninja import Header
+from ninja.errors import HttpError
+
+from services.api.common.routers import Router
+from services.api.mobile.uploads.schemas import (
+    UploadCreateRequest,
+    UploadResponse,
+)
+from services.api.mobile.uploads.services.uploads import UploadService
+
+# chunks are streamed to the storage, there is nothing to keep a database
+# transaction open for
+router = Router(read_only=True)
+
+
+@router.post("", response={201: UploadResponse})
+def create_upload(request, payload: UploadCreateRequest):
+    user, _ = request.auth
+
+    service = UploadService()
+    result = service.create(
+        user,
+        folder=payload.folder,
+        filename=payload.filename,
+        size=payload.size,
+        checksum=payload.checksum,
+    )
+    return 201, result
+
+
+@router.get("{upload_id}", response=UploadResponse)
+def get_upload(request, upload_id: str) -> UploadResponse:
+    user, _ = request.auth
+
+    service = UploadService()
+    return service.get(user, upload_id)
+
+
+@router.patch("{upload_id}", response=UploadResponse)
+def upload_chunk(
+    request,
+    upload_id: str,
+    offset: int = Header(alias="Upload-Offset"),
+    checksum: str = Header(alias="Upload-Checksum"),
+) -> UploadResponse:
+    """
+    Appends the request body at `Upload-Offset`, `Upload-Checksum` is
+    `sha256 <base64 digest>` of the body.
+    """
+    user, _ = request.auth
+    length = request.headers.get("Content-Length")
+    if not length:
+        raise HttpError(411, "Content-Length is required.")
+
+    service = UploadService()
+    return service.append(
+        user, upload_id, offset, checksum, request, int(length)
+    )
@@ -0,0 +1,23 @@
+from typing import Optional
+
+from pydantic import Field
+
+from services.api.common.schemas import CamelCaseModel
+
+
+class UploadCreateRequest(CamelCaseModel):
+    folder: str
+    filename: str = Field(min_length=1, max_length=255)
+    size: int = Field(gt=0)
+    # SHA-256 hex digest of the whole file, verified once it's uploaded
+    checksum: Optional[str] = Field(None, pattern="^[0-9a-f]{64}$")
+
+
+class UploadResponse(CamelCaseModel):
+    id: str
+    offset: int
+    size: int
+    chunk_size: int
+    complete: bool
+    path: Optional[str] = None
+    url: Optional[str] = None
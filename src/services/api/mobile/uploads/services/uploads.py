@@ -0,0 +1,213 @@
+import base64
+import contextlib
+import hashlib
+import os
+import time
+from typing import BinaryIO
+from uuid import uuid4
+
+from django.conf import settings
+from django.core.files.storage import default_storage
+from ninja.errors import HttpError
+from redis.exceptions import LockNotOwnedError
+from redis.lock import Lock
+
+from apps.common.redis_client import get_redis
+from apps.common.services.file_uploadings import folder_upload_handler
+from apps.users.models import User
+
+# storage folder of the files being uploaded, named by upload id
+PARTIAL_FOLDER = "uploads/partial"
+READ_SIZE = 64 * 1024
+
+
+class UploadService:
+    """
+    Resumable upload of a file by chunks.
+
+    The upload is created with the file size and the folder of
+    `FILE_FOLDERS`, its final path is assigned by `folder_upload_handler`.
+    Chunks are appended at the upload offset kept in Redis, each of them is
+    streamed from the request straight to the partial file and verified by
+    its SHA-256 checksum, so a dropped connection costs the current chunk
+    only. The complete file is moved to its final path.
+
+    Chunks of the upload are appended one at a time under the lock, which
+    is renewed while the chunk is streamed. If the lock is lost anyway, the
+    chunk is not recorded and the client should resume from the offset.
+
+    Partial files are appended in place, so the default storage should be
+    a local file system one.
+    """
+
+    def create(
+        self,
+        user: User,
+        folder: str,
+        filename: str,
+        size: int,
+        checksum: str = None,
+    ) -> dict:
+        try:
+            upload_to = folder_upload_handler(folder)
+        except KeyError:
+            raise HttpError(400, f"Unknown folder: {folder}")
+        if size > settings.UPLOAD_MAX_SIZE:
+            raise HttpError(413, "File is too large.")
+
+        upload_id = uuid4().hex
+        upload = {
+            "user_id": user.pk,
+            "path": upload_to(None, filename),
+            "size": size,
+            "offset": 0,
+            "checksum": checksum or "",
+            "complete": 0,
+        }
+        partial_path = self._partial_path(upload_id)
+        os.makedirs(os.path.dirname(partial_path), exist_ok=True)
+        open(partial_path, "wb").close()
+        self._save(upload_id, upload)
+        return self._as_response(upload_id, upload)
+
+    def get(self, user: User, upload_id: str) -> dict:
+        return self._as_response(upload_id, self._load(user, upload_id))
+
+    def append(
+        self,
+        user: User,
+        upload_id: str,
+        offset: int,
+        checksum: str,
+        stream: BinaryIO,
+        length: int,
+    ) -> dict:
+        """
+        Appends the chunk of `length` bytes read from the stream at the
+        offset, `checksum` is `sha256 <base64 digest>` of the chunk.
+        """
+        algorithm, _, digest = checksum.partition(" ")
+        if algorithm != "sha256" or not digest:
+            raise HttpError(400, "Only sha256 chunk checksum is supported.")
+        if length > settings.UPLOAD_CHUNK_SIZE:
+            raise HttpError(413, "Chunk is too large.")
+
+        lock = get_redis().lock(
+            f"{self._key(upload_id)}:lock",
+            timeout=settings.UPLOAD_LOCK_TIMEOUT,
+        )
+        if not lock.acquire(blocking=False):
+            raise HttpError(409, "Another chunk of the upload is in progress.")
+        try:
+            upload = self._load(user, upload_id)
+            if offset != upload["offset"] or upload["complete"]:
+                raise HttpError(409, f"Upload offset is {upload['offset']}.")
+            if offset + length > upload["size"]:
+                raise HttpError(400, "Chunk exceeds the file size.")
+
+            self._write_chunk(upload_id, offset, stream, length, digest, lock)
+            # the chunk could be overwritten by another request otherwise
+            lock.reacquire()
+            upload["offset"] = offset + length
+            if upload["offset"] == upload["size"]:
+                self._complete(upload_id, upload)
+            self._save(upload_id, upload)
+        except LockNotOwnedError:
+            raise HttpError(
+                409, "Upload lock expired, resume from the upload offset."
+            )
+        finally:
+            with contextlib.suppress(LockNotOwnedError):
+                lock.release()
+        return self._as_response(upload_id, upload)
+
+    def _write_chunk(
+        self,
+        upload_id: str,
+        offset: int,
+        stream: BinaryIO,
+        length: int,
+        digest: str,
+        lock: Lock,
+    ) -> None:
+        renew_at = time.monotonic() + lock.timeout / 3
+        with open(self._partial_path(upload_id), "r+b") as file:
+            # drops the tail of the chunk interrupted before
+            file.truncate(offset)
+            file.seek(offset)
+            sha256 = hashlib.sha256()
+            remaining = length
+            while remaining:
+                data = stream.read(min(READ_SIZE, remaining))
+                if not data:
+                    break
+                sha256.update(data)
+                file.write(data)
+                remaining -= len(data)
+                if time.monotonic() >= renew_at:
+                    lock.reacquire()
+                    renew_at = time.monotonic() + lock.timeout / 3
+
+            if (
+                remaining
+                or base64.b64encode(sha256.digest()).decode() != digest
+            ):
+                file.truncate(offset)
+                raise HttpError(400, "Chunk checksum mismatch.")
+
+    def _complete(self, upload_id: str, upload: dict) -> None:
+        partial_path = self._partial_path(upload_id)
+        if upload["checksum"] and upload["checksum"] != _file_sha256(
+            partial_path
+        ):
+            os.remove(partial_path)
+            get_redis().delete(self._key(upload_id))
+            raise HttpError(400, "File checksum mismatch, upload it again.")
+
+        path = default_storage.path(upload["path"])
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        os.replace(partial_path, path)
+        upload["complete"] = 1
+
+    def _key(self, upload_id: str) -> str:
+        return f"upload:{upload_id}"
+
+    def _partial_path(self, upload_id: str) -> str:
+        return default_storage.path(os.path.join(PARTIAL_FOLDER, upload_id))
+
+    def _save(self, upload_id: str, upload: dict) -> None:
+        with get_redis().pipeline() as pipeline:
+            pipeline.hset(self._key(upload_id), mapping=upload)
+            pipeline.expire(self._key(upload_id), settings.UPLOAD_TTL)
+            pipeline.execute()
+
+    def _load(self, user: User, upload_id: str) -> dict:
+        upload = {
+            key.decode(): value.decode()
+            for key, value in get_redis().hgetall(self._key(upload_id)).items()
+        }
+        if not upload or upload["user_id"] != str(user.pk):
+            raise HttpError(404, "Upload not found.")
+        for field in ("size", "offset", "complete"):
+            upload[field] = int(upload[field])
+        return upload
+
+    def _as_response(self, upload_id: str, upload: dict) -> dict:
+        complete = bool(upload["complete"])
+        return {
+            "id": upload_id,
+            "offset": upload["offset"],
+            "size": upload["size"],
+            "chunk_size": settings.UPLOAD_CHUNK_SIZE,
+            "complete": complete,
+            "path": upload["path"] if complete else None,
+            "url": default_storage.url(upload["path"]) if complete else None,
+        }
+
+
+def _file_sha256(path: str) -> str:
+    sha256 = hashlib.sha256()
+    with open(path, "rb") as file:
+        while data := file.read(READ_SIZE):
+            sha256.update(data)
+    return sha256.hexdigest()
@@ -1,12 +1,25 @@
-from ninja import Router
-
+from services.api.common.conditional import conditional
+from services.api.common.fieldsets import sparse_fieldset
+from services.api.common.queries import query_budget
+from services.api.common.routers import Router
+from services.api.common.transactions import read_only
 from services.api.mobile.users.services.me import MeService
+from services.api.mobile.users.services.validators import (
+    auth_user_etag,
+    auth_user_last_modified,
+)
 from services.api.mobile.users.shemas import UserResponse
 
 router = Router()
 
 
 @router.get("me", response=UserResponse)
+@read_only
+@query_budget(1)
+@conditional(
+    etag_func=auth_user_etag, last_modified_func=auth_user_last_modified
+)
+@sparse_fieldset(UserResponse)
 def get_me(request) -> UserResponse:
     user, _ = request.auth
 
@@ -0,0 +1,56 @@
+import time
+from datetime import datetime, timezone
+from typing import Optional
+
+from apps.users.services.versions import aget_user_version, get_user_version
+
+
+def _get_auth_user_version(request) -> tuple[int, int]:
+    if not hasattr(request, "_auth_user_version"):
+        user, _ = request.auth
+        request._auth_user_version = user.pk, get_user_version(user.pk)
+    return request._auth_user_version
+
+
+def _last_modified(version: int) -> Optional[datetime]:
+    # Last-Modified has one second precision, so the version of the current
+    # second is not sent, the next one of the same second would get 304
+    seconds = version // 10**9
+    if seconds >= time.time_ns() // 10**9:
+        return None
+    return datetime.fromtimestamp(seconds, tz=timezone.utc)
+
+
+def auth_user_etag(request) -> str:
+    """ETag of authenticated user data, based on the user version."""
+    user_id, version = _get_auth_user_version(request)
+    return f"{user_id}-{version}"
+
+
+def auth_user_last_modified(request) -> Optional[datetime]:
+    """
+    Last modification time of authenticated user data, it has one second
+    precision only, so it's missing for the data modified within the
+    current second and ETag should be preferred by clients.
+    """
+    _, version = _get_auth_user_version(request)
+    return _last_modified(version)
+
+
+async def _aget_auth_user_version(request) -> tuple[int, int]:
+    if not hasattr(request, "_auth_user_version"):
+        user, _ = request.auth
+        request._auth_user_version = user.pk, await aget_user_version(user.pk)
+    return request._auth_user_version
+
+
+async def aauth_user_etag(request) -> str:
+    """Async version of `auth_user_etag`."""
+    user_id, version = await _aget_auth_user_version(request)
+    return f"{user_id}-{version}"
+
+
+async def aauth_user_last_modified(request) -> Optional[datetime]:
+    """Async version of `auth_user_last_modified`."""
+    _, version = await _aget_auth_user_version(request)
+    return _last_modified(version)
@@ -1,11 +1,8 @@
-from pydantic import BaseModel
+from services.api.common.schemas import CamelCaseModel
 
 
-class UserResponse(BaseModel):
+class UserResponse(CamelCaseModel):
     id: int
     email: str
     first_name: str
     last_name: str
-
-    class Config:
-        from_attributes = True
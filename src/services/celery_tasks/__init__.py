@@ -1,3 +1,15 @@
 # Celery tasks package
 # This package contains all Celery tasks for the project
-# Tasks are automatically discovered by custom discover_celery_tasks()
+
+# Maps task names to the modules defining them. The worker imports a module
+# once the first message of its task arrives, see `apps.common.task_registry`,
+# keep it in sync with `manage.py task_registry`.
+TASK_MODULES = {
+    "batching.flush_stale": "services.celery_tasks.batching",
+    "dummy.dummy_task": "services.celery_tasks.dummy",
+    "emails.send_email": "services.celery_tasks.emails",
+    "fanout.chunk_done": "services.celery_tasks.fanout",
+    "images.cleanup_variants": "services.celery_tasks.images",
+    "images.render_variants": "services.celery_tasks.images",
+    "uploads.cleanup_partial": "services.celery_tasks.uploads",
+}
@@ -0,0 +1,241 @@
+"""
+Base class of tasks coalescing many small invocations into a single call of
+the task handling them in bulk.
+
+Invocations (`task.delay(*args)`) are buffered in Redis instead of being sent
+to the broker. The buffer is flushed by a single task message once it holds
+`batch_size` calls or `flush_interval` seconds after the first buffered call,
+and the task function receives the list of argument tuples.
+
+Example of usage:
+    >>> @shared_task(base=BatchTask, name="users.touch", batch_size=500)
+    ... def touch_users(calls: list[tuple]):
+    ...     User.objects.filter(pk__in=[pk for pk, in calls]).update(...)
+    >>> touch_users.delay(user.pk)
+
+The call is not a task message of its own, so `delay()` returns None rather
+than `AsyncResult` and the sending options (queue, countdown, eta, etc.) are
+not supported, the flush is routed by the task name.
+
+The flush moves the calls from the buffer to the batch of its own task id,
+so when the flush message is delivered again (late ack after the worker is
+lost and `visibility_timeout` passed) or the flush is retried, the same batch
+is processed again rather than lost. The batch is kept for
+`visibility_timeout` plus `task_time_limit` or till it is handled.
+
+The flush message lost before it's handled (e.g. the worker is lost, as the
+tasks are acknowledged early) leaves the calls buffered till the next call.
+They are flushed by `batching.flush_stale` periodic task then.
+"""
+
+import json
+from functools import lru_cache
+
+from celery import Celery, Task, current_app, shared_task
+from celery.exceptions import ImproperlyConfigured
+
+from apps.common.redis_client import get_redis
+
+FLUSH_NOW = 2
+FLUSH_LATER = 1
+# names of the tasks which have buffered calls
+TASKS_KEY = "batch_tasks"
+# the window of the flush sent by `flush_stale_batches`, ms
+STALE_FLUSH_WINDOW = 60 * 1000
+
+# Buffers a call, KEYS are the buffer, the flush window and the task names,
+# ARGV are the call, batch size, window in ms and the task name. Returns
+# FLUSH_NOW once the buffer is full, FLUSH_LATER if the call opens a new
+# window, 0 if a flush is pending.
+BUFFER_CALL_SCRIPT = """
+redis.call("SADD", KEYS[3], ARGV[4])
+local length = redis.call("RPUSH", KEYS[1], ARGV[1])
+if length == tonumber(ARGV[2]) then
+    return 2
+end
+if redis.call("SET", KEYS[2], 1, "NX", "PX", ARGV[3]) then
+    return 1
+end
+return 0
+"""
+
+# Moves up to batch size calls from the buffer to the batch unless the batch
+# has been taken by the previous delivery already. KEYS are the buffer, the
+# flush window and the batch, ARGV are the batch size, batch TTL and window in
+# ms. Returns the next flush to schedule for the calls left and the batch.
+TAKE_BATCH_SCRIPT = """
+local flush = 0
+if redis.call("EXISTS", KEYS[3]) == 0 then
+    local calls = redis.call("LRANGE", KEYS[1], 0, tonumber(ARGV[1]) - 1)
+    if #calls > 0 then
+        redis.call("LTRIM", KEYS[1], #calls, -1)
+        redis.call("RPUSH", KEYS[3], unpack(calls))
+        redis.call("EXPIRE", KEYS[3], ARGV[2])
+    end
+    redis.call("DEL", KEYS[2])
+    local left = redis.call("LLEN", KEYS[1])
+    if left >= tonumber(ARGV[1]) then
+        flush = 2
+    elseif left > 0 then
+        redis.call("SET", KEYS[2], 1, "PX", ARGV[3])
+        flush = 1
+    end
+end
+return {flush, redis.call("LRANGE", KEYS[3], 0, -1)}
+"""
+
+# Opens the flush window of the buffer left without a pending flush. KEYS
+# are the buffer, the flush window and the task names, ARGV are the window in
+# ms and the task name. Returns 1 if the flush should be sent.
+FLUSH_STALE_SCRIPT = """
+if redis.call("LLEN", KEYS[1]) == 0 then
+    redis.call("SREM", KEYS[3], ARGV[2])
+    return 0
+end
+if redis.call("SET", KEYS[2], 1, "NX", "PX", ARGV[1]) then
+    return 1
+end
+return 0
+"""
+
+
+@lru_cache(maxsize=None)
+def _get_script(script: str):
+    return get_redis().register_script(script)
+
+
+def _buffer_key(name: str) -> str:
+    return f"batch:{name}"
+
+
+def _window_key(name: str) -> str:
+    return f"batch:{name}:window"
+
+
+class BatchTask(Task):
+    """
+    Task buffering its invocations and handling them in batches, the task
+    function receives the list of argument tuples, see the module docs.
+
+    Calling the task directly, e.g. `task([(1,), (2,)])`, handles the given
+    calls without buffering.
+    """
+
+    batch_size = 100
+    flush_interval = 1.0
+    # neither buffered calls nor flush messages match the task signature
+    typing = False
+
+    @property
+    def _buffer_key(self) -> str:
+        return _buffer_key(self.name)
+
+    @property
+    def _window_key(self) -> str:
+        return _window_key(self.name)
+
+    def _batch_key(self, task_id: str) -> str:
+        return f"batch:{self.name}:{task_id}"
+
+    @property
+    def _window_ms(self) -> int:
+        return int(self.flush_interval * 1000)
+
+    @property
+    def _visibility_timeout(self) -> float:
+        options = self.app.conf.broker_transport_options
+        return options.get("visibility_timeout", 3600)
+
+    @property
+    def _batch_ttl(self) -> int:
+        time_limit = self.app.conf.task_time_limit or 0
+        return int(self._visibility_timeout + time_limit)
+
+    def delay(self, *args, **kwargs) -> None:
+        """
+        Buffers the call, returns None rather than `AsyncResult` as the call
+        is handled by the flush message of its batch.
+        """
+        return self.apply_async(args, kwargs)
+
+    def apply_async(self, args=None, kwargs=None, **options):
+        """Buffers the call, positional arguments only, returns None."""
+        # retry of the flush sends its message again, so the batch of its
+        # task id is handled again
+        if "retries" in options:
+            return super().apply_async(args, kwargs, **options)
+        if kwargs:
+            raise TypeError(f"{self.name} accepts positional arguments only")
+        if options:
+            raise TypeError(
+                f"{self.name} does not support options: {sorted(options)}"
+            )
+        # delayed flush would be delivered again after the visibility timeout
+        if self.flush_interval >= self._visibility_timeout:
+            raise ImproperlyConfigured(
+                "flush_interval should be less than visibility_timeout"
+            )
+
+        flush = _get_script(BUFFER_CALL_SCRIPT)(
+            keys=[self._buffer_key, self._window_key, TASKS_KEY],
+            args=[
+                json.dumps(list(args or ())),
+                self.batch_size,
+                self._window_ms,
+                self.name,
+            ],
+        )
+        if flush:
+            self._send_flush(flush)
+
+    def _send_flush(self, flush: int) -> None:
+        countdown = self.flush_interval if flush == FLUSH_LATER else None
+        super().apply_async(countdown=countdown)
+
+    def __call__(self, *args, **kwargs):
+        if self.request.called_directly:
+            return super().__call__(*args, **kwargs)
+        return self.flush()
+
+    def flush(self):
+        """Handles the batch of the current flush message."""
+        batch_key = self._batch_key(self.request.id)
+        flush, calls = _get_script(TAKE_BATCH_SCRIPT)(
+            keys=[self._buffer_key, self._window_key, batch_key],
+            args=[self.batch_size, self._batch_ttl, self._window_ms],
+        )
+        if flush:
+            self._send_flush(flush)
+        if not calls:
+            return None
+
+        # the batch is kept on failure, so it's handled again on retry
+        result = self.run([tuple(json.loads(call)) for call in calls])
+        get_redis().delete(batch_key)
+        return result
+
+
+def flush_stale_batches(app: Celery = None) -> int:
+    """
+    Sends the flushes of the buffered calls left without a pending flush,
+    returns their number. The flush is sent by the task name, so the tasks
+    are not imported.
+    """
+    app = app or current_app
+    client = get_redis()
+    sent = 0
+    for name in client.smembers(TASKS_KEY):
+        name = name.decode()
+        if _get_script(FLUSH_STALE_SCRIPT)(
+            keys=[_buffer_key(name), _window_key(name), TASKS_KEY],
+            args=[STALE_FLUSH_WINDOW, name],
+        ):
+            app.send_task(name)
+            sent += 1
+    return sent
+
+
+@shared_task(name="batching.flush_stale", singleton=True)
+def flush_stale() -> int:
+    """Flushes the calls buffered by `BatchTask` tasks and left unflushed."""
+    return flush_stale_batches()
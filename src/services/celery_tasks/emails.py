@@ -0,0 +1,16 @@
+from typing import Any, Union
+
+from celery import shared_task
+
+from apps.common.services.emails_sending import send_email
+
+
+@shared_task(name="emails.send_email")
+def send_email_task(
+    template_name: str,
+    recipients: Union[str, list[str]],
+    context: dict[str, Any] = None,
+    from_email: str = None,
+) -> None:
+    """Sends templated email, routed to the high priority queue."""
+    send_email(template_name, recipients, context, from_email)
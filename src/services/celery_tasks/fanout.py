@@ -0,0 +1,138 @@
+"""
+Processing of large querysets by the worker fleet in primary key ranges.
+
+`fan_out` splits the queryset into ranges of `chunk_size` rows and sends the
+chunk task, called with the range bounds, for `concurrency` ranges at once.
+Every finished chunk is recorded by `fanout.chunk_done` linked to it, which
+sends the next pending range, so no result backend is required. Chunk
+tasks iterate their ranges by `apps.common.pk_ranges.iterate_range`.
+
+A failed or lost chunk is not recorded and the job stalls then. Resuming is
+manual, there is no periodic resume: a chunk waiting in a long queue could
+not be told from a lost one, so resuming by timeout would process ranges
+twice. Calling `fan_out` with the id of the stalled job, once
+`get_progress` shows no progress and its chunks are not queued anymore,
+sends the unfinished ranges again.
+
+Example of usage:
+    >>> @shared_task(name="users.reindex_chunk")
+    ... def reindex_users(lower, upper):
+    ...     for user in iterate_range(User.objects.all(), lower, upper):
+    ...         ...
+    >>> job_id = fan_out(reindex_users, User.objects.all(), chunk_size=5000)
+    >>> get_progress(job_id)
+    (3, 20)
+"""
+
+import json
+import logging
+from uuid import uuid4
+
+from celery import Task, shared_task, signature
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db.models import QuerySet
+
+from apps.common.pk_ranges import split_pk_ranges
+from apps.common.redis_client import get_redis
+
+logger = logging.getLogger(__name__)
+
+# job state is kept for a week after the last finished chunk
+JOB_TTL = 60 * 60 * 24 * 7
+
+
+def _job_key(job_id: str) -> str:
+    return f"fanout:{job_id}"
+
+
+def fan_out(
+    task: Task,
+    queryset: QuerySet,
+    chunk_size: int = 1000,
+    concurrency: int = 8,
+    job_id: str = None,
+) -> str:
+    """
+    Processes the queryset by `task(lower, upper)` calls of its primary key
+    ranges, at most `concurrency` of them at once, and returns job id.
+
+    The job given by `job_id` is resumed, its unfinished ranges are sent
+    again, so it should be used for the jobs which are not running anymore.
+    Stalled jobs are never resumed automatically, see the module docs.
+    """
+    client = get_redis()
+    key = _job_key(job_id) if job_id else None
+    if job_id and client.exists(key):
+        ranges = json.loads(client.hget(key, "ranges"))
+        done = {int(index) for index in client.smembers(f"{key}:done")}
+    else:
+        job_id = job_id or uuid4().hex
+        key = _job_key(job_id)
+        ranges = split_pk_ranges(queryset, chunk_size)
+        done = set()
+        client.hset(
+            key,
+            mapping={
+                "task": task.name,
+                "ranges": json.dumps(ranges, cls=DjangoJSONEncoder),
+            },
+        )
+
+    pending = [index for index in range(len(ranges)) if index not in done]
+    with client.pipeline() as pipeline:
+        pipeline.delete(f"{key}:pending")
+        if pending[concurrency:]:
+            pipeline.rpush(f"{key}:pending", *pending[concurrency:])
+        for suffix in ("", ":pending", ":done"):
+            pipeline.expire(f"{key}{suffix}", JOB_TTL)
+        pipeline.execute()
+
+    logger.info(
+        "Fan out %s job %s, %s of %s chunks left",
+        task.name,
+        job_id,
+        len(pending),
+        len(ranges),
+    )
+    for index in pending[:concurrency]:
+        _send_chunk(job_id, task.name, index, ranges[index])
+    return job_id
+
+
+def _send_chunk(job_id: str, task_name: str, index: int, pk_range) -> None:
+    # the chunk task is imported by the caller of `fan_out` and by the
+    # worker running `chunk_done`, so the signature doesn't import it again
+    signature(task_name, args=tuple(pk_range)).apply_async(
+        link=chunk_done.si(job_id, index)
+    )
+
+
+def get_progress(job_id: str) -> tuple[int, int]:
+    """Returns numbers of the finished and all the chunks of the job."""
+    client = get_redis()
+    key = _job_key(job_id)
+    ranges = client.hget(key, "ranges")
+    if ranges is None:
+        raise KeyError(f"Unknown fan out job {job_id}")
+    return client.scard(f"{key}:done"), len(json.loads(ranges))
+
+
+@shared_task(name="fanout.chunk_done")
+def chunk_done(job_id: str, index: int) -> None:
+    """Records the finished chunk and sends the next pending one."""
+    client = get_redis()
+    key = _job_key(job_id)
+    with client.pipeline() as pipeline:
+        pipeline.sadd(f"{key}:done", index)
+        pipeline.lpop(f"{key}:pending")
+        pipeline.hmget(key, "task", "ranges")
+        for suffix in ("", ":pending", ":done"):
+            pipeline.expire(f"{key}{suffix}", JOB_TTL)
+        _, next_index, (task_name, ranges), *_ = pipeline.execute()
+
+    ranges = json.loads(ranges)
+    if next_index is not None:
+        next_index = int(next_index)
+        _send_chunk(job_id, task_name.decode(), next_index, ranges[next_index])
+    elif client.scard(f"{key}:done") == len(ranges):
+        logger.info("Fan out job %s is finished", job_id)
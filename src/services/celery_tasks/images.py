@@ -0,0 +1,24 @@
+from celery import shared_task
+
+from apps.common.services.image_derivatives import (
+    cleanup_variants,
+    render_variants,
+)
+
+
+@shared_task(name="images.render_variants", dedupe=True)
+def render_image_variants(name: str) -> None:
+    """
+    Renders the missing `IMAGE_VARIANTS` of the image of the default
+    storage, routed to the images queue.
+    """
+    render_variants(name)
+
+
+@shared_task(name="images.cleanup_variants", singleton=True)
+def cleanup_image_variants() -> int:
+    """
+    Removes the rendered variants which are not cached anymore, e.g. of
+    deleted images or changed `IMAGE_VARIANTS`.
+    """
+    return cleanup_variants()
@@ -0,0 +1,141 @@
+"""
+Task options preventing overlapping and duplicate runs, backed by Redis
+locks. `LockingTask` is the base class of all the app tasks.
+
+    - `singleton=True` runs a single instance of the task at a time, the run
+      started while the previous one is still running is skipped
+    - `dedupe=True` does not enqueue the task if the one with identical
+      arguments is pending already, the pending task result is returned,
+      processes sending the task by name use `apps.common.task_registry`
+      `send_task(..., dedupe=True)`
+
+Example of usage:
+    >>> @shared_task(name="users.cleanup", singleton=True, dedupe=True)
+    ... def cleanup_users():
+    ...     ...
+
+The singleton lock is taken for `lock_lease` seconds and renewed while the
+task is running, till its time limit (`CELERY_TASK_TIME_LIMIT` by default)
+at most, so the lock of a crashed worker expires within the lease. The
+pending lock expires after the broker `visibility_timeout`.
+
+Redis errors do not prevent the task from being enqueued or run.
+"""
+
+import logging
+import threading
+import time
+
+import redis
+from celery import Task
+from celery.utils import uuid
+from redis.exceptions import LockError
+from redis.lock import Lock
+
+from apps.common.redis_client import get_redis
+from apps.common.task_registry import claim_pending, pending_key
+
+logger = logging.getLogger(__name__)
+
+
+class LeaseRenewal(threading.Thread):
+    """Extends the lock lease periodically till stopped or the deadline."""
+
+    def __init__(self, lock: Lock, deadline: float = None):
+        super().__init__(daemon=True)
+        self.lock = lock
+        self.deadline = deadline
+        self.stopped = threading.Event()
+
+    def run(self):
+        while not self.stopped.wait(self.lock.timeout / 3):
+            if self.deadline is not None and time.monotonic() > self.deadline:
+                return
+            try:
+                self.lock.reacquire()
+            except (LockError, redis.RedisError):
+                logger.warning("Failed to renew lock %s", self.lock.name)
+                return
+
+    def stop(self):
+        self.stopped.set()
+        self.join()
+
+
+class LockingTask(Task):
+    """Task supporting `singleton` and `dedupe` options, see module docs."""
+
+    singleton = False
+    dedupe = False
+    lock_lease = 60
+
+    @property
+    def _singleton_key(self) -> str:
+        return f"task_singleton:{self.name}"
+
+    def apply_async(self, args=None, kwargs=None, task_id=None, **options):
+        if not self.dedupe or self.app.conf.task_always_eager:
+            return super().apply_async(args, kwargs, task_id, **options)
+
+        task_id = task_id or uuid()
+        pending_id = claim_pending(self.app, self.name, args, kwargs, task_id)
+        if pending_id is not None:
+            return self.AsyncResult(pending_id)
+        return super().apply_async(args, kwargs, task_id, **options)
+
+    def __call__(self, *args, **kwargs):
+        if self.request.called_directly:
+            return super().__call__(*args, **kwargs)
+        if self.dedupe:
+            self._release_pending(args, kwargs)
+        if self.singleton:
+            return self._run_singleton(*args, **kwargs)
+        return self.run(*args, **kwargs)
+
+    def _release_pending(self, args, kwargs) -> None:
+        """Allows the same call to be enqueued once the task is started."""
+        key = pending_key(self.name, args, kwargs)
+        try:
+            client = get_redis()
+            if client.get(key) == self.request.id.encode():
+                client.delete(key)
+        except redis.RedisError:
+            logger.exception("Failed to release pending %s", self.name)
+
+    def _deadline(self) -> float:
+        hard_time_limit, _ = self.request.timelimit or (None, None)
+        time_limit = (
+            hard_time_limit or self.time_limit or self.app.conf.task_time_limit
+        )
+        if time_limit:
+            return time.monotonic() + time_limit
+        return None
+
+    def _run_singleton(self, *args, **kwargs):
+        # the token is shared with the lease renewal thread
+        lock = get_redis().lock(
+            self._singleton_key, timeout=self.lock_lease, thread_local=False
+        )
+        try:
+            acquired = lock.acquire(blocking=False)
+        except redis.RedisError:
+            logger.exception("Failed to lock %s", self.name)
+            return self.run(*args, **kwargs)
+        if not acquired:
+            logger.info(
+                "Skipped %s[%s], another instance is running",
+                self.name,
+                self.request.id,
+            )
+            return None
+
+        renewal = LeaseRenewal(lock, self._deadline())
+        renewal.start()
+        try:
+            return self.run(*args, **kwargs)
+        finally:
+            renewal.stop()
+            try:
+                lock.release()
+            except (LockError, redis.RedisError):
+                logger.warning("Lock of %s expired while running", self.name)
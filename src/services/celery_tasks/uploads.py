@@ -0,0 +1,28 @@
+import os
+import time
+
+from celery import shared_task
+from django.conf import settings
+from django.core.files.storage import default_storage
+
+from services.api.mobile.uploads.services.uploads import PARTIAL_FOLDER
+
+
+@shared_task(name="uploads.cleanup_partial", singleton=True)
+def cleanup_partial_uploads() -> int:
+    """
+    Removes partial files of the uploads idle for longer than UPLOAD_TTL,
+    their state has expired in Redis already.
+    """
+    folder = default_storage.path(PARTIAL_FOLDER)
+    if not os.path.isdir(folder):
+        return 0
+
+    deadline = time.time() - settings.UPLOAD_TTL
+    removed = 0
+    with os.scandir(folder) as entries:
+        for entry in entries:
+            if entry.is_file() and entry.stat().st_mtime < deadline:
+                os.remove(entry.path)
+                removed += 1
+    return removed
@@ -1,6 +1,6 @@
 import hashlib
-import json
 
+import orjson
 from django.http import HttpResponse
 from django.utils.decorators import method_decorator
 from django.views.decorators.debug import sensitive_post_parameters
@@ -8,15 +8,48 @@ from oauth2_provider.models import get_access_token_model
 from oauth2_provider.signals import app_authorized
 from oauth2_provider.views.base import TokenView as BaseTokenView
 
+from apps.common.rate_limits import (
+    KEY_CLIENT_ID,
+    KEY_IP,
+    RateLimit,
+    rate_limit,
+)
+from services.api.common.fieldsets import FIELDS_PARAM, parse_fields
+
 from .schemas import TokenUser
 
 
 class TokenView(BaseTokenView):
     @method_decorator(sensitive_post_parameters("password"))
+    @method_decorator(
+        rate_limit(
+            RateLimit("oauth2_token", key=KEY_IP),
+            RateLimit("oauth2_token_client", key=KEY_CLIENT_ID),
+        )
+    )
+    # not idempotent, stored responses would keep the issued tokens longer
+    # than they live, retried requests just get new tokens
     def post(self, request, *args, **kwargs):
+        # URL query parameters are not allowed by OAuth2 token endpoint,
+        # so the user fields are passed in the body
+        try:
+            fields = parse_fields(request.POST.get(FIELDS_PARAM), TokenUser)
+        except ValueError as error:
+            return HttpResponse(
+                content=orjson.dumps(
+                    {
+                        "error": "invalid_request",
+                        "error_description": str(error),
+                    }
+                ),
+                status=400,
+                content_type="application/json",
+            )
+        schema = TokenUser.subset(fields) if fields else TokenUser
+
         url, headers, body, status = self.create_token_response(request)
         if status == 200:
-            parsed_body = json.loads(body)
+            parsed_body = orjson.loads(body)
             access_token = parsed_body.get("access_token")
 
             if access_token is not None:
@@ -31,11 +64,15 @@ class TokenView(BaseTokenView):
                 app_authorized.send(sender=self, request=request, token=token)
 
                 # customize response
-                parsed_body["user"] = TokenUser.model_validate(
+                parsed_body["user"] = schema.model_validate(
                     token.user
                 ).model_dump(by_alias=True)
 
-                body = json.dumps(parsed_body, default=str)
+                body = orjson.dumps(
+                    parsed_body,
+                    default=str,
+                    option=orjson.OPT_PASSTHROUGH_DATETIME,
+                )
 
         response = HttpResponse(content=body, status=status)
         for k, v in headers.items():